@@ -1,10 +1,14 @@
+import hashlib
+import secrets
 from datetime import datetime, timedelta, timezone
 from typing import Optional
+from uuid import uuid4
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 
+from src.application.revocation import revocation_list
 from src.config.config import config
 from src.infrastructure.database.repositories.cats import (
     CatRepository,
@@ -12,7 +16,6 @@ from src.infrastructure.database.repositories.cats import (
 from src.presentation.dependencies import get_cat_repository
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 CREDENTIALS_EXCEPTION = HTTPException(
@@ -44,7 +47,7 @@ class Auth:
             expire = now_utc + timedelta(seconds=expires_delta)
         else:
             expire = now_utc + timedelta(minutes=180)
-        to_encode.update({"iat": now_utc, "exp": expire, "scope": "access_token"})
+        to_encode.update({"iat": now_utc, "exp": expire, "scope": "access_token", "jti": uuid4().hex})
         encoded_access_token = jwt.encode(
             to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM
         )
@@ -59,7 +62,7 @@ class Auth:
             expire = now_utc + timedelta(seconds=expires_delta)
         else:
             expire = now_utc + timedelta(days=7)
-        to_encode.update({"iat": now_utc, "exp": expire, "scope": "refresh_token"})
+        to_encode.update({"iat": now_utc, "exp": expire, "scope": "refresh_token", "jti": uuid4().hex})
         encoded_refresh_token = jwt.encode(
             to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM
         )
@@ -70,6 +73,11 @@ class Auth:
             payload = jwt.decode(
                 refresh_token, self.SECRET_KEY, algorithms=[self.ALGORITHM]
         )
+            if revocation_list.is_revoked(payload.get("jti")):
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Token has been revoked",
+                )
             if payload["scope"] == "refresh_token":
                 username = payload["sub"]
                 return username
@@ -95,6 +103,8 @@ class Auth:
         )
         try:
             payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
+            if revocation_list.is_revoked(payload.get("jti")):
+                raise credentials_exception
             if payload["scope"] == "access_token":
                 username = payload["sub"]
                 if username is None:
@@ -117,27 +127,22 @@ class Auth:
             )
         return current_cat
 
-    def create_reset_token(self, data: dict):
-        to_encode = data.copy()
-        now_utc = self._get_current_time()
-        expire = now_utc + timedelta(days=1)
-        to_encode.update({"iat": now_utc, "exp": expire})
-        token = jwt.encode(to_encode, self.SECRET_KEY, algorithm=self.ALGORITHM)
-        return token
-
-    async def get_name_from_token(self, token: str, cat_repository: CatRepository):
-        try:
-            payload = jwt.decode(token, self.SECRET_KEY, algorithms=[self.ALGORITHM])
-            name = payload["sub"]
-            cat = await cat_repository.get_by_name(name)
-            return cat.name
-        except JWTError as e:
-            print(e)
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="Invalid token for verification",
-            )
-
+    async def revoke_token(self, token: str) -> None:
+        """Revoke a verified token until it expires; tokens without a jti can't be revoked"""
+        claims = jwt.get_unverified_claims(token)
+        if claims.get("jti") is None:
+            return
+        expires_at = datetime.fromtimestamp(claims["exp"], timezone.utc).replace(tzinfo=None)
+        await revocation_list.revoke(claims["jti"], expires_at)
+
+    def create_reset_token(self) -> tuple[str, str]:
+        """New password reset token and the hash it is stored under"""
+        token = secrets.token_urlsafe(32)
+        return token, self.hash_reset_token(token)
+
+    @staticmethod
+    def hash_reset_token(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
 
     async def get_current_cat_token(self, token: str = Depends(oauth2_scheme)):
         return token
@@ -0,0 +1,42 @@
+import time
+from typing import Optional
+
+import httpx
+
+from src.application.deadlines import budget
+
+CAT_API_URL = "https://api.thecatapi.com/v1/breeds"
+
+
+class BreedCatalog:
+    """Snapshot of the breed names known to the Cat API"""
+
+    def __init__(self, url: str = CAT_API_URL, timeout: float = 5.0):
+        self.url = url
+        self.timeout = timeout
+        self._names: Optional[frozenset[str]] = None
+        self.refreshed_at: Optional[float] = None
+
+    async def refresh(self) -> frozenset[str]:
+        """
+        Fetch the breed list; raises httpx.HTTPError when the API fails. Inside
+        a request the timeout is capped by the request deadline.
+        """
+        async with httpx.AsyncClient(timeout=budget(self.timeout)) as client:
+            response = await client.get(self.url)
+            response.raise_for_status()
+            breeds = response.json()
+        self._names = frozenset(b["name"].lower() for b in breeds)
+        self.refreshed_at = time.time()
+        return self._names
+
+    async def names(self) -> frozenset[str]:
+        if self._names is None:
+            return await self.refresh()
+        return self._names
+
+    async def contains(self, breed: str) -> bool:
+        return breed.lower() in await self.names()
+
+
+breed_catalog = BreedCatalog()
@@ -0,0 +1,72 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+
+deadline_var: ContextVar[Optional[float]] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """The request ran out of its time budget before the work could start"""
+
+
+def remaining() -> Optional[float]:
+    """Seconds left until the current request's deadline, None without one"""
+    deadline = deadline_var.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def budget(default: float) -> float:
+    """Timeout for a call made on behalf of the request: `default` capped by its deadline"""
+    left = remaining()
+    if left is None:
+        return default
+    if left <= 0:
+        raise DeadlineExceeded()
+    return min(default, left)
+
+
+class DeadlinePolicy:
+    """
+    Per-route request deadlines. `routes` maps path prefixes to seconds, the
+    longest matching prefix wins and 0 disables the deadline, e.g. for
+    event streams and uploads.
+    """
+
+    def __init__(self, default: float, routes: dict[str, float]):
+        self.default = default
+        self.routes = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def for_path(self, path: str) -> float:
+        for prefix, seconds in self.routes:
+            if path.startswith(prefix):
+                return seconds
+        return self.default
+
+
+class TimeoutStats:
+    """Counts timeouts by kind (deadline, statement, pool, upstream) and route"""
+
+    def __init__(self):
+        self.by_kind: Counter = Counter()
+        self.by_route: Counter = Counter()
+
+    def record(self, kind: str, scope) -> None:
+        route = scope.get("route")
+        label = f"{scope.get('method')} {getattr(route, 'path', None) or scope.get('path')}"
+        self.by_kind[kind] += 1
+        self.by_route[(kind, label)] += 1
+
+    def stats(self) -> dict:
+        return {
+            "by_kind": dict(self.by_kind),
+            "by_route": [
+                {"kind": kind, "route": route, "count": count}
+                for (kind, route), count in self.by_route.most_common()
+            ],
+        }
+
+
+timeout_stats = TimeoutStats()
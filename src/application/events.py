@@ -0,0 +1,201 @@
+import asyncio
+import contextlib
+import json
+import logging
+import uuid
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+from uuid import UUID
+
+from src.application.response_cache import response_cache
+from src.infrastructure.database.dialect import is_postgres_url
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "cat_spy_events"
+
+
+@dataclass
+class StatusEvent:
+    """Status transition of a mission or one of its targets"""
+    type: str
+    mission_uuid: str
+    status: str
+    target_uuid: Optional[str] = None
+    cat_uuids: list[str] = field(default_factory=list)
+
+    @classmethod
+    def mission(cls, mission_uuid: UUID, status: str, cat_uuids: list[UUID]) -> "StatusEvent":
+        return cls(
+            type="mission.status",
+            mission_uuid=str(mission_uuid),
+            status=status,
+            cat_uuids=[str(cat_uuid) for cat_uuid in cat_uuids],
+        )
+
+    @classmethod
+    def target(cls, target_uuid: UUID, mission_uuid: UUID, status: str, cat_uuids: list[UUID]) -> "StatusEvent":
+        return cls(
+            type="target.status",
+            mission_uuid=str(mission_uuid),
+            target_uuid=str(target_uuid),
+            status=status,
+            cat_uuids=[str(cat_uuid) for cat_uuid in cat_uuids],
+        )
+
+
+class Subscription:
+    """Bounded queue of events visible to one subscriber"""
+
+    def __init__(self, cat_uuid: Optional[UUID] = None, max_size: int = 100):
+        self.cat_uuid = str(cat_uuid) if cat_uuid else None
+        self.queue: asyncio.Queue[StatusEvent] = asyncio.Queue(maxsize=max_size)
+        self.dropped = 0
+
+    def accepts(self, event: StatusEvent) -> bool:
+        return self.cat_uuid is None or self.cat_uuid in event.cat_uuids
+
+    def put(self, event: StatusEvent) -> None:
+        # Slow consumers lose their oldest events instead of blocking writers
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait(event)
+
+
+class EventHub:
+    """
+    Fans status events out to subscribers of this process and, when started,
+    to other workers through Postgres LISTEN/NOTIFY.
+
+    The LISTEN connection is supervised: when it is closed or stops
+    answering, it is reopened with backoff. Notifications sent meanwhile are
+    lost, so the response cache is invalidated after every reconnect.
+    """
+
+    def __init__(self, health_interval: float = 30.0, min_backoff: float = 0.5, max_backoff: float = 30.0):
+        self.origin = uuid.uuid4().hex
+        self.health_interval = health_interval
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        self.reconnects = 0
+        self._subscribers: set[Subscription] = set()
+        self._connection = None
+        self._lost = asyncio.Event()
+        self._connect = None
+        self._dsn: Optional[str] = None
+        self._supervisor: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+
+    @contextlib.contextmanager
+    def subscribe(self, cat_uuid: Optional[UUID] = None):
+        """Subscribe to events; admins pass no cat_uuid and receive everything"""
+        subscription = Subscription(cat_uuid)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    def _deliver(self, event: StatusEvent) -> None:
+        for subscription in self._subscribers:
+            if subscription.accepts(event):
+                subscription.put(event)
+
+    async def publish(self, event: StatusEvent) -> None:
+        self._deliver(event)
+        if self._connection is None:
+            return
+        payload = json.dumps({"origin": self.origin, "event": asdict(event)})
+        try:
+            async with self._lock:
+                await self._connection.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+        except Exception as err:
+            logger.warning("Failed to forward event to other workers: %s", err)
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        message = json.loads(payload)
+        if message["origin"] == self.origin:
+            return
+        # Another worker committed a write, so our cached responses are stale
+        response_cache.bump("missions")
+        self._deliver(StatusEvent(**message["event"]))
+
+    async def _listen(self) -> None:
+        connection = await self._connect(self._dsn)
+        lost = asyncio.Event()
+        connection.add_termination_listener(lambda _: lost.set())
+        try:
+            await connection.add_listener(CHANNEL, self._on_notify)
+        except Exception:
+            await connection.close()
+            raise
+        self._connection, self._lost = connection, lost
+
+    async def _healthy(self) -> bool:
+        """Wait up to health_interval for the connection to drop, then ping it"""
+        try:
+            await asyncio.wait_for(self._lost.wait(), self.health_interval)
+            return False
+        except asyncio.TimeoutError:
+            pass
+        try:
+            async with self._lock:
+                await asyncio.wait_for(self._connection.execute("SELECT 1"), self.health_interval)
+            return True
+        except Exception:
+            return False
+
+    async def _supervise(self) -> None:
+        backoff = self.min_backoff
+        while True:
+            if self._connection is not None:
+                if await self._healthy():
+                    continue
+                connection, self._connection = self._connection, None
+                logger.warning("Event hub lost its LISTEN connection, reconnecting")
+                connection.terminate()
+            try:
+                await self._listen()
+            except Exception as err:
+                logger.warning("Event hub reconnect failed, retrying in %.1fs: %s", backoff, err)
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+            backoff = self.min_backoff
+            self.reconnects += 1
+            # Other workers' writes while we weren't listening went unseen
+            response_cache.bump("missions")
+
+    async def start(self, url: str, connect=None) -> None:
+        """Start listening for events published by other workers"""
+        if not is_postgres_url(url):
+            logger.info("Event hub is local to this process: LISTEN/NOTIFY needs PostgreSQL")
+            return
+        if connect is None:
+            import asyncpg
+            connect = asyncpg.connect
+
+        self._connect = connect
+        self._dsn = url.replace("postgresql+asyncpg://", "postgresql://", 1)
+        try:
+            await self._listen()
+        except Exception as err:
+            logger.warning("Event hub is running without LISTEN/NOTIFY for now: %s", err)
+        self._supervisor = asyncio.create_task(self._supervise())
+
+    async def stop(self) -> None:
+        if self._supervisor is not None:
+            self._supervisor.cancel()
+            await asyncio.gather(self._supervisor, return_exceptions=True)
+            self._supervisor = None
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+
+event_hub = EventHub()
@@ -0,0 +1,302 @@
+import asyncio
+import logging
+import os
+import random
+import socket
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import insert, or_, select, update
+
+from src.config.config import config
+from src.infrastructure.database.models.tables import BackgroundJob
+from src.infrastructure.database.session import sessionmanager
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+
+@dataclass
+class Job:
+    name: str
+    kwargs: dict = field(default_factory=dict)
+    uuid: Optional[UUID] = None
+
+
+@dataclass
+class JobStats:
+    submitted: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    retried: int = 0
+    dropped: int = 0
+    total_seconds: float = 0.0
+    last_error: Optional[str] = None
+
+
+class JobRunner:
+    """
+    Runs deferred work on the event loop, outside the request path.
+
+    Jobs go through a bounded queue served by a fixed number of workers,
+    are retried with jittered exponential backoff and, when durable mode is
+    on, are recorded in the background_jobs table so pending work survives
+    a restart.
+
+    A durable job is owned by the runner that queued or claimed it, which
+    renews a lease on its jobs while it lives. Runners claim pending jobs
+    and jobs whose lease ran out, so a job left by a dead worker is run
+    again by another one, and a job a live worker holds is never run twice.
+    """
+
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        workers: int = 2,
+        max_attempts: int = 3,
+        backoff: float = 0.5,
+        durable: bool = False,
+        lease: float = 60.0,
+    ):
+        self.queue_size = queue_size
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.durable = durable
+        self.lease = lease
+        self.owner = f"{socket.gethostname()[:40]}:{os.getpid()}:{uuid4().hex[:8]}"
+        self._handlers: dict[str, JobHandler] = {}
+        self._schedules: dict[str, float] = {}
+        self._stats: dict[str, JobStats] = {}
+        self._queue: Optional[asyncio.Queue[Job]] = None
+        self._tasks: list[asyncio.Task] = []
+        self._periodic: list[asyncio.Task] = []
+        self._accepting = False
+
+    def register(self, name: Optional[str] = None):
+        """Register a coroutine function as a job handler"""
+        def decorator(func: JobHandler) -> JobHandler:
+            job_name = name or func.__name__
+            self._handlers[job_name] = func
+            self._stats.setdefault(job_name, JobStats())
+            return func
+        return decorator
+
+    def schedule(self, name: str, interval: float) -> None:
+        """Run a registered job every `interval` seconds"""
+        self._schedules[name] = interval
+
+    async def enqueue(self, name: str, **kwargs) -> bool:
+        """Queue a job; returns False when it was dropped so callers can run it inline"""
+        if name not in self._handlers:
+            raise KeyError(f"Unknown job: {name}")
+        stats = self._stats[name]
+        if not self._accepting or self._queue.full():
+            stats.dropped += 1
+            return False
+        job = Job(name=name, kwargs=kwargs)
+        if self.durable:
+            job.uuid = await self._record_job(job)
+        self._queue.put_nowait(job)
+        stats.submitted += 1
+        return True
+
+    async def _run(self, job: Job) -> None:
+        handler = self._handlers[job.name]
+        stats = self._stats[job.name]
+        for attempt in range(1, self.max_attempts + 1):
+            started = time.perf_counter()
+            try:
+                await handler(**job.kwargs)
+            except Exception as err:
+                stats.total_seconds += time.perf_counter() - started
+                stats.last_error = repr(err)
+                if attempt == self.max_attempts:
+                    stats.failed += 1
+                    logger.error("Job %s failed after %s attempts: %r", job.name, attempt, err)
+                    await self._finish_job(job, "failed", attempt, repr(err))
+                    return
+                stats.retried += 1
+                delay = self.backoff * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                await asyncio.sleep(delay)
+            else:
+                stats.total_seconds += time.perf_counter() - started
+                stats.succeeded += 1
+                await self._finish_job(job, "succeeded", attempt)
+                return
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            try:
+                await self._run(job)
+            except Exception as err:
+                logger.error("Job %s crashed the worker loop: %r", job.name, err)
+            finally:
+                self._queue.task_done()
+
+    async def _every(self, name: str, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                if not await self.enqueue(name):
+                    logger.warning("Periodic job %s was dropped", name)
+            except Exception as err:
+                # Recording a durable job can fail while the database is down;
+                # the schedule must outlive that
+                logger.error("Failed to enqueue periodic job %s: %r", name, err)
+
+    async def _record_job(self, job: Job) -> UUID:
+        async with sessionmanager.session() as db:
+            result = await db.execute(
+                insert(BackgroundJob)
+                .values(
+                    name=job.name,
+                    payload=job.kwargs,
+                    status="running",
+                    owner=self.owner,
+                    claimed_at=datetime.utcnow(),
+                )
+                .returning(BackgroundJob.uuid)
+            )
+            await db.commit()
+            return result.scalar_one()
+
+    async def _finish_job(self, job: Job, status: str, attempts: int, error: Optional[str] = None) -> None:
+        if job.uuid is None:
+            return
+        try:
+            async with sessionmanager.session() as db:
+                await db.execute(
+                    update(BackgroundJob)
+                    .where(BackgroundJob.uuid == job.uuid, BackgroundJob.owner == self.owner)
+                    .values(status=status, attempts=attempts, last_error=error)
+                )
+                await db.commit()
+        except Exception as err:
+            logger.error("Failed to record job %s status: %r", job.uuid, err)
+
+    async def _claim(self) -> int:
+        """
+        Take pending jobs and jobs whose owner stopped renewing its lease.
+        Locked rows are skipped, so concurrent runners claim disjoint jobs.
+        """
+        room = self.queue_size - self._queue.qsize()
+        if room <= 0:
+            return 0
+        now = datetime.utcnow()
+        claimable = (
+            BackgroundJob.name.in_(self._handlers)
+            & or_(
+                BackgroundJob.status == "pending",
+                (BackgroundJob.status == "running") & (BackgroundJob.claimed_at < now - timedelta(seconds=self.lease)),
+            )
+        )
+        candidates = (
+            select(BackgroundJob.uuid)
+            .where(claimable)
+            .order_by(BackgroundJob.created_at)
+            .limit(room)
+            .with_for_update(skip_locked=True)
+        )
+        async with sessionmanager.session() as db:
+            result = await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.uuid.in_(candidates.scalar_subquery()), claimable)
+                .values(status="running", owner=self.owner, claimed_at=now)
+                .returning(BackgroundJob.uuid, BackgroundJob.name, BackgroundJob.payload, BackgroundJob.created_at)
+            )
+            claimed = sorted(result.all(), key=lambda row: row.created_at)
+            await db.commit()
+        overflow = []
+        for job_uuid, name, payload, _ in claimed:
+            try:
+                self._queue.put_nowait(Job(name=name, kwargs=payload or {}, uuid=job_uuid))
+            except asyncio.QueueFull:
+                overflow.append(job_uuid)
+                continue
+            self._stats[name].submitted += 1
+        await self._release(overflow)
+        return len(claimed) - len(overflow)
+
+    async def _release(self, job_uuids: list[UUID]) -> None:
+        """Hand jobs this runner won't run back to the other runners"""
+        if not job_uuids:
+            return
+        async with sessionmanager.session() as db:
+            await db.execute(
+                update(BackgroundJob)
+                .where(BackgroundJob.uuid.in_(job_uuids), BackgroundJob.owner == self.owner)
+                .values(status="pending", owner=None, claimed_at=None)
+            )
+            await db.commit()
+
+    async def _keep_leases(self) -> None:
+        while True:
+            await asyncio.sleep(self.lease / 3)
+            try:
+                async with sessionmanager.session() as db:
+                    await db.execute(
+                        update(BackgroundJob)
+                        .where(BackgroundJob.owner == self.owner, BackgroundJob.status == "running")
+                        .values(claimed_at=datetime.utcnow())
+                    )
+                    await db.commit()
+                await self._claim()
+            except Exception as err:
+                logger.error("Failed to renew job leases: %r", err)
+
+    async def start(self) -> None:
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._accepting = True
+        if self.durable:
+            await self._claim()
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        self._periodic = [
+            asyncio.create_task(self._every(name, interval))
+            for name, interval in self._schedules.items()
+        ]
+        if self.durable:
+            self._periodic.append(asyncio.create_task(self._keep_leases()))
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Stop accepting jobs and drain the queue before cancelling workers"""
+        self._accepting = False
+        for task in self._periodic:
+            task.cancel()
+        if self._queue is not None:
+            try:
+                await asyncio.wait_for(self._queue.join(), timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Job queue was not drained, %s jobs left", self._queue.qsize())
+                left = []
+                while not self._queue.empty():
+                    left.append(self._queue.get_nowait())
+                    self._queue.task_done()
+                try:
+                    await self._release([job.uuid for job in left if job.uuid is not None])
+                except Exception as err:
+                    logger.error("Failed to release unfinished jobs, they run once their lease expires: %r", err)
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, *self._periodic, return_exceptions=True)
+        self._tasks, self._periodic = [], []
+
+    def stats(self) -> dict:
+        return {
+            "queued": self._queue.qsize() if self._queue else 0,
+            "jobs": {name: asdict(stats) for name, stats in self._stats.items()},
+        }
+
+
+job_runner = JobRunner(
+    queue_size=config.JOBS_QUEUE_SIZE,
+    workers=config.JOBS_WORKERS,
+    max_attempts=config.JOBS_MAX_ATTEMPTS,
+    durable=config.JOBS_DURABLE,
+    lease=config.JOBS_LEASE_SECONDS,
+)
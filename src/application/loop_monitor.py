@@ -0,0 +1,118 @@
+import asyncio
+import logging
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from typing import Optional
+
+from src.config.config import config
+
+logger = logging.getLogger(__name__)
+
+LAG_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000)
+SOURCE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def describe_call_site(frame) -> str:
+    """Name the innermost project frame and the innermost frame of a blocked stack"""
+    innermost = f"{frame.f_code.co_filename}:{frame.f_lineno} in {frame.f_code.co_name}"
+    current = frame
+    while current is not None:
+        if current.f_code.co_filename.startswith(SOURCE_ROOT):
+            own = f"{os.path.relpath(current.f_code.co_filename, os.path.dirname(SOURCE_ROOT))}:{current.f_lineno} in {current.f_code.co_name}"
+            return own if current is frame else f"{own} -> {innermost}"
+        current = current.f_back
+    return innermost
+
+
+class LoopMonitor:
+    """
+    Measures event-loop lag and catches the code that blocks the loop.
+
+    A coroutine sleeps for `interval` and records how late it wakes up. A
+    watchdog thread checks its heartbeat, and when the loop has been stuck
+    longer than `threshold` it samples the loop thread's stack and logs the
+    offending call site.
+    """
+
+    def __init__(self, interval: float = 0.1, threshold: float = 0.1):
+        self.interval = interval
+        self.threshold = threshold
+        self.max_lag_ms = 0.0
+        self.last_lag_ms = 0.0
+        self.stalls = 0
+        self.histogram: Counter = Counter()
+        self.call_sites: Counter = Counter()
+        self._heartbeat = time.monotonic()
+        self._sampled = False
+        self._loop_thread_id: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def _record(self, lag_ms: float) -> None:
+        self.last_lag_ms = lag_ms
+        self.max_lag_ms = max(self.max_lag_ms, lag_ms)
+        bucket = next((f"<{b}ms" for b in LAG_BUCKETS_MS if lag_ms < b), f">={LAG_BUCKETS_MS[-1]}ms")
+        self.histogram[bucket] += 1
+
+    async def _tick(self) -> None:
+        while True:
+            started = time.monotonic()
+            await asyncio.sleep(self.interval)
+            self._heartbeat = time.monotonic()
+            self._sampled = False
+            self._record(max(0.0, (self._heartbeat - started - self.interval) * 1000))
+
+    def _watch(self) -> None:
+        while not self._stop.wait(self.threshold / 2):
+            stalled = time.monotonic() - self._heartbeat - self.interval
+            if stalled < self.threshold or self._sampled:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._sampled = True
+            self.stalls += 1
+            call_site = describe_call_site(frame)
+            self.call_sites[call_site] += 1
+            logger.warning(
+                "Event loop blocked for %.0fms at %s\n%s",
+                stalled * 1000, call_site, "".join(traceback.format_stack(frame)),
+            )
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._tick())
+        self._thread = threading.Thread(target=self._watch, name="loop-monitor", daemon=True)
+        self._thread.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if self._thread is not None:
+            await asyncio.to_thread(self._thread.join)
+            self._thread = None
+
+    def stats(self) -> dict:
+        return {
+            "last_lag_ms": round(self.last_lag_ms, 3),
+            "max_lag_ms": round(self.max_lag_ms, 3),
+            "stalls": self.stalls,
+            "histogram": dict(self.histogram),
+            "call_sites": dict(self.call_sites.most_common(20)),
+        }
+
+
+loop_monitor = LoopMonitor(
+    interval=config.LOOP_MONITOR_INTERVAL,
+    threshold=config.LOOP_MONITOR_THRESHOLD,
+)
@@ -0,0 +1,84 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from uuid import UUID
+
+EXPERIENCE_CAP = 10
+
+
+@dataclass(frozen=True)
+class Candidate:
+    """Idle cat with the features used for matching"""
+    uuid: UUID
+    breed: str
+    years_of_experience: int
+
+
+@dataclass
+class Opening:
+    """Pending mission with the number of cats it still needs"""
+    uuid: UUID
+    slots: int
+    team_breeds: set = field(default_factory=set)
+
+
+@dataclass(frozen=True)
+class Assignment:
+    mission_uuid: UUID
+    cat_uuid: UUID
+    score: float
+
+
+class MatchingEngine:
+    """
+    Staffs pending missions with idle cats.
+
+    A cat scores against a mission on experience (capped at EXPERIENCE_CAP
+    years) and on bringing a breed the mission team doesn't have yet.
+    Missions are filled greedily in rounds, one cat per mission per round
+    in the given order, and every cat is used at most once.
+
+    Candidates are kept in experience order per breed, and a slot only
+    scores the most experienced unused cat of every breed, instead of every
+    idle cat.
+    """
+
+    def __init__(self, experience_weight: float = 0.7, breed_weight: float = 0.3):
+        self.experience_weight = experience_weight
+        self.breed_weight = breed_weight
+
+    def score(self, cat: Candidate, opening: Opening) -> float:
+        experience = min(cat.years_of_experience, EXPERIENCE_CAP) / EXPERIENCE_CAP
+        novelty = 0.0 if cat.breed in opening.team_breeds else 1.0
+        return self.experience_weight * experience + self.breed_weight * novelty
+
+    def plan(self, cats: list[Candidate], openings: list[Opening]) -> list[Assignment]:
+        by_breed: dict[str, list[Candidate]] = defaultdict(list)
+        for cat in sorted(cats, key=lambda cat: cat.years_of_experience, reverse=True):
+            by_breed[cat.breed].append(cat)
+        heads: dict[str, int] = defaultdict(int)
+        used: set[UUID] = set()
+
+        def head_of(breed: str):
+            candidates, position = by_breed[breed], heads[breed]
+            while position < len(candidates) and candidates[position].uuid in used:
+                position += 1
+            heads[breed] = position
+            return candidates[position] if position < len(candidates) else None
+
+        assignments = []
+        remaining = [opening for opening in openings if opening.slots > 0]
+        while remaining and len(used) < len(cats):
+            for opening in remaining:
+                candidates = [cat for cat in map(head_of, by_breed) if cat is not None]
+                if not candidates:
+                    break
+                best = max(candidates, key=lambda cat: self.score(cat, opening))
+                assignments.append(Assignment(opening.uuid, best.uuid, round(self.score(best, opening), 4)))
+                used.add(best.uuid)
+                opening.team_breeds.add(best.breed)
+                opening.slots -= 1
+            remaining = [opening for opening in remaining if opening.slots > 0]
+        return assignments
+
+
+matching_engine = MatchingEngine()
@@ -10,5 +10,9 @@ class PasswordService:
     def get_password_hash(self, password: str):
         return self.pwd_context.hash(password)
 
+    def warmup(self):
+        """Load the bcrypt backend at startup instead of on the first login"""
+        self.pwd_context.handler().get_backend()
+
 
 password_service = PasswordService()
@@ -0,0 +1,94 @@
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable, Optional
+
+from src.config.config import config
+
+
+class ResponseCache:
+    """
+    In-process LRU cache of serialized responses.
+
+    Entries are keyed by route, parameters and the versions of the entities
+    they were built from, so bumping an entity version makes its entries
+    unreachable; they are then evicted by the LRU bound or the TTL.
+    """
+
+    def __init__(self, max_size: int = 256, ttl: float = 30.0):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: OrderedDict[tuple, tuple[float, Any]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def version(self, entity: str) -> int:
+        return self._versions.get(entity, 0)
+
+    def bump(self, *entities: str) -> None:
+        """Invalidate every cached response built from these entities"""
+        for entity in entities:
+            self._versions[entity] = self.version(entity) + 1
+
+    def make_key(self, route: str, params: Optional[dict], entities: Iterable[str]) -> tuple:
+        return (
+            route,
+            tuple(sorted((params or {}).items())),
+            tuple((entity, self.version(entity)) for entity in entities),
+        )
+
+    def get(self, key: tuple) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        stored_at, value = entry
+        if self.ttl and time.monotonic() - stored_at > self.ttl:
+            del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: tuple, value: Any) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_set(
+        self,
+        route: str,
+        params: Optional[dict],
+        entities: Iterable[str],
+        build: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        # The key captures versions before the read, so a write racing with
+        # the build leaves the stored entry unreachable instead of stale.
+        key = self.make_key(route, params, entities)
+        value = self.get(key)
+        if value is None:
+            value = await build()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "versions": dict(self._versions),
+        }
+
+
+response_cache = ResponseCache(
+    max_size=config.RESPONSE_CACHE_SIZE, ttl=config.RESPONSE_CACHE_TTL
+)
@@ -0,0 +1,97 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from src.config.config import config
+from src.infrastructure.database.repositories.revoked_tokens import RevokedTokenRepository
+from src.infrastructure.database.session import sessionmanager
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationList:
+    """
+    Revoked token ids held in memory, so checking a token costs a dict
+    lookup instead of a query. The revoked_tokens table is the source of
+    truth: every worker pulls the rows added since its last sync, and ids
+    are forgotten once their token would have expired anyway.
+    """
+
+    def __init__(self, sync_interval: float = 5.0, compact_interval: float = 3600.0, overlap: float = 60.0):
+        self.sync_interval = sync_interval
+        self.compact_interval = compact_interval
+        self.overlap = timedelta(seconds=overlap)
+        self._expires: dict[str, datetime] = {}
+        self._cursor: Optional[datetime] = None
+        self._task: Optional[asyncio.Task] = None
+        self.synced_at: Optional[datetime] = None
+        self.sync_errors = 0
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        return jti is not None and jti in self._expires
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        """Persist the revocation and apply it to this worker right away"""
+        async with sessionmanager.session() as db:
+            await RevokedTokenRepository(db).revoke(jti, expires_at)
+        self._expires[jti] = expires_at
+
+    async def sync(self) -> int:
+        """Load revocations made by any worker since the last sync; returns the rows read"""
+        async with sessionmanager.session() as db:
+            rows = await RevokedTokenRepository(db).revoked_since(self._cursor, self.overlap)
+        for jti, expires_at, revoked_at in rows:
+            self._expires[jti] = expires_at
+            if self._cursor is None or revoked_at > self._cursor:
+                self._cursor = revoked_at
+        self.synced_at = datetime.utcnow()
+        return len(rows)
+
+    async def compact(self) -> int:
+        """Drop expired ids here and in the table; returns the rows deleted"""
+        now = datetime.utcnow()
+        self._expires = {jti: expires_at for jti, expires_at in self._expires.items() if expires_at > now}
+        async with sessionmanager.session() as db:
+            deleted = await RevokedTokenRepository(db).purge_expired()
+        if deleted:
+            logger.info("Compacted %s expired revoked tokens", deleted)
+        return deleted
+
+    async def _refresh(self) -> None:
+        compacted = time.monotonic()
+        while True:
+            await asyncio.sleep(self.sync_interval)
+            try:
+                await self.sync()
+                if time.monotonic() - compacted >= self.compact_interval:
+                    await self.compact()
+                    compacted = time.monotonic()
+            except Exception as err:
+                # A worker that can't reach the database keeps its last list
+                # and tries again on the next tick
+                self.sync_errors += 1
+                logger.warning("Revoked token sync failed: %r", err)
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._refresh())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    def stats(self) -> dict:
+        return {
+            "revoked": len(self._expires),
+            "synced_at": self.synced_at,
+            "sync_errors": self.sync_errors,
+        }
+
+
+revocation_list = RevocationList(
+    sync_interval=config.TOKEN_REVOCATION_SYNC_INTERVAL,
+    compact_interval=config.TOKEN_REVOCATION_COMPACT_INTERVAL,
+)
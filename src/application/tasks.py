@@ -0,0 +1,26 @@
+from src.application.breed_catalog import breed_catalog
+from src.application.jobs import job_runner
+from src.config.config import config
+from src.infrastructure.database.repositories.reset_tokens import PasswordResetTokenRepository
+from src.infrastructure.database.session import sessionmanager
+
+PURGE_BATCH_SIZE = 500
+
+
+@job_runner.register()
+async def refresh_breeds():
+    """Refresh the breed catalog snapshot used by signup"""
+    await breed_catalog.refresh()
+
+
+@job_runner.register()
+async def purge_stale_reset_tokens():
+    """Delete expired password reset tokens in batches"""
+    async with sessionmanager.session() as db:
+        repository = PasswordResetTokenRepository(db)
+        while await repository.purge_expired(PURGE_BATCH_SIZE) == PURGE_BATCH_SIZE:
+            pass
+
+
+job_runner.schedule("refresh_breeds", config.BREED_REFRESH_INTERVAL)
+job_runner.schedule("purge_stale_reset_tokens", config.RESET_TOKEN_PURGE_INTERVAL)
@@ -0,0 +1,236 @@
+"""
+Generate a deterministic synthetic dataset for scale testing.
+
+    python -m src.cli.generate_dataset --cats 100000 --missions 40000 --seed 7
+
+The same seed and sizes always produce the same rows. Experience follows an
+exponential distribution, salaries are log-normal around an experience-based
+mean, breeds and countries follow a Zipf-like popularity curve, and mission
+staffing respects the one-mission-per-cat rule. Rows are bulk-loaded with
+Postgres COPY, one transaction per chunk.
+"""
+import argparse
+import asyncio
+import math
+import random
+import sys
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import text
+
+from src.config.config import config
+from src.infrastructure.database.bulk import copy_records
+from src.infrastructure.database.dialect import is_postgres
+from src.infrastructure.database.session import sessionmanager
+
+# bcrypt hash of "SecretPaw123", the same password as tests/fixtures/fixtures.sql
+PASSWORD_HASH = "$2b$12$KVEPmOXqjEGpBVgi2.Sz0OlTC2QfXie2ifjy.DraHmA4CrBSQAswK"
+
+BREEDS = [
+    "siamese", "maine coon", "persian", "british shorthair", "bengal",
+    "ragdoll", "sphynx", "abyssinian", "scottish fold", "russian blue",
+    "norwegian forest cat", "birman", "oriental", "devon rex", "burmese",
+    "ukrainian levkoy", "turkish angora", "savannah", "manx", "balinese",
+]
+COUNTRIES = [
+    "Ukraine", "United Kingdom", "France", "Germany", "Japan", "United States",
+    "Mexico", "Norway", "Switzerland", "Italy", "Spain", "Poland", "Brazil",
+    "Canada", "Egypt", "India", "Turkey", "Argentina", "Kenya", "Australia",
+]
+NAME_PREFIXES = ["Whis", "Sha", "Lu", "Fe", "Mit", "Tig", "Smo", "Pep", "Oli", "Ca", "Ne", "Zi"]
+NAME_SUFFIXES = ["kers", "dow", "na", "lix", "tens", "ger", "key", "per", "ver", "sper", "ko", "ggy"]
+CODE_WORDS = ["Red Laser", "Silent Paw", "Night Whisker", "Tuna Heist", "Yarn Ball", "Catnip", "Velvet Claw", "Midnight Purr"]
+NOTE_PHRASES = [
+    "Target spotted near the warehouse.",
+    "Communication intercepted, decoding in progress.",
+    "Target changed routine, extending surveillance.",
+    "Need backup, the operation is bigger than expected.",
+    "Undercover operation proceeding as planned.",
+    "Target suspects nothing.",
+]
+
+CAT_COLUMNS = ["uuid", "name", "password", "years_of_experience", "breed", "salary", "is_staff", "created_at", "updated_at"]
+MISSION_COLUMNS = ["uuid", "name", "description", "status", "created_at", "updated_at", "completed_at"]
+MISSION_CAT_COLUMNS = ["mission_uuid", "cat_uuid"]
+TARGET_COLUMNS = ["uuid", "name", "country", "status", "mission_uuid", "created_at", "updated_at"]
+TARGET_CAT_COLUMNS = ["target_uuid", "cat_uuid"]
+NOTE_COLUMNS = ["uuid", "content", "cat_uuid", "target_uuid", "created_at", "updated_at"]
+
+
+def zipf_weights(count: int, exponent: float = 1.1) -> list[float]:
+    return [1 / (rank ** exponent) for rank in range(1, count + 1)]
+
+
+class DatasetGenerator:
+    def __init__(self, cats: int, missions: int, seed: int, start: datetime, days: int = 3 * 365):
+        self.cats = cats
+        self.missions = missions
+        self.rng = random.Random(seed)
+        self.start = start
+        self.span = timedelta(days=days)
+        self.breed_weights = zipf_weights(len(BREEDS))
+        self.country_weights = zipf_weights(len(COUNTRIES))
+        self.idle_cats: list[uuid.UUID] = []
+
+    def uuid(self) -> uuid.UUID:
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def timestamp(self) -> datetime:
+        return self.start + self.span * self.rng.random()
+
+    def cat_rows(self):
+        for i in range(self.cats):
+            years = min(int(self.rng.expovariate(1 / 4)), 25)
+            salary = int(self.rng.lognormvariate(math.log(40000 + years * 5000), 0.25)) // 100 * 100
+            created_at = self.timestamp()
+            cat_uuid = self.uuid()
+            self.idle_cats.append(cat_uuid)
+            yield (
+                cat_uuid,
+                f"{self.rng.choice(NAME_PREFIXES)}{self.rng.choice(NAME_SUFFIXES)}-{i}",
+                PASSWORD_HASH,
+                years,
+                self.rng.choices(BREEDS, self.breed_weights)[0],
+                salary,
+                self.rng.random() < 0.02,
+                created_at,
+                created_at,
+            )
+
+    def mission_chunk(self, first: int, count: int) -> dict[str, list[tuple]]:
+        rows = {"missions": [], "mission_cats": [], "targets": [], "targets_cats": [], "notes": []}
+        for i in range(first, first + count):
+            status = self.rng.choices(["pending", "in_progress", "completed"], [0.2, 0.35, 0.45])[0]
+            cat_count = self.rng.choices([1, 2, 3], [0.6, 0.3, 0.1])[0]
+            if status != "pending" and len(self.idle_cats) < cat_count:
+                status = "pending"
+            cats = [] if status == "pending" else [self.idle_cats.pop() for _ in range(cat_count)]
+
+            mission_uuid = self.uuid()
+            created_at = self.timestamp()
+            completed_at = None
+            if status == "completed":
+                completed_at = created_at + timedelta(days=self.rng.expovariate(1 / 14))
+            rows["missions"].append((
+                mission_uuid,
+                f"Operation {self.rng.choice(CODE_WORDS)} {i}",
+                f"Synthetic mission {i}",
+                status,
+                created_at,
+                completed_at or created_at,
+                completed_at,
+            ))
+            rows["mission_cats"].extend((mission_uuid, cat_uuid) for cat_uuid in cats)
+
+            target_count = self.rng.choices([1, 2, 3], [0.3, 0.4, 0.3])[0]
+            if status == "pending":
+                statuses = ["pending"] * target_count
+            elif status == "completed":
+                statuses = ["completed"] * target_count
+            else:
+                statuses = ["completed" if self.rng.random() < 0.4 else "active" for _ in range(target_count)]
+                statuses[-1] = "active"
+            for j, target_status in enumerate(statuses):
+                target_uuid = self.uuid()
+                target_created = created_at + timedelta(hours=self.rng.uniform(0, 48))
+                target_updated = completed_at if target_status == "completed" and completed_at else target_created
+                rows["targets"].append((
+                    target_uuid,
+                    f"Target {i}-{j}",
+                    self.rng.choices(COUNTRIES, self.country_weights)[0],
+                    target_status,
+                    mission_uuid,
+                    target_created,
+                    target_updated,
+                ))
+                if target_status == "pending":
+                    continue
+                cat_uuid = self.rng.choice(cats)
+                rows["targets_cats"].append((target_uuid, cat_uuid))
+                for _ in range(min(int(self.rng.expovariate(1 / 1.5)), 10)):
+                    note_created = target_created + timedelta(hours=self.rng.uniform(1, 24 * 14))
+                    rows["notes"].append((
+                        self.uuid(),
+                        self.rng.choice(NOTE_PHRASES),
+                        cat_uuid,
+                        target_uuid,
+                        note_created,
+                        note_created,
+                    ))
+        return rows
+
+
+# Children before parents, so the SQLite deletes respect the foreign keys
+TRUNCATE_TABLES = (
+    "attachments", "notes", "targets_cats", "targets", "mission_cats", "missions",
+    "password_reset_tokens", "revoked_tokens", "background_jobs", "cats",
+)
+
+
+async def load(generator: DatasetGenerator, batch_size: int, truncate: bool) -> None:
+    async with sessionmanager.session() as db:
+        if truncate:
+            if is_postgres(db):
+                await db.execute(text(f"TRUNCATE {', '.join(TRUNCATE_TABLES)} CASCADE"))
+            else:
+                for table in TRUNCATE_TABLES:
+                    await db.execute(text(f"DELETE FROM {table}"))
+            await db.commit()
+
+        batch = []
+        for row in generator.cat_rows():
+            batch.append(row)
+            if len(batch) == batch_size:
+                await copy_records(db, "cats", CAT_COLUMNS, batch)
+                await db.commit()
+                batch = []
+        if batch:
+            await copy_records(db, "cats", CAT_COLUMNS, batch)
+            await db.commit()
+        print(f"cats: {generator.cats}", file=sys.stderr)
+        # Staff cats from the end of the shuffled pool first
+        generator.rng.shuffle(generator.idle_cats)
+
+        for first in range(0, generator.missions, batch_size):
+            count = min(batch_size, generator.missions - first)
+            rows = generator.mission_chunk(first, count)
+            await copy_records(db, "missions", MISSION_COLUMNS, rows["missions"])
+            await copy_records(db, "mission_cats", MISSION_CAT_COLUMNS, rows["mission_cats"])
+            await copy_records(db, "targets", TARGET_COLUMNS, rows["targets"])
+            await copy_records(db, "targets_cats", TARGET_CAT_COLUMNS, rows["targets_cats"])
+            await copy_records(db, "notes", NOTE_COLUMNS, rows["notes"])
+            await db.commit()
+            print(f"missions: {first + count}/{generator.missions}", file=sys.stderr)
+
+        await db.execute(text("ANALYZE"))
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Generate a synthetic Spy Cat dataset")
+    parser.add_argument("--cats", type=int, default=10_000)
+    parser.add_argument("--missions", type=int, help="defaults to a third of --cats")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--start", type=datetime.fromisoformat, default=datetime(2023, 1, 1))
+    parser.add_argument("--truncate", action="store_true", help="empty the tables first")
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> None:
+    args = parse_args(argv)
+    generator = DatasetGenerator(
+        cats=args.cats,
+        missions=args.missions if args.missions is not None else args.cats // 3,
+        seed=args.seed,
+        start=args.start,
+    )
+    sessionmanager.init(config.url)
+    try:
+        await load(generator, args.batch_size, args.truncate)
+    finally:
+        await sessionmanager.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,223 @@
+"""
+Bulk import cats from a CSV or NDJSON file.
+
+    python -m src.cli.import_cats cats.csv --batch-size 2000 --workers 8
+
+Rows need name, years_of_experience, breed and password columns; salary
+and is_staff are optional. Breeds are checked against one snapshot of the
+breed catalog, passwords are hashed across a process pool and rows are
+loaded with Postgres COPY in batches. Progress is checkpointed after each
+batch so an interrupted import resumes where it stopped, and rejected rows
+are written to an NDJSON error file.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Union
+
+from pydantic import ValidationError
+from sqlalchemy import func, select
+
+from src.application.breed_catalog import breed_catalog
+from src.application.password_service import password_service
+from src.config.config import config
+from src.infrastructure.database.bulk import copy_records
+from src.infrastructure.database.models.tables import Cat
+from src.infrastructure.database.session import sessionmanager
+from src.presentation.schemas.cats import CatModel
+
+COPY_COLUMNS = [
+    "uuid", "name", "password", "years_of_experience", "breed",
+    "salary", "is_staff", "created_at", "updated_at",
+]
+
+
+def hash_password(password: str) -> str:
+    return password_service.get_password_hash(password)
+
+
+@dataclass
+class MalformedRow:
+    """A row that could not be read as a set of columns"""
+    error: str
+
+
+Row = tuple[int, Union[dict, MalformedRow]]
+
+
+def read_rows(path: Path, fmt: str) -> Iterator[Row]:
+    """Yield (row number, raw row) pairs; row numbers start at 1"""
+    with path.open(newline="", encoding="utf-8") as file:
+        if fmt == "csv":
+            for row_number, raw in enumerate(csv.DictReader(file), start=1):
+                # DictReader keeps the values of columns past the header under None
+                extra = raw.pop(None, None)
+                if extra:
+                    yield row_number, MalformedRow(f"Row has {len(raw) + len(extra)} values, the header has {len(raw)} columns")
+                else:
+                    yield row_number, raw
+        else:
+            row_number = 0
+            for line in file:
+                if line.strip():
+                    row_number += 1
+                    try:
+                        raw = json.loads(line)
+                    except json.JSONDecodeError as err:
+                        yield row_number, MalformedRow(f"Invalid JSON: {err}")
+                        continue
+                    if not isinstance(raw, dict):
+                        yield row_number, MalformedRow(f"Expected an object, got {type(raw).__name__}")
+                        continue
+                    yield row_number, raw
+
+
+def batched(rows: Iterator[Row], size: int) -> Iterator[list[Row]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class CatImporter:
+    def __init__(self, path: Path, fmt: str, batch_size: int, workers: int,
+                 checkpoint: Path, errors: Path):
+        self.path = path
+        self.fmt = fmt
+        self.batch_size = batch_size
+        self.workers = workers
+        self.checkpoint = checkpoint
+        self.errors = errors
+        self.imported = 0
+        self.rejected = 0
+
+    def load_checkpoint(self) -> int:
+        if self.checkpoint.exists():
+            return json.loads(self.checkpoint.read_text())["last_row"]
+        return 0
+
+    def save_checkpoint(self, last_row: int) -> None:
+        tmp = self.checkpoint.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"last_row": last_row}))
+        os.replace(tmp, self.checkpoint)
+
+    async def existing_names(self) -> set[str]:
+        async with sessionmanager.session() as db:
+            result = await db.execute(select(func.lower(Cat.name)))
+            return set(result.scalars().all())
+
+    def validate(self, batch, breeds: frozenset[str], names: set[str], error_file):
+        """Split a batch into valid cat models and write the rejected rows out"""
+        valid = []
+        for row_number, raw in batch:
+            if isinstance(raw, MalformedRow):
+                self.rejected += 1
+                error_file.write(json.dumps({"row": row_number, "name": None, "errors": [raw.error]}) + "\n")
+                continue
+            errors = []
+            cat = None
+            try:
+                cat = CatModel(**raw)
+            except ValidationError as err:
+                errors = [f"{'.'.join(map(str, e['loc']))}: {e['msg']}" for e in err.errors()]
+            try:
+                salary = int(raw.get("salary") or 0)
+                if salary < 0:
+                    raise ValueError
+            except (TypeError, ValueError):
+                errors.append(f"salary: invalid value {raw.get('salary')!r}")
+            if cat is not None:
+                if cat.breed not in breeds:
+                    errors.append(f"Invalid breed: {cat.breed}")
+                if cat.name.lower() in names:
+                    errors.append(f"Cat {cat.name} already exists")
+            if errors:
+                self.rejected += 1
+                error_file.write(json.dumps({"row": row_number, "name": raw.get("name"), "errors": errors}) + "\n")
+                continue
+            names.add(cat.name.lower())
+            is_staff = str(raw.get("is_staff", "")).lower() in ("1", "true", "yes")
+            valid.append((cat, salary, is_staff))
+        return valid
+
+    async def copy_batch(self, valid, hashes: list[str]) -> None:
+        now = datetime.now()
+        records = [
+            (
+                uuid.uuid4(), cat.name, hashed, cat.years_of_experience, cat.breed,
+                salary, is_staff, now, now,
+            )
+            for (cat, salary, is_staff), hashed in zip(valid, hashes)
+        ]
+        async with sessionmanager.session() as db:
+            await copy_records(db, Cat.__tablename__, COPY_COLUMNS, records)
+            await db.commit()
+
+    async def run(self) -> None:
+        breeds = await breed_catalog.names()
+        names = await self.existing_names()
+        resume_after = self.load_checkpoint()
+        rows = ((n, raw) for n, raw in read_rows(self.path, self.fmt) if n > resume_after)
+        loop = asyncio.get_running_loop()
+
+        with ProcessPoolExecutor(max_workers=self.workers) as pool, \
+                self.errors.open("a", encoding="utf-8") as error_file:
+            for batch in batched(rows, self.batch_size):
+                valid = self.validate(batch, breeds, names, error_file)
+                if valid:
+                    passwords = [cat.password for cat, _, _ in valid]
+                    hashes = await loop.run_in_executor(
+                        None, lambda: list(pool.map(hash_password, passwords, chunksize=16))
+                    )
+                    await self.copy_batch(valid, hashes)
+                    self.imported += len(valid)
+                error_file.flush()
+                self.save_checkpoint(batch[-1][0])
+                print(f"row {batch[-1][0]}: imported {self.imported}, rejected {self.rejected}",
+                      file=sys.stderr)
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Bulk import cats from CSV or NDJSON")
+    parser.add_argument("path", type=Path)
+    parser.add_argument("--format", choices=["csv", "ndjson"])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--checkpoint", type=Path)
+    parser.add_argument("--errors", type=Path)
+    return parser.parse_args(argv)
+
+
+async def main(argv=None) -> None:
+    args = parse_args(argv)
+    fmt = args.format or ("csv" if args.path.suffix.lower() == ".csv" else "ndjson")
+    importer = CatImporter(
+        path=args.path,
+        fmt=fmt,
+        batch_size=args.batch_size,
+        workers=args.workers,
+        checkpoint=args.checkpoint or args.path.with_name(args.path.name + ".checkpoint"),
+        errors=args.errors or args.path.with_name(args.path.name + ".errors.ndjson"),
+    )
+    sessionmanager.init(config.url)
+    try:
+        await importer.run()
+    finally:
+        await sessionmanager.close()
+    print(f"Imported {importer.imported} cats, rejected {importer.rejected}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,169 @@
+"""
+Replay captured traffic and compare latency between builds.
+
+    python -m src.cli.replay run captures/traffic.ndjson* --base-url http://localhost:8000 \\
+        --token <admin access token> --speed 2 --output build-a.ndjson
+    python -m src.cli.replay compare build-a.ndjson build-b.ndjson
+
+`run` re-issues every captured request at its original offset divided by
+--speed, so the concurrency profile of the capture is preserved. Replay
+against a copy of the captured database so the recorded paths resolve.
+Only reads are replayed unless --include-writes is given, since write bodies
+can only be synthesized from the captured shapes. Authenticated requests use
+--token, and responses whose status differs from the capture are reported.
+`compare` prints per-route latency percentiles of two result files.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import Counter, defaultdict
+from pathlib import Path
+
+import httpx
+
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+PLACEHOLDERS = {"str": "replay", "int": 1, "float": 1.0, "bool": False, "null": None}
+
+
+def value_from_shape(shape):
+    if isinstance(shape, dict) and "list" in shape and "length" in shape:
+        return [value_from_shape(shape["list"]) for _ in range(shape["length"])] if shape["list"] else []
+    if isinstance(shape, dict):
+        return {key: value_from_shape(item) for key, item in shape.items()}
+    return PLACEHOLDERS.get(shape, "replay")
+
+
+def load_records(paths: list[Path]) -> list[dict]:
+    records = []
+    for path in paths:
+        with path.open(encoding="utf-8") as file:
+            records.extend(json.loads(line) for line in file if line.strip())
+    records.sort(key=lambda record: record["ts"])
+    return records
+
+
+async def send(client: httpx.AsyncClient, record: dict, token: str | None) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if record["auth"] and token else {}
+    kwargs = {"params": [tuple(pair) for pair in record["query"]], "headers": headers}
+    if record["body_type"] == "json":
+        kwargs["json"] = value_from_shape(record["body"])
+    elif record["body_type"] == "form":
+        kwargs["data"] = value_from_shape(record["body"])
+    started = time.perf_counter()
+    try:
+        response = await client.request(record["method"], record["path"], **kwargs)
+        status = response.status_code
+    except httpx.HTTPError as err:
+        status = type(err).__name__
+    return {
+        "route": record["route"] or record["path"],
+        "method": record["method"],
+        "status": status,
+        "captured_status": record["status"],
+        "latency_ms": round((time.perf_counter() - started) * 1000, 3),
+        "captured_ms": record["duration_ms"],
+    }
+
+
+async def replay(records: list[dict], base_url: str, token: str | None, speed: float,
+                 max_concurrency: int, output: Path) -> None:
+    limits = httpx.Limits(max_connections=max_concurrency)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    first = records[0]["ts"]
+    started = time.monotonic()
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client, \
+            output.open("w", encoding="utf-8") as out:
+        async def fire(record):
+            delay = (record["ts"] - first) / speed - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            async with semaphore:
+                result = await send(client, record, token)
+            out.write(json.dumps(result) + "\n")
+            return result
+
+        results = await asyncio.gather(*(fire(record) for record in records))
+    print(f"Replayed {len(records)} requests in {time.monotonic() - started:.1f}s", file=sys.stderr)
+    report_mismatches(results)
+
+
+def report_mismatches(results: list[dict]) -> None:
+    """Print the routes whose replayed status differs from the captured one"""
+    mismatches = Counter(
+        (f"{result['method']} {result['route']}", result["captured_status"], result["status"])
+        for result in results
+        if result["status"] != result["captured_status"]
+    )
+    if not mismatches:
+        return
+    print(f"{sum(mismatches.values())} of {len(results)} responses differ from the capture:", file=sys.stderr)
+    for (route, captured, replayed), count in mismatches.most_common():
+        print(f"  {route}: {captured} → {replayed} ({count}x)", file=sys.stderr)
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def latencies_by_route(path: Path) -> dict[str, list[float]]:
+    routes = defaultdict(list)
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            result = json.loads(line)
+            routes[f"{result['method']} {result['route']}"].append(result["latency_ms"])
+    return routes
+
+
+def compare(baseline: Path, candidate: Path) -> None:
+    before, after = latencies_by_route(baseline), latencies_by_route(candidate)
+    print(f"{'route':<50} {'n':>6} {'p50 a→b':>18} {'p95 a→b':>18} {'p99 a→b':>18}")
+    for route in sorted(before.keys() | after.keys()):
+        a, b = before.get(route), after.get(route)
+        if not a or not b:
+            print(f"{route:<50} only in {'baseline' if a else 'candidate'}")
+            continue
+        cells = []
+        for fraction in (0.5, 0.95, 0.99):
+            pa, pb = percentile(a, fraction), percentile(b, fraction)
+            change = (pb - pa) / pa * 100 if pa else 0.0
+            cells.append(f"{pa:.1f}→{pb:.1f} ({change:+.0f}%)")
+        print(f"{route:<50} {len(b):>6} " + " ".join(f"{cell:>18}" for cell in cells))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Replay captured traffic")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="re-issue captured requests")
+    run.add_argument("captures", type=Path, nargs="+")
+    run.add_argument("--base-url", default="http://localhost:8000")
+    run.add_argument("--token", help="access token for requests captured with a bearer token")
+    run.add_argument("--speed", type=float, default=1.0)
+    run.add_argument("--max-concurrency", type=int, default=500)
+    run.add_argument("--output", type=Path, default=Path("replay.ndjson"))
+    run.add_argument("--include-writes", action="store_true",
+                     help="also replay writes, with bodies synthesized from the captured shapes")
+
+    diff = commands.add_parser("compare", help="compare latency of two replays")
+    diff.add_argument("baseline", type=Path)
+    diff.add_argument("candidate", type=Path)
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        records = load_records(args.captures)
+        if not args.include_writes:
+            records = [record for record in records if record["method"] in READ_METHODS]
+        if not records:
+            sys.exit("No captured requests")
+        asyncio.run(replay(records, args.base_url, args.token, args.speed,
+                           args.max_concurrency, args.output))
+    else:
+        compare(args.baseline, args.candidate)
+
+
+if __name__ == "__main__":
+    main()
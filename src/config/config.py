@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, Optional
 from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -10,8 +10,61 @@ class Settings(BaseSettings):
     DATABASE_NAME: str = "postgres"
     DATABASE_USER: str = "postgres"
     DATABASE_PASSWORD: str = "postgres"
+    DATABASE_URL: Optional[str] = None
     SECRET_KEY: str
     ALGORITHM: str = "HS256"
+    WEB_HOST: str = "0.0.0.0"
+    WEB_PORT: int = 8000
+    WEB_WORKERS: int = 0
+    WEB_MAX_REQUESTS: int = 0
+    WEB_MAX_REQUESTS_JITTER: int = 0
+    DB_MAX_CONNECTIONS: int = 0
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_WARMUP_CONNECTIONS: int = 2
+    STARTUP_BUDGET_SECONDS: float = 5.0
+    SHUTDOWN_DRAIN_SECONDS: float = 10.0
+    SLOW_QUERY_LOG_ENABLED: bool = False
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN_MS: float = 500.0
+    PROFILING_ENABLED: bool = False
+    PROFILING_DIR: str = "profiles"
+    PROFILING_SAMPLE_RATE: float = 0.0
+    LOOP_MONITOR_ENABLED: bool = False
+    LOOP_MONITOR_INTERVAL: float = 0.1
+    LOOP_MONITOR_THRESHOLD: float = 0.1
+    CAPTURE_ENABLED: bool = False
+    CAPTURE_DIR: str = "captures"
+    CAPTURE_MAX_BYTES: int = 50 * 1024 * 1024
+    CAPTURE_BACKUP_COUNT: int = 10
+    RESPONSE_CACHE_SIZE: int = 256
+    RESPONSE_CACHE_TTL: float = 30.0
+    JOBS_QUEUE_SIZE: int = 1000
+    JOBS_WORKERS: int = 2
+    JOBS_MAX_ATTEMPTS: int = 3
+    JOBS_DURABLE: bool = False
+    JOBS_LEASE_SECONDS: float = 60.0
+    BREED_REFRESH_INTERVAL: float = 3600.0
+    RESET_TOKEN_PURGE_INTERVAL: float = 3600.0
+    RESET_TOKEN_TTL: float = 86400.0
+    TOKEN_REVOCATION_SYNC_INTERVAL: float = 5.0
+    TOKEN_REVOCATION_COMPACT_INTERVAL: float = 3600.0
+    ATTACHMENTS_DIR: str = "attachments"
+    LOG_LEVEL: str = "INFO"
+    LOG_JSON: bool = True
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    ATTACHMENT_MAX_BYTES: int = 100 * 1024 * 1024
+    REQUEST_TIMEOUT_SECONDS: float = 10.0
+    ROUTE_TIMEOUTS: dict[str, float] = {
+        "/api/admin/cats/name": 2.0,
+        "/api/admin/missions": 5.0,
+        "/api/admin/missions/match": 30.0,
+        "/api/admin/analytics": 30.0,
+        "/api/admin/events": 0,
+        "/api/cats/events": 0,
+        "/api/cats/attachments": 0,
+    }
 
     @field_validator("ALGORITHM")
     @classmethod
@@ -26,6 +79,8 @@ class Settings(BaseSettings):
 
     @property
     def url(self) -> str:
+        if self.DATABASE_URL:
+            return self.DATABASE_URL
         return (
             f"{self.DATABASE_DRIVER}://"
             f"{self.DATABASE_USER}:{self.DATABASE_PASSWORD}@"
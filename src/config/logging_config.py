@@ -0,0 +1,137 @@
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import traceback
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Optional
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# LogRecord attributes that are not user-supplied `extra` fields
+RESERVED_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id"}
+# Loggers whose handlers are replaced so their records go through the queue
+SERVER_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the request id and any `extra` fields"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            entry["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in RESERVED_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = "".join(traceback.format_exception(*record.exc_info))
+        return json.dumps(entry, default=str)
+
+
+class ContextFilter(logging.Filter):
+    """Stamp records with the request id of the task that logged them"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only a fraction of the records below WARNING from noisy loggers.
+    `rates` maps logger name prefixes to the fraction to keep.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        super().__init__()
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if random.random() < rate:
+                    return True
+                self.sampled_out += 1
+                return False
+        return True
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Queue handler that drops records instead of blocking when the queue is full"""
+
+    def __init__(self, records: queue.Queue):
+        super().__init__(records)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LoggingPipeline:
+    """
+    Formats records on the logging thread and writes them from a background
+    thread, so a slow stderr never blocks the event loop. When the writer
+    falls behind, the bounded queue drops records and counts them.
+    """
+
+    def __init__(self):
+        self.handler: Optional[DroppingQueueHandler] = None
+        self.sampler: Optional[SamplingFilter] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def configure(self, level: str = "INFO", json_format: bool = True,
+                  queue_size: int = 10_000, sample_rates: Optional[dict] = None) -> None:
+        self.stop()
+        records: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.sampler = SamplingFilter(sample_rates or {})
+        self.handler = DroppingQueueHandler(records)
+        self.handler.addFilter(ContextFilter())
+        self.handler.addFilter(self.sampler)
+        self.handler.setFormatter(JsonFormatter() if json_format else logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+        output = logging.StreamHandler(sys.stderr)
+        output.setFormatter(logging.Formatter("%(message)s"))
+        self.listener = logging.handlers.QueueListener(records, output)
+
+        root = logging.getLogger()
+        root.handlers = [self.handler]
+        root.setLevel(level)
+        for name in SERVER_LOGGERS:
+            server_logger = logging.getLogger(name)
+            server_logger.handlers = []
+            server_logger.propagate = True
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Flush queued records; call on shutdown"""
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+
+    def stats(self) -> dict:
+        return {
+            "queued": self.handler.queue.qsize() if self.handler else 0,
+            "dropped": self.handler.dropped if self.handler else 0,
+            "sampled_out": self.sampler.sampled_out if self.sampler else 0,
+        }
+
+
+logging_pipeline = LoggingPipeline()
@@ -0,0 +1,23 @@
+from typing import Iterable, Sequence
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.infrastructure.database.dialect import is_postgres
+from src.infrastructure.database.models.tables import Base
+
+
+async def copy_records(
+    db: AsyncSession, table: str, columns: Sequence[str], records: Iterable[tuple]
+) -> None:
+    """Load rows with Postgres COPY on the session's connection and transaction"""
+    if not is_postgres(db):
+        # No COPY elsewhere: fall back to an executemany INSERT
+        rows = [dict(zip(columns, record)) for record in records]
+        if rows:
+            await db.execute(Base.metadata.tables[table].insert(), rows)
+        return
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        table, records=records, columns=list(columns)
+    )
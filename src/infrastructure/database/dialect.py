@@ -0,0 +1,31 @@
+from fastapi import HTTPException, status
+from sqlalchemy import Table
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def is_postgres_url(url: str) -> bool:
+    return make_url(url).get_backend_name() == "postgresql"
+
+
+def dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def is_postgres(db: AsyncSession) -> bool:
+    return dialect_name(db) == "postgresql"
+
+
+def insert_for(db: AsyncSession, table: Table):
+    """INSERT construct of the session's backend, so on_conflict_do_nothing() is available"""
+    return (pg_insert if is_postgres(db) else sqlite_insert)(table)
+
+
+def require_postgres(db: AsyncSession, feature: str) -> None:
+    if not is_postgres(db):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{feature} requires PostgreSQL"
+        )
@@ -0,0 +1,148 @@
+"""
+Index advisor for the hot repository queries.
+
+    python -m src.infrastructure.database.index_advisor --min-rows 10000
+
+Runs the read paths of the repositories against the current database,
+captures the statements they issue and checks their EXPLAIN plans. A hot
+query that falls back to a sequential scan on a table with at least
+--min-rows rows fails the check, so run it against a database filled by
+src.cli.generate_dataset.
+"""
+import argparse
+import asyncio
+import json
+import sys
+from dataclasses import dataclass
+
+from sqlalchemy import event, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config.config import config
+from src.infrastructure.database.dialect import is_postgres_url
+from src.infrastructure.database.models.tables import Cat, Mission, Target, targets_cats
+from src.infrastructure.database.repositories.cats import CatRepository
+from src.infrastructure.database.repositories.missions import MissionRepository
+from src.infrastructure.database.repositories.notes import NoteRepository
+from src.infrastructure.database.repositories.targets import TargetRepository
+from src.infrastructure.database.session import sessionmanager
+
+
+@dataclass
+class SeqScan:
+    query: str
+    table: str
+    rows: int
+    statement: str
+
+
+async def hot_queries(db: AsyncSession) -> list[tuple[str, object]]:
+    """Repository reads that run on every request, with sample arguments"""
+    result = await db.execute(
+        select(Cat.uuid, Cat.name, Target.uuid, Mission.uuid, Mission.name)
+        .select_from(targets_cats)
+        .join(Cat, Cat.uuid == targets_cats.c.cat_uuid)
+        .join(Target, Target.uuid == targets_cats.c.target_uuid)
+        .join(Mission, Mission.uuid == Target.mission_uuid)
+        .limit(1)
+    )
+    sample = result.first()
+    if sample is None:
+        raise RuntimeError("The database has no assigned targets, generate a dataset first")
+    cat_uuid, cat_name, target_uuid, mission_uuid, mission_name = sample
+
+    cats = CatRepository(db)
+    missions = MissionRepository(db)
+    targets = TargetRepository(db)
+    notes = NoteRepository(db)
+    return [
+        ("CatRepository.get_by_name", cats.get_by_name(cat_name)),
+        ("CatRepository.count_cat_missions", cats.count_cat_missions(cat_uuid)),
+        ("MissionRepository.get_by_uuid", missions.get_by_uuid(mission_uuid)),
+        ("MissionRepository.get_by_name", missions.get_by_name(mission_name)),
+        ("MissionRepository.get_version", missions.get_version(mission_uuid)),
+        ("TargetRepository.get_target_by_uuid", targets.get_target_by_uuid(target_uuid, cat_uuid)),
+        ("TargetRepository.get_target_version", targets.get_target_version(target_uuid, cat_uuid)),
+        ("TargetRepository.get_all_targets_for_cat", targets.get_all_targets_for_cat(cat_uuid)),
+        ("TargetRepository.get_targets_version_for_cat", targets.get_targets_version_for_cat(cat_uuid)),
+        ("NoteRepository.get_all_for_cat", notes.get_all_for_cat(cat_uuid)),
+    ]
+
+
+def find_seq_scans(plan: dict) -> list[tuple[str, int]]:
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append((plan["Relation Name"], int(plan.get("Plan Rows", 0))))
+    for child in plan.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+async def table_sizes(db: AsyncSession) -> dict[str, int]:
+    result = await db.execute(text(
+        "SELECT relname, reltuples::bigint FROM pg_class "
+        "WHERE relkind = 'r' AND relnamespace = 'public'::regnamespace"
+    ))
+    return {name: rows for name, rows in result.all()}
+
+
+async def check(min_rows: int) -> list[SeqScan]:
+    """Explain every hot query and return the sequential scans on large tables"""
+    captured: list[tuple[str, str, object]] = []
+    current = {"query": None}
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if current["query"] and statement.lstrip()[:6].upper() == "SELECT":
+            captured.append((current["query"], statement, parameters))
+
+    engine = sessionmanager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        async with sessionmanager.session() as db:
+            for name, call in await hot_queries(db):
+                current["query"] = name
+                await call
+            current["query"] = None
+
+            sizes = await table_sizes(db)
+            problems = []
+            connection = await db.connection()
+            for name, statement, parameters in captured:
+                result = await connection.exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                )
+                plan = result.scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                for table, rows in find_seq_scans(plan[0]["Plan"]):
+                    if sizes.get(table, 0) >= min_rows:
+                        problems.append(SeqScan(name, table, rows, statement))
+            return problems
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Fail when hot queries fall back to sequential scans")
+    parser.add_argument("--min-rows", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    if not is_postgres_url(config.url):
+        print("The index advisor reads Postgres plans and needs a PostgreSQL DATABASE_URL", file=sys.stderr)
+        return 2
+    sessionmanager.init(config.url)
+    try:
+        problems = await check(args.min_rows)
+    finally:
+        await sessionmanager.close()
+    for problem in problems:
+        print(f"{problem.query}: Seq Scan on {problem.table}\n    {problem.statement}", file=sys.stderr)
+    if problems:
+        print(f"{len(problems)} hot queries use sequential scans", file=sys.stderr)
+        return 1
+    print("All hot queries use indexes", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
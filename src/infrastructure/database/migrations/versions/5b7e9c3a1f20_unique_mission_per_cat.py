@@ -0,0 +1,45 @@
+"""unique mission per cat
+
+Revision ID: 5b7e9c3a1f20
+Revises: 8d2e41b0c7a5
+Create Date: 2026-10-19 15:02:41.318207
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b7e9c3a1f20'
+down_revision: Union[str, Sequence[str], None] = '8d2e41b0c7a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Fails if a cat is already linked to several missions; resolve those
+    # rows by hand before upgrading.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'uq_mission_cats_cat_uuid', 'mission_cats', ['cat_uuid'], unique=True,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'ix_mission_cats_cat_uuid', table_name='mission_cats',
+            postgresql_concurrently=True, if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_mission_cats_cat_uuid', 'mission_cats', ['cat_uuid'], unique=False,
+            postgresql_concurrently=True, if_not_exists=True,
+        )
+        op.drop_index(
+            'uq_mission_cats_cat_uuid', table_name='mission_cats',
+            postgresql_concurrently=True, if_exists=True,
+        )
@@ -0,0 +1,67 @@
+"""add filter and foreign key indexes
+
+Revision ID: 8d2e41b0c7a5
+Revises: 3c1f9a7d2b64
+Create Date: 2026-10-19 13:40:05.972114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8d2e41b0c7a5'
+down_revision: Union[str, Sequence[str], None] = '3c1f9a7d2b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ('ix_targets_mission_uuid_status', 'targets', ['mission_uuid', 'status']),
+    ('ix_notes_cat_uuid', 'notes', ['cat_uuid']),
+    ('ix_notes_target_uuid', 'notes', ['target_uuid']),
+    ('ix_mission_cats_cat_uuid', 'mission_cats', ['cat_uuid']),
+    ('ix_targets_cats_cat_uuid_target_uuid', 'targets_cats', ['cat_uuid', 'target_uuid']),
+    ('ix_missions_name', 'missions', ['name']),
+    ('ix_missions_status', 'missions', ['status']),
+    ('ix_cats_lower_name', 'cats', [sa.text('lower(name)')]),
+]
+
+
+def drop_invalid_index(name: str) -> None:
+    """Drop an index left INVALID by an interrupted concurrent build."""
+    invalid = op.get_bind().execute(
+        sa.text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ),
+        {"name": name},
+    ).scalar()
+    if invalid:
+        op.drop_index(name, postgresql_concurrently=True, if_exists=True)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    postgres = op.get_context().dialect.name == 'postgresql'
+    # CREATE INDEX CONCURRENTLY can't run inside a transaction block
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            # IF NOT EXISTS would keep an invalid index from a failed earlier run
+            if postgres:
+                drop_invalid_index(name)
+            op.create_index(
+                name, table, columns, unique=False,
+                postgresql_concurrently=True, if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(
+                name, table_name=table,
+                postgresql_concurrently=True, if_exists=True,
+            )
@@ -7,10 +7,15 @@ from sqlalchemy import (
     Integer,
     Column,
     ForeignKey,
+    Index,
+    JSON,
+    Text,
+    UniqueConstraint,
+    Uuid,
 )
-from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import uuid
+from uuid import UUID
 from datetime import date
 
 class Base(DeclarativeBase):
@@ -19,25 +24,27 @@ class Base(DeclarativeBase):
 mission_cats = Table(
     "mission_cats",
     Base.metadata,
-    Column("mission_uuid", UUID(as_uuid=True), ForeignKey("missions.uuid"), primary_key=True),
-    Column("cat_uuid", UUID(as_uuid=True), ForeignKey("cats.uuid"), primary_key=True),
+    Column("mission_uuid", Uuid, ForeignKey("missions.uuid"), primary_key=True),
+    Column("cat_uuid", Uuid, ForeignKey("cats.uuid"), primary_key=True),
+    # A cat can only be assigned to one mission
+    Index("uq_mission_cats_cat_uuid", "cat_uuid", unique=True),
 )
 
 targets_cats = Table(
     "targets_cats",
     Base.metadata,
-    Column("target_uuid", UUID(as_uuid=True), ForeignKey("targets.uuid"), primary_key=True),
-    Column("cat_uuid", UUID(as_uuid=True), ForeignKey("cats.uuid"), primary_key=True),
+    Column("target_uuid", Uuid, ForeignKey("targets.uuid"), primary_key=True),
+    Column("cat_uuid", Uuid, ForeignKey("cats.uuid"), primary_key=True),
+    Index("ix_targets_cats_cat_uuid_target_uuid", "cat_uuid", "target_uuid"),
 )
 
 class Cat(Base):
     __tablename__ = "cats"
 
-    uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    uuid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(50), nullable=False)
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     refresh_token: Mapped[str] = mapped_column(String(255), nullable=True)
-    reset_token: Mapped[str] = mapped_column(String(255), nullable=True)
     years_of_experience: Mapped[int] = mapped_column(Integer, nullable=False)
     breed: Mapped[str] = mapped_column(String(50), nullable=False)
     salary: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -48,42 +55,98 @@ class Cat(Base):
     mission = relationship("Mission", secondary=mission_cats, back_populates="cat")
     targets = relationship("Target", secondary=targets_cats, back_populates="cats")
 
+Index("ix_cats_lower_name", func.lower(Cat.name))
+
 class Mission(Base):
     __tablename__ = "missions"
 
-    uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    uuid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = mapped_column(String(100), nullable=False, index=True)
     description: Mapped[str] = mapped_column(String(255), nullable=True)
-    status: Mapped[str] = mapped_column(String(50), default="pending")
+    status: Mapped[str] = mapped_column(String(50), default="pending", index=True)
     created_at: Mapped[date] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[date] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
     completed_at: Mapped[date] = mapped_column(DateTime, nullable=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
     mission_target = relationship("Target", foreign_keys="[Target.mission_uuid]", back_populates="target_mission", cascade="all, delete-orphan")
     cat = relationship("Cat", secondary=mission_cats, back_populates="mission")
+    __mapper_args__ = {"version_id_col": version}
 
 class Target(Base):
     __tablename__ = "targets"
 
-    uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    uuid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     country: Mapped[str] = mapped_column(String(100), nullable=False)
     status: Mapped[str] = mapped_column(String(50), default="pending")
     mission_uuid: Mapped[UUID] = mapped_column(ForeignKey("missions.uuid"), nullable=False)
     created_at: Mapped[date] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[date] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
     target_mission = relationship("Mission", foreign_keys=[mission_uuid], back_populates="mission_target")
+    __table_args__ = (Index("ix_targets_mission_uuid_status", "mission_uuid", "status"),)
+    __mapper_args__ = {"version_id_col": version}
     target_notes = relationship("Note", foreign_keys="[Note.target_uuid]", back_populates="note_target")
     cats = relationship("Cat", secondary=targets_cats, back_populates="targets")
 
 class Note(Base):
     __tablename__ = "notes"
 
-    uuid: Mapped[UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    content: Mapped[str] = mapped_column(String(255), nullable=False)
-    cat_uuid: Mapped[UUID] = mapped_column(ForeignKey("cats.uuid"), nullable=False)
-    target_uuid: Mapped[UUID] = mapped_column(ForeignKey("targets.uuid"), nullable=True)
+    uuid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    content: Mapped[str] = mapped_column(String(500), nullable=False)
+    cat_uuid: Mapped[UUID] = mapped_column(ForeignKey("cats.uuid"), nullable=False, index=True)
+    target_uuid: Mapped[UUID] = mapped_column(ForeignKey("targets.uuid"), nullable=True, index=True)
+    client_id: Mapped[str] = mapped_column(String(64), nullable=True)
     created_at: Mapped[date] = mapped_column(DateTime, default=func.now())
     updated_at: Mapped[date] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
     note_cat = relationship("Cat", foreign_keys=[cat_uuid], back_populates="cat_note")
     note_target = relationship("Target", foreign_keys=[target_uuid], back_populates="target_notes")
+    # Offline clients resend notes with the same id; the retry must not duplicate them
+    __table_args__ = (UniqueConstraint("cat_uuid", "client_id", name="uq_notes_cat_uuid_client_id"),)
+    __mapper_args__ = {"version_id_col": version}
+
+class Attachment(Base):
+    __tablename__ = "attachments"
+
+    uuid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    note_uuid: Mapped[UUID] = mapped_column(ForeignKey("notes.uuid"), nullable=False, index=True)
+    cat_uuid: Mapped[UUID] = mapped_column(ForeignKey("cats.uuid"), nullable=False)
+    filename: Mapped[str] = mapped_column(String(255), nullable=False)
+    content_type: Mapped[str] = mapped_column(String(100), nullable=False)
+    size: Mapped[int] = mapped_column(Integer, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=True, index=True)
+    status: Mapped[str] = mapped_column(String(20), default="uploading")
+    created_at: Mapped[date] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[date] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
 
+class PasswordResetToken(Base):
+    __tablename__ = "password_reset_tokens"
+
+    # Only a SHA-256 of the token is stored, so a leaked table can't reset passwords
+    token_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    cat_uuid: Mapped[UUID] = mapped_column(ForeignKey("cats.uuid", ondelete="CASCADE"), nullable=False, index=True)
+    expires_at: Mapped[date] = mapped_column(DateTime, nullable=False, index=True)
+    created_at: Mapped[date] = mapped_column(DateTime, default=func.now())
+
+class RevokedToken(Base):
+    __tablename__ = "revoked_tokens"
+
+    jti: Mapped[str] = mapped_column(String(64), primary_key=True)
+    expires_at: Mapped[date] = mapped_column(DateTime, nullable=False, index=True)
+    revoked_at: Mapped[date] = mapped_column(DateTime, default=func.now(), index=True)
+
+class BackgroundJob(Base):
+    __tablename__ = "background_jobs"
+
+    uuid: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    payload: Mapped[dict] = mapped_column(JSON, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), default="pending", index=True)
+    attempts: Mapped[int] = mapped_column(Integer, default=0)
+    last_error: Mapped[str] = mapped_column(Text, nullable=True)
+    # Runner holding the job and when it last renewed its lease on it
+    owner: Mapped[str] = mapped_column(String(64), nullable=True)
+    claimed_at: Mapped[date] = mapped_column(DateTime, nullable=True)
+    created_at: Mapped[date] = mapped_column(DateTime, default=func.now())
+    updated_at: Mapped[date] = mapped_column(DateTime, default=func.now(), onupdate=func.now())
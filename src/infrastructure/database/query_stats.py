@@ -0,0 +1,191 @@
+import asyncio
+import functools
+import inspect
+import logging
+import re
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from src.config.config import config
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"(?:\$\d+|%\(\w+\)s|%s|\?)")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalize literals and bind parameters so equivalent statements group together"""
+    normalized = _STRING.sub("?", statement)
+    normalized = _PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _IN_LIST.sub("(?...)", normalized)
+    return _SPACE.sub(" ", normalized).strip()
+
+
+# Set on the async side: statement events run in SQLAlchemy's greenlet,
+# whose stack doesn't reach the awaiting repository coroutine
+query_caller_var: ContextVar[Optional[str]] = ContextVar("query_caller", default=None)
+
+
+def _with_caller(method, caller: str):
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        token = query_caller_var.set(caller)
+        try:
+            return await method(*args, **kwargs)
+        finally:
+            query_caller_var.reset(token)
+    return wrapper
+
+
+def record_caller(cls):
+    """Class decorator attributing the statements of each async method to `module.Class.method`"""
+    module = cls.__module__.rsplit(".", 1)[-1]
+    for name, method in list(vars(cls).items()):
+        if not name.startswith("__") and inspect.iscoroutinefunction(method):
+            setattr(cls, name, _with_caller(method, f"{module}.{method.__qualname__}"))
+    return cls
+
+
+def find_caller() -> str:
+    """Name the repository method that issued the statement currently executing"""
+    return query_caller_var.get() or "unknown"
+
+
+class QueryStats:
+    def __init__(self, statement: str, sample_size: int):
+        self.statement = statement
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.rows = 0
+        self.callers: dict[str, int] = {}
+        self.samples: deque[float] = deque(maxlen=sample_size)
+        self.plan: Optional[str] = None
+        self.explained_at = 0.0
+
+    def add(self, elapsed_ms: float, rows: int, caller: str) -> None:
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.rows += max(rows, 0)
+        self.callers[caller] = self.callers.get(caller, 0) + 1
+        self.samples.append(elapsed_ms)
+
+    @property
+    def p95_ms(self) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+
+    def to_dict(self) -> dict:
+        return {
+            "fingerprint": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p95_ms": round(self.p95_ms, 3),
+            "max_ms": round(self.max_ms, 3),
+            "rows": self.rows,
+            "callers": self.callers,
+            "plan": self.plan,
+        }
+
+
+class QueryRecorder:
+    """
+    Opt-in statement recorder for the SQLAlchemy engine.
+
+    Every statement is fingerprinted and attributed to the repository method
+    that issued it. Statements slower than threshold_ms are logged, and
+    SELECTs slower than explain_ms get their plan captured with
+    EXPLAIN (ANALYZE, BUFFERS) on a separate connection.
+    """
+
+    def __init__(self, threshold_ms: float, explain_ms: float,
+                 max_fingerprints: int = 1000, sample_size: int = 1000,
+                 explain_interval: float = 300.0):
+        self.threshold_ms = threshold_ms
+        self.explain_ms = explain_ms
+        self.max_fingerprints = max_fingerprints
+        self.sample_size = sample_size
+        self.explain_interval = explain_interval
+        self._stats: dict[str, QueryStats] = {}
+        self._engine: Optional[AsyncEngine] = None
+
+    def attach(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after)
+
+    def detach(self) -> None:
+        if self._engine is not None:
+            event.remove(self._engine.sync_engine, "before_cursor_execute", self._before)
+            event.remove(self._engine.sync_engine, "after_cursor_execute", self._after)
+            self._engine = None
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        context._query_started = time.perf_counter()
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, "_query_started", None)
+        if started is None:
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if statement.lstrip()[:7].upper() == "EXPLAIN":
+            return
+        key = fingerprint(statement)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= self.max_fingerprints:
+                return
+            stats = self._stats[key] = QueryStats(key, self.sample_size)
+        caller = find_caller()
+        stats.add(elapsed_ms, cursor.rowcount, caller)
+
+        if elapsed_ms < self.threshold_ms:
+            return
+        logger.warning("Slow query %.1fms in %s: %s", elapsed_ms, caller, key)
+        if (
+            elapsed_ms >= self.explain_ms
+            and conn.dialect.name == "postgresql"
+            and statement.lstrip()[:6].upper() == "SELECT"
+            and time.monotonic() - stats.explained_at > self.explain_interval
+        ):
+            stats.explained_at = time.monotonic()
+            asyncio.get_running_loop().create_task(self._explain(stats, statement, parameters))
+
+    async def _explain(self, stats: QueryStats, statement: str, parameters) -> None:
+        try:
+            async with self._engine.connect() as connection:
+                result = await connection.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS) " + statement, parameters
+                )
+                stats.plan = "\n".join(row[0] for row in result)
+                await connection.rollback()
+        except Exception as err:
+            logger.warning("Failed to explain slow query: %s", err)
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def stats(self, limit: int = 50, order_by: str = "total_ms") -> list[dict]:
+        rows = [stats.to_dict() for stats in self._stats.values()]
+        rows.sort(key=lambda row: row[order_by], reverse=True)
+        return rows[:limit]
+
+
+query_recorder = QueryRecorder(
+    threshold_ms=config.SLOW_QUERY_THRESHOLD_MS,
+    explain_ms=config.SLOW_QUERY_EXPLAIN_MS,
+)
@@ -0,0 +1,142 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, extract, over
+from datetime import datetime, timedelta
+
+from src.domain.entities.mission import MissionStatus
+from src.domain.entities.target import TargetStatus
+from src.infrastructure.database.dialect import require_postgres
+from src.infrastructure.database.models.tables import Cat, Mission, Target
+from src.infrastructure.database.query_stats import record_caller
+
+PERCENTILES = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def percentile(fraction: float, column):
+    return func.percentile_cont(fraction).within_group(column)
+
+
+def rounded(value, digits: int = 2):
+    return None if value is None else round(float(value), digits)
+
+
+@record_caller
+class AnalyticsRepository:
+    """
+    Agency-wide aggregates computed by Postgres in a single pass per report,
+    so only the aggregated rows ever leave the database.
+    """
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def salary_percentiles(self) -> dict:
+        result = await self.db.execute(
+            select(
+                func.count(Cat.uuid),
+                func.min(Cat.salary),
+                func.max(Cat.salary),
+                func.avg(Cat.salary),
+                *(percentile(fraction, Cat.salary) for fraction in PERCENTILES),
+            )
+        )
+        count, minimum, maximum, average, *values = result.one()
+        return {
+            "count": count,
+            "min": minimum,
+            "max": maximum,
+            "avg": rounded(average),
+            "percentiles": {
+                f"p{int(fraction * 100)}": rounded(value)
+                for fraction, value in zip(PERCENTILES, values)
+            },
+        }
+
+    async def experience_by_breed(self) -> list[dict]:
+        result = await self.db.execute(
+            select(
+                Cat.breed,
+                func.count(Cat.uuid),
+                func.avg(Cat.years_of_experience),
+                func.min(Cat.years_of_experience),
+                func.max(Cat.years_of_experience),
+                percentile(0.5, Cat.years_of_experience),
+            )
+            .group_by(Cat.breed)
+            .order_by(func.count(Cat.uuid).desc(), Cat.breed)
+        )
+        return [
+            {
+                "breed": breed,
+                "count": count,
+                "avg_years": rounded(average),
+                "min_years": minimum,
+                "max_years": maximum,
+                "median_years": rounded(median),
+            }
+            for breed, count, average, minimum, maximum, median in result.all()
+        ]
+
+    async def mission_throughput(self, weeks: int) -> list[dict]:
+        # Missions closed through their last target have no completed_at
+        finished_at = func.coalesce(Mission.completed_at, Mission.updated_at)
+        week = func.date_trunc("week", finished_at).label("week")
+        completed = func.count(Mission.uuid)
+        duration_hours = extract("epoch", finished_at - Mission.created_at) / 3600
+        result = await self.db.execute(
+            select(
+                week,
+                completed,
+                func.avg(duration_hours),
+                over(func.sum(completed), order_by=week),
+            )
+            .where(
+                Mission.status == MissionStatus.COMPLETED.value,
+                finished_at >= datetime.utcnow() - timedelta(weeks=weeks),
+            )
+            .group_by(week)
+            .order_by(week)
+        )
+        return [
+            {
+                "week": week_start.date().isoformat(),
+                "completed": count,
+                "avg_hours_to_complete": rounded(hours),
+                "cumulative_completed": int(cumulative),
+            }
+            for week_start, count, hours, cumulative in result.all()
+        ]
+
+    async def time_to_complete_by_country(self) -> list[dict]:
+        # A completed target isn't updated again, so updated_at marks completion
+        hours = extract("epoch", Target.updated_at - Target.created_at) / 3600
+        result = await self.db.execute(
+            select(
+                Target.country,
+                func.count(Target.uuid),
+                func.avg(hours),
+                percentile(0.5, hours),
+                percentile(0.9, hours),
+            )
+            .where(Target.status == TargetStatus.COMPLETED.value)
+            .group_by(Target.country)
+            .order_by(func.avg(hours))
+        )
+        return [
+            {
+                "country": country,
+                "completed_targets": count,
+                "avg_hours": rounded(average),
+                "median_hours": rounded(median),
+                "p90_hours": rounded(p90),
+            }
+            for country, count, average, median, p90 in result.all()
+        ]
+
+    async def report(self, weeks: int = 12) -> dict:
+        # percentile_cont and date_trunc have no SQLite equivalent
+        require_postgres(self.db, "Analytics")
+        return {
+            "salary": await self.salary_percentiles(),
+            "experience_by_breed": await self.experience_by_breed(),
+            "mission_throughput": await self.mission_throughput(weeks),
+            "time_to_complete_by_country": await self.time_to_complete_by_country(),
+        }
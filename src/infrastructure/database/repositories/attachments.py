@@ -0,0 +1,77 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from fastapi import HTTPException, status
+from uuid import UUID
+
+from src.infrastructure.database.models.tables import Attachment, Cat, Note
+from src.infrastructure.database.query_stats import record_caller
+
+
+@record_caller
+class AttachmentRepository:
+    """Repository for managing note attachments in the database."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(
+        self, note_uuid: UUID, cat_uuid: UUID, filename: str, content_type: str, size: int
+    ) -> Attachment:
+        result = await self.db.execute(
+            select(Note.cat_uuid).where(Note.uuid == note_uuid)
+        )
+        author_uuid = result.scalar_one_or_none()
+        if author_uuid is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Note not found"
+            )
+        if author_uuid != cat_uuid:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Cat is not the author of this note"
+            )
+        attachment = Attachment(
+            note_uuid=note_uuid,
+            cat_uuid=cat_uuid,
+            filename=filename,
+            content_type=content_type,
+            size=size,
+        )
+        self.db.add(attachment)
+        await self.db.commit()
+        await self.db.refresh(attachment)
+        return attachment
+
+    async def get_for_cat(self, attachment_uuid: UUID, cat: Cat) -> Attachment:
+        """Get an attachment its author or an admin may access"""
+        result = await self.db.execute(
+            select(Attachment).where(Attachment.uuid == attachment_uuid)
+        )
+        attachment = result.scalar_one_or_none()
+        if not attachment:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Attachment not found"
+            )
+        if attachment.cat_uuid != cat.uuid and not cat.is_staff:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Cat is not the author of this attachment"
+            )
+        return attachment
+
+    async def release(self) -> None:
+        """Give the pooled connection back while an upload streams in"""
+        await self.db.close()
+
+    async def complete(self, attachment_uuid: UUID, sha256: str, size: int) -> Attachment:
+        result = await self.db.execute(
+            select(Attachment).where(Attachment.uuid == attachment_uuid)
+        )
+        attachment = result.scalar_one()
+        attachment.sha256 = sha256
+        attachment.size = size
+        attachment.status = "complete"
+        await self.db.commit()
+        await self.db.refresh(attachment)
+        return attachment
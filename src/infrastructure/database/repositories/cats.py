@@ -5,10 +5,15 @@ from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
-from src.infrastructure.database.models.tables import Cat
+from src.domain.entities.target import TargetStatus
+from src.infrastructure.database.models.tables import Cat, Note, Target, mission_cats, targets_cats
+from src.application.breed_catalog import breed_catalog
 from src.application.password_service import password_service
+from src.application.response_cache import response_cache
 from src.presentation.schemas.cats import CatCreate
+from src.infrastructure.database.query_stats import record_caller
 
+@record_caller
 class CatRepository:
     """Repository for managing Cat entities in the database."""
     def __init__(self, db: AsyncSession):
@@ -31,30 +36,29 @@ class CatRepository:
         return result.scalars().all()
 
     async def validate_breed(self, breed: str) -> bool:
-        CAT_API_URL = "https://api.thecatapi.com/v1/breeds"
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(CAT_API_URL)
-                response.raise_for_status()
-                breeds = response.json()
-                breed_names = [b['name'].lower() for b in breeds]
-
-                if breed.lower() not in breed_names:
-                    raise HTTPException(
-                        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                        detail=f"Invalid breed: {breed}. Please use a valid cat breed."
-                    )
-            except httpx.HTTPError as e:
-                raise HTTPException(
-                    status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                    detail="Failed to validate breed due to external API error."
-                ) from e
+        try:
+            is_known = await breed_catalog.contains(breed)
+        except httpx.TimeoutException:
+            # Answered with 504 by the app's timeout handlers
+            raise
+        except httpx.HTTPError as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Failed to validate breed due to external API error."
+            ) from e
+        if not is_known:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"Invalid breed: {breed}. Please use a valid cat breed."
+            )
+        return True
 
     async def create(self, body: CatCreate) -> Cat:
         cat_data = body.model_dump()
         new_cat = Cat(**cat_data)
         self.db.add(new_cat)
         await self.db.commit()
+        response_cache.bump("cats")
         await self.db.refresh(new_cat)
         return new_cat
 
@@ -62,6 +66,7 @@ class CatRepository:
         if salary:
             cat.salary = salary
         await self.db.commit()
+        response_cache.bump("cats")
         await self.db.refresh(cat)
         return cat
 
@@ -70,29 +75,15 @@ class CatRepository:
         if cat:
             await self.db.delete(cat)
             await self.db.commit()
+            response_cache.bump("cats")
 
     async def update_token(self, cat: Cat, refresh_token: Optional[str] = None) -> Cat:
         cat.refresh_token = refresh_token
         await self.db.commit()
+        response_cache.bump("cats")
         await self.db.refresh(cat)
         return cat
 
-    async def store_reset_token(self, name: str, reset_token: str) -> Cat:
-        cat = await self.get_by_name(name)
-        if not cat:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Cat not found"
-            )
-        cat.reset_token = reset_token
-        await self.db.commit()
-        await self.db.refresh(cat)
-        return cat
-
-    async def verify_reset_token(self, reset_token: str) -> Optional[Cat]:
-        result = await self.db.execute(select(Cat).where(Cat.reset_token == reset_token))
-        return result.scalars().first()
-
     async def update_password(self, name: str, new_password: str) -> Cat:
         cat = await self.get_by_name(name)
         if not cat:
@@ -103,6 +94,7 @@ class CatRepository:
         hashed_password = password_service.get_password_hash(new_password)
         cat.password = hashed_password
         await self.db.commit()
+        response_cache.bump("cats")
         return cat
 
     async def count_cat_missions(self, cat_uuid: UUID) -> int:
@@ -110,3 +102,107 @@ class CatRepository:
             select(func.count()).select_from(Cat).join(Cat.mission).where(Cat.uuid == cat_uuid)
         )
         return result.scalar_one()
+
+    async def get_roster(
+        self,
+        sort_by: str = "active_targets",
+        descending: bool = True,
+        on_mission: Optional[bool] = None,
+        min_active_targets: Optional[int] = None,
+        max_active_targets: Optional[int] = None,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[int, list[dict]]:
+        """
+        A page of cats with their mission, target and note counts, computed
+        in one query: each count is aggregated per cat in its own subquery
+        and left-joined, so the joins don't multiply rows. When the page is
+        sorted by a cat column and not filtered by workload, the page is
+        picked first and only its cats are counted. Returns the number of
+        cats matching the filters and the page.
+        """
+        def ordered(column):
+            return column.desc() if descending else column.asc()
+
+        by_workload = sort_by not in ("name", "years_of_experience") or any(
+            value is not None for value in (on_mission, min_active_targets, max_active_targets)
+        )
+        if by_workload:
+            source, total_column, page_uuids = Cat.__table__, func.count().over(), None
+        else:
+            source = (
+                select(
+                    Cat.uuid, Cat.name, Cat.breed, Cat.years_of_experience, Cat.is_staff,
+                    func.count().over().label("total"),
+                )
+                .order_by(ordered(getattr(Cat, sort_by)), Cat.name, Cat.uuid)
+                .limit(limit)
+                .offset(offset)
+                .cte("page")
+            )
+            total_column, page_uuids = source.c.total, select(source.c.uuid)
+        cat = source.c
+
+        def for_page(query, cat_uuid):
+            return query if page_uuids is None else query.where(cat_uuid.in_(page_uuids))
+
+        missions = for_page(
+            select(mission_cats.c.cat_uuid, func.count().label("count")),
+            mission_cats.c.cat_uuid,
+        ).group_by(mission_cats.c.cat_uuid).subquery()
+        completed = Target.status == TargetStatus.COMPLETED.value
+        targets = for_page(
+            select(
+                targets_cats.c.cat_uuid,
+                func.count().filter(~completed).label("active"),
+                func.count().filter(completed).label("completed"),
+            ).join(Target, Target.uuid == targets_cats.c.target_uuid),
+            targets_cats.c.cat_uuid,
+        ).group_by(targets_cats.c.cat_uuid).subquery()
+        notes = for_page(
+            select(Note.cat_uuid, func.count().label("count")),
+            Note.cat_uuid,
+        ).group_by(Note.cat_uuid).subquery()
+        counts = {
+            "missions": func.coalesce(missions.c.count, 0),
+            "active_targets": func.coalesce(targets.c.active, 0),
+            "completed_targets": func.coalesce(targets.c.completed, 0),
+            "notes": func.coalesce(notes.c.count, 0),
+        }
+        columns = {"name": cat.name, "years_of_experience": cat.years_of_experience, **counts}
+
+        query = (
+            select(
+                cat.uuid,
+                cat.name,
+                cat.breed,
+                cat.years_of_experience,
+                cat.is_staff,
+                *(column.label(name) for name, column in counts.items()),
+                total_column.label("total"),
+            )
+            .select_from(source)
+            .outerjoin(missions, missions.c.cat_uuid == cat.uuid)
+            .outerjoin(targets, targets.c.cat_uuid == cat.uuid)
+            .outerjoin(notes, notes.c.cat_uuid == cat.uuid)
+            .order_by(ordered(columns[sort_by]), cat.name, cat.uuid)
+        )
+        if on_mission is not None:
+            query = query.where(counts["missions"] > 0 if on_mission else counts["missions"] == 0)
+        if min_active_targets is not None:
+            query = query.where(counts["active_targets"] >= min_active_targets)
+        if max_active_targets is not None:
+            query = query.where(counts["active_targets"] <= max_active_targets)
+        if by_workload:
+            query = query.limit(limit).offset(offset)
+
+        rows = (await self.db.execute(query)).mappings().all()
+        if rows:
+            total = rows[0]["total"]
+        elif offset:
+            # Past the last page the window count has no row to ride on
+            matching = query.limit(None).offset(None).order_by(None).subquery() if by_workload else Cat
+            total = (await self.db.execute(select(func.count()).select_from(matching))).scalar_one()
+        else:
+            total = 0
+        return total, [{key: value for key, value in row.items() if key != "total"} for row in rows]
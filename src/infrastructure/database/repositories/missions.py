@@ -1,19 +1,29 @@
+from collections import defaultdict
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, update
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from fastapi import HTTPException, status
 from uuid import UUID
 
+from src.application.events import StatusEvent, event_hub
+from src.application.matching import Assignment, Candidate, Opening
+from src.application.response_cache import response_cache
+
+from src.infrastructure.database.dialect import insert_for
+from src.infrastructure.database.retry import retry_transaction
 from src.infrastructure.database.models.tables import Mission, Target, Cat, mission_cats
 from src.domain.entities.mission import MissionStatus, Mission as MissionEntity
 from src.presentation.schemas.missions import MissionCreate
+from src.infrastructure.database.query_stats import record_caller
 
+@record_caller
 class MissionRepository:
     """Repository for managing Mission entities in the database."""
     def __init__(self, db: AsyncSession):
         self.db = db
     
+    @retry_transaction()
     async def create(self, body: MissionCreate) -> Mission:
         """Create mission with targets and optional cat assignments"""
         existing_mission = await self.get_by_name(body.name)
@@ -22,41 +32,13 @@ class MissionRepository:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Mission with this name {body.name} already exists."
             )
-       # Assign cats if provided
         if body.cat_uuids:
-            mission_status = MissionStatus.IN_PROGRESS.value
-            result = await self.db.execute(
-                select(Cat).where(Cat.uuid.in_(body.cat_uuids))
-            )
-            cats = result.scalars().all()
-
-            if len(cats) != len(body.cat_uuids):
-                found_uuids = {cat.uuid for cat in cats}
-                missing_uuids = set(body.cat_uuids) - found_uuids
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"Cats not found: {missing_uuids}"
-                )
-            # Check if any cat is already assigned to a mission
-            cats_with_missions = []
-            for cat in cats:
-                # Check if cat has any missions assigned
-                mission_check = await self.db.execute(
-                    select(mission_cats).where(mission_cats.c.cat_uuid == cat.uuid)
-                )
-                if mission_check.first():
-                    cats_with_missions.append(cat.uuid)
-
-            if cats_with_missions:
-                raise HTTPException(
-                    status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Cats with UUID {cats_with_missions[0]} are already assigned to missions. Each cat can only have one mission."
-                )
+            await self._ensure_cats_exist(body.cat_uuids)
         # Create mission with targets relationship
         mission = Mission(
             name=body.name,
             description=body.description,
-            status=mission_status if body.cat_uuids else MissionStatus.PENDING.value,
+            status=MissionStatus.IN_PROGRESS.value if body.cat_uuids else MissionStatus.PENDING.value,
             mission_target=[
                 Target(
                     name=target.name,
@@ -65,23 +47,59 @@ class MissionRepository:
                 for target in body.targets
             ]
         )
-        
-        # Assign cats after validation
-        if body.cat_uuids:
-            mission.cat.extend(cats)
-        
         self.db.add(mission)
         await self.db.flush()
         mission_uuid = mission.uuid  # Access UUID after flush
+        if body.cat_uuids:
+            await self._link_cats(mission_uuid, body.cat_uuids)
         await self.db.commit()
+        response_cache.bump("missions")
 
+        mission = await self.get_by_uuid(mission_uuid)
+        await event_hub.publish(StatusEvent.mission(
+            mission.uuid, mission.status, [cat.uuid for cat in mission.cat]
+        ))
+        return mission
+
+    async def _ensure_cats_exist(self, cat_uuids: List[UUID]) -> None:
         result = await self.db.execute(
-        select(Mission)
-        .where(Mission.uuid == mission_uuid)
-        .options(selectinload(Mission.mission_target))
-        .options(selectinload(Mission.cat))
-    )
-        return result.scalar_one()
+            select(Cat.uuid).where(Cat.uuid.in_(cat_uuids))
+        )
+        missing_uuids = set(cat_uuids) - set(result.scalars().all())
+        if missing_uuids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Cats not found: {missing_uuids}"
+            )
+
+    async def _link_cats(self, mission_uuid: UUID, cat_uuids: List[UUID]) -> None:
+        """
+        Link cats to a mission. The one-mission-per-cat rule is enforced by
+        uq_mission_cats_cat_uuid, so concurrent assignments don't need a
+        prior check: rows that conflict are skipped and reported here.
+        """
+        result = await self.db.execute(
+            insert_for(self.db, mission_cats)
+            .values([{"mission_uuid": mission_uuid, "cat_uuid": cat_uuid} for cat_uuid in set(cat_uuids)])
+            .on_conflict_do_nothing()
+            .returning(mission_cats.c.cat_uuid)
+        )
+        skipped = set(cat_uuids) - set(result.scalars().all())
+        if not skipped:
+            return
+        # Cats already linked to this mission are fine, any other conflict is not
+        result = await self.db.execute(
+            select(mission_cats.c.cat_uuid)
+            .where(mission_cats.c.cat_uuid.in_(skipped))
+            .where(mission_cats.c.mission_uuid != mission_uuid)
+        )
+        taken = result.scalars().all()
+        if taken:
+            await self.db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Cats with UUID {taken[0]} are already assigned to missions. Each cat can only have one mission."
+            )
 
     async def get_by_uuid(self, mission_uuid: UUID) -> Optional[Mission]:
         """Get mission by uuid with all relationships loaded"""
@@ -93,6 +111,32 @@ class MissionRepository:
         )
         return result.scalar_one_or_none()
     
+    async def get_version(self, mission_uuid: UUID) -> Optional[tuple]:
+        """Get the version parts of a mission without loading its row graph"""
+        target_versions = (
+            select(func.coalesce(func.sum(Target.version), 0))
+            .where(Target.mission_uuid == Mission.uuid)
+            .scalar_subquery()
+        )
+        target_count = (
+            select(func.count())
+            .select_from(Target)
+            .where(Target.mission_uuid == Mission.uuid)
+            .scalar_subquery()
+        )
+        cat_count = (
+            select(func.count())
+            .select_from(mission_cats)
+            .where(mission_cats.c.mission_uuid == Mission.uuid)
+            .scalar_subquery()
+        )
+        result = await self.db.execute(
+            select(Mission.version, target_versions, target_count, cat_count)
+            .where(Mission.uuid == mission_uuid)
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
     async def get_by_name(self, name: str) -> Optional[Mission]:
         """Check if mission with this name already exists"""
         result = await self.db.execute(
@@ -123,14 +167,21 @@ class MissionRepository:
             )
         await self.db.delete(mission)
         await self.db.commit()
+        response_cache.bump("missions")
+        await event_hub.publish(StatusEvent.mission(mission_uuid, "deleted", []))
 
-    async def set_completed_mission(self, mission_uuid: UUID) -> Mission:
+    async def set_completed_mission(self, mission_uuid: UUID, expected_version: Optional[int] = None) -> Mission:
         mission = await self.get_by_uuid(mission_uuid)
         if not mission:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Mission not found"
             )
+        if expected_version is not None and mission.version != expected_version:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Mission has been modified"
+            )
         domain_mission = MissionEntity(
             uuid=mission.uuid,
             name=mission.name,
@@ -146,9 +197,13 @@ class MissionRepository:
         mission.updated_at = domain_mission.updated_at
         mission.completed_at = domain_mission.completed_at
         await self.db.commit()
-        await self.db.refresh(mission)
-        return mission
+        response_cache.bump("missions")
+        await event_hub.publish(StatusEvent.mission(
+            mission_uuid, domain_mission.status, domain_mission.cat_uuids
+        ))
+        return await self.get_by_uuid(mission_uuid)
 
+    @retry_transaction()
     async def assign_cats_to_mission(self, mission_uuid: UUID, cat_uuids: List[UUID]) -> Mission:
         mission = await self.get_by_uuid(mission_uuid)
         if not mission:
@@ -163,24 +218,83 @@ class MissionRepository:
                 detail=f"Cannot assign cats to a {mission.status} mission"
             )
 
+        await self._ensure_cats_exist(cat_uuids)
+        await self._link_cats(mission_uuid, cat_uuids)
+        mission.status = MissionStatus.IN_PROGRESS.value
+        await self.db.commit()
+        response_cache.bump("missions")
+
+        mission = await self.get_by_uuid(mission_uuid)
+        await event_hub.publish(StatusEvent.mission(
+            mission_uuid, mission.status, [cat.uuid for cat in mission.cat]
+        ))
+        return mission
+
+    async def get_matching_candidates(self) -> List[Candidate]:
+        """
+        Get the cats that were never assigned. A cat keeps its mission once
+        it is completed, so idle cats have no target history to match on.
+        """
         result = await self.db.execute(
-            select(Cat).where(Cat.uuid.in_(cat_uuids))
+            select(Cat.uuid, Cat.breed, Cat.years_of_experience)
+            .where(~select(mission_cats.c.cat_uuid).where(mission_cats.c.cat_uuid == Cat.uuid).exists())
+            .where(Cat.is_staff.isnot(True))
         )
-        cats = result.scalars().all()
-        
-        if len(cats) != len(cat_uuids):
-            found_uuids = {cat.uuid for cat in cats}
-            missing_uuids = set(cat_uuids) - found_uuids
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Cats not found: {missing_uuids}"
+        return [Candidate(cat_uuid, breed, years) for cat_uuid, breed, years in result.all()]
+
+    async def get_matching_openings(self, cats_per_mission: int, limit: int) -> List[Opening]:
+        """Get the oldest pending missions"""
+        result = await self.db.execute(
+            select(Mission.uuid)
+            .where(Mission.status == MissionStatus.PENDING.value)
+            .order_by(Mission.created_at, Mission.uuid)
+            .limit(limit)
+        )
+        return [Opening(mission_uuid, cats_per_mission) for mission_uuid in result.scalars().all()]
+
+    @retry_transaction()
+    async def apply_assignments(self, assignments: List[Assignment]) -> List[Assignment]:
+        """
+        Link a matching plan in one transaction. Cats that were assigned
+        elsewhere since the plan was made are skipped, not reassigned.
+        """
+        linked = set()
+        for start in range(0, len(assignments), 5000):
+            result = await self.db.execute(
+                insert_for(self.db, mission_cats)
+                .values([
+                    {"mission_uuid": assignment.mission_uuid, "cat_uuid": assignment.cat_uuid}
+                    for assignment in assignments[start:start + 5000]
+                ])
+                .on_conflict_do_nothing()
+                .returning(mission_cats.c.mission_uuid, mission_cats.c.cat_uuid)
+            )
+            linked.update(result.tuples().all())
+        applied = [
+            assignment for assignment in assignments
+            if (assignment.mission_uuid, assignment.cat_uuid) in linked
+        ]
+        team = defaultdict(list)
+        for assignment in applied:
+            team[assignment.mission_uuid].append(assignment.cat_uuid)
+        if team:
+            await self.db.execute(
+                update(Mission)
+                .where(Mission.uuid.in_(team), Mission.status == MissionStatus.PENDING.value)
+                .values(
+                    status=MissionStatus.IN_PROGRESS.value,
+                    version=Mission.version + 1,
+                    updated_at=func.now(),
+                )
+                .execution_options(synchronize_session=False)
             )
-        
-        mission.cat.extend(cats)
-        mission.status = MissionStatus.IN_PROGRESS.value
         await self.db.commit()
-        await self.db.refresh(mission)
-        return mission
+        response_cache.bump("missions")
+        for mission_uuid, cat_uuids in team.items():
+            await event_hub.publish(StatusEvent.mission(
+                mission_uuid, MissionStatus.IN_PROGRESS.value, cat_uuids
+            ))
+        return applied
 
     async def set_completed_target(self, target_uuid: UUID) -> Target:
         result = await self.db.execute(
@@ -194,5 +308,6 @@ class MissionRepository:
             )
         target.is_completed = True
         await self.db.commit()
+        response_cache.bump("missions")
         await self.db.refresh(target)
         return target
@@ -3,11 +3,14 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
 from fastapi import HTTPException, status
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from src.domain.entities.target import TargetStatus
-from src.infrastructure.database.models.tables import Mission, Note, Target, Cat
+from src.infrastructure.database.dialect import insert_for
+from src.infrastructure.database.models.tables import Mission, Note, Target, Cat, mission_cats
+from src.infrastructure.database.query_stats import record_caller
 
+@record_caller
 class NoteRepository:
     """Repository for managing Note entities in the database."""
     def __init__(self, db: AsyncSession):
@@ -55,19 +58,104 @@ class NoteRepository:
         await self.db.refresh(note)
         return note
 
+    async def create_many(self, cat_uuid: UUID, items: list) -> List[dict]:
+        """
+        Create a batch of notes with one authorization query and one
+        multi-row INSERT. Notes whose client_id the cat already used are
+        reported as duplicates with the stored note, so a resent batch is free.
+        """
+        target_uuids = {item.target_uuid for item in items}
+        result = await self.db.execute(
+            select(Target.uuid, mission_cats.c.cat_uuid)
+            .outerjoin(
+                mission_cats,
+                (mission_cats.c.mission_uuid == Target.mission_uuid) & (mission_cats.c.cat_uuid == cat_uuid),
+            )
+            .where(Target.uuid.in_(target_uuids))
+        )
+        assigned = {target_uuid: member is not None for target_uuid, member in result.all()}
+
+        results = []
+        rows = []
+        for index, item in enumerate(items):
+            entry = {"index": index, "client_id": item.client_id, "status": "created"}
+            if item.target_uuid not in assigned:
+                entry.update(status="not_found", detail="Target not found")
+            elif not assigned[item.target_uuid]:
+                entry.update(status="forbidden", detail="Cat is not assigned to the mission of this target")
+            else:
+                entry["uuid"] = uuid4()
+                rows.append({
+                    "uuid": entry["uuid"],
+                    "content": item.content,
+                    "cat_uuid": cat_uuid,
+                    "target_uuid": item.target_uuid,
+                    "client_id": item.client_id,
+                })
+            results.append(entry)
+        if not rows:
+            return results
+
+        result = await self.db.execute(
+            insert_for(self.db, Note)
+            .on_conflict_do_nothing(index_elements=["cat_uuid", "client_id"])
+            .returning(Note),
+            rows,
+        )
+        created = {note.uuid: note for note in result.scalars().all()}
+        retried = {
+            entry["client_id"] for entry in results
+            if "uuid" in entry and entry["uuid"] not in created
+        }
+        existing = {}
+        if retried:
+            result = await self.db.execute(
+                select(Note.client_id, Note.uuid).where(Note.cat_uuid == cat_uuid, Note.client_id.in_(retried))
+            )
+            existing = dict(result.tuples().all())
+        await self.db.commit()
+        # Commit expired the notes; reload them in one query instead of one refresh each
+        result = await self.db.execute(
+            select(Note).where(Note.uuid.in_([*created, *existing.values()]))
+        )
+        notes = {note.uuid: note for note in result.scalars().all()}
+
+        for entry in results:
+            note_uuid = entry.pop("uuid", None)
+            if note_uuid is None:
+                continue
+            if note_uuid in created:
+                entry["note"] = notes[note_uuid]
+            else:
+                entry.update(status="duplicate", note=notes.get(existing.get(entry["client_id"])))
+        return results
+
     async def get_note_by_uuid(self, note_uuid: UUID) -> Optional[Note]:
         result = await self.db.execute(
             select(Note).where(Note.uuid == note_uuid)
         )
         return result.scalar_one_or_none()
 
-    async def update_note(self, note_uuid: UUID, new_content: str, cat_uuid: UUID) -> Note:
+    async def get_note_version(self, note_uuid: UUID) -> Optional[int]:
+        result = await self.db.execute(
+            select(Note.version).where(Note.uuid == note_uuid)
+        )
+        return result.scalar_one_or_none()
+
+    async def update_note(
+        self, note_uuid: UUID, new_content: str, cat_uuid: UUID, expected_version: Optional[int] = None
+    ) -> Note:
         note = await self.get_note_by_uuid(note_uuid)
         if not note:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Note not found"
             )
+        if expected_version is not None and note.version != expected_version:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Note has been modified"
+            )
         is_target_completed = await self.db.execute(
             select(Target).where(Target.uuid == note.target_uuid, Target.status == TargetStatus.COMPLETED.value)
         )
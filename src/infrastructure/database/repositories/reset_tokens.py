@@ -0,0 +1,75 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, update
+from uuid import UUID
+
+from src.infrastructure.database.models.tables import Cat, PasswordResetToken
+from src.application.password_service import password_service
+from src.application.response_cache import response_cache
+from src.infrastructure.database.query_stats import record_caller
+
+
+@record_caller
+class PasswordResetTokenRepository:
+    """Repository for password reset tokens, stored by hash."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def create(self, cat_uuid: UUID, token_hash: str, ttl: float) -> PasswordResetToken:
+        reset_token = PasswordResetToken(
+            token_hash=token_hash,
+            cat_uuid=cat_uuid,
+            expires_at=datetime.utcnow() + timedelta(seconds=ttl),
+        )
+        self.db.add(reset_token)
+        await self.db.commit()
+        return reset_token
+
+    async def consume(self, token_hash: str, new_password: str) -> Optional[UUID]:
+        """
+        Use up a token and set its cat's password in one transaction. The
+        token row is deleted as it is read, so concurrent requests with the
+        same token can't both succeed. Returns None for an unknown, used or
+        expired token.
+        """
+        # Hashing takes tens of milliseconds; doing it first keeps it off the
+        # event loop and out of the transaction holding the token row
+        hashed_password = await asyncio.to_thread(password_service.get_password_hash, new_password)
+        result = await self.db.execute(
+            delete(PasswordResetToken)
+            .where(
+                PasswordResetToken.token_hash == token_hash,
+                PasswordResetToken.expires_at > datetime.utcnow(),
+            )
+            .returning(PasswordResetToken.cat_uuid)
+        )
+        cat_uuid = result.scalar_one_or_none()
+        if cat_uuid is None:
+            await self.db.rollback()
+            return None
+        await self.db.execute(
+            update(Cat)
+            .where(Cat.uuid == cat_uuid)
+            .values(password=hashed_password, refresh_token=None)
+        )
+        # Any other link sent to the cat is void once the password changed
+        await self.db.execute(delete(PasswordResetToken).where(PasswordResetToken.cat_uuid == cat_uuid))
+        await self.db.commit()
+        response_cache.bump("cats")
+        return cat_uuid
+
+    async def purge_expired(self, batch_size: int) -> int:
+        """Delete up to `batch_size` expired tokens; returns the rows deleted"""
+        expired = (
+            select(PasswordResetToken.token_hash)
+            .where(PasswordResetToken.expires_at <= datetime.utcnow())
+            .limit(batch_size)
+        )
+        result = await self.db.execute(
+            delete(PasswordResetToken).where(PasswordResetToken.token_hash.in_(expired.scalar_subquery()))
+        )
+        await self.db.commit()
+        return result.rowcount
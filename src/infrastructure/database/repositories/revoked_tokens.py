@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete
+
+from src.infrastructure.database.dialect import insert_for
+from src.infrastructure.database.models.tables import RevokedToken
+from src.infrastructure.database.query_stats import record_caller
+
+
+@record_caller
+class RevokedTokenRepository:
+    """Repository for the deny list of revoked token ids."""
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def revoke(self, jti: str, expires_at: datetime) -> None:
+        await self.db.execute(
+            insert_for(self.db, RevokedToken)
+            .values(jti=jti, expires_at=expires_at)
+            .on_conflict_do_nothing(index_elements=["jti"])
+        )
+        await self.db.commit()
+
+    async def revoked_since(
+        self, since: Optional[datetime], overlap: timedelta
+    ) -> list[tuple[str, datetime, datetime]]:
+        """
+        Unexpired entries revoked at or after `since`, minus `overlap` so
+        rows whose transaction committed after a later one are not missed.
+        """
+        query = select(RevokedToken.jti, RevokedToken.expires_at, RevokedToken.revoked_at).where(
+            RevokedToken.expires_at > datetime.utcnow()
+        )
+        if since is not None:
+            query = query.where(RevokedToken.revoked_at >= since - overlap)
+        result = await self.db.execute(query)
+        return result.tuples().all()
+
+    async def purge_expired(self) -> int:
+        result = await self.db.execute(
+            delete(RevokedToken).where(RevokedToken.expires_at <= datetime.utcnow())
+        )
+        await self.db.commit()
+        return result.rowcount
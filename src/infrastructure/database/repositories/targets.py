@@ -1,13 +1,19 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func
+from typing import Optional
 from fastapi import HTTPException, status
 from uuid import UUID
 
+from src.application.events import StatusEvent, event_hub
+from src.application.response_cache import response_cache
+
 from src.domain.entities.target import TargetStatus
 from src.domain.entities.mission import MissionStatus
 from src.infrastructure.database.models.tables import Target, Mission, mission_cats, targets_cats, Cat
+from src.infrastructure.database.query_stats import record_caller
 
 
+@record_caller
 class TargetRepository:
     """Repository for managing Target entities in the database."""
     def __init__(self, db: AsyncSession):
@@ -24,7 +30,20 @@ class TargetRepository:
         target = result.scalar_one_or_none()
         if target:
             target.status = TargetStatus.ACTIVE.value
+            mission_uuid = target.mission_uuid
         await self.db.commit()
+        response_cache.bump("missions")
+        if target:
+            await event_hub.publish(StatusEvent.target(
+                target_uuid, mission_uuid, TargetStatus.ACTIVE.value,
+                await self.get_mission_cat_uuids(mission_uuid),
+            ))
+
+    async def get_mission_cat_uuids(self, mission_uuid: UUID) -> list[UUID]:
+        result = await self.db.execute(
+            select(mission_cats.c.cat_uuid).where(mission_cats.c.mission_uuid == mission_uuid)
+        )
+        return list(result.scalars().all())
 
     async def get_target_by_uuid(self, target_uuid: UUID, cat_uuid: UUID) -> Target:
         result = await self.db.execute(
@@ -54,6 +73,28 @@ class TargetRepository:
                 )
         return target
     
+    async def get_target_version(self, target_uuid: UUID, cat_uuid: UUID) -> Optional[tuple]:
+        """Get the version parts of a cat's target without loading the row"""
+        result = await self.db.execute(
+            select(Target.version)
+            .join(targets_cats, Target.uuid == targets_cats.c.target_uuid)
+            .where(
+                (Target.uuid == target_uuid) &
+                (targets_cats.c.cat_uuid == cat_uuid)
+            )
+        )
+        row = result.first()
+        return tuple(row) if row else None
+
+    async def get_targets_version_for_cat(self, cat_uuid: UUID) -> tuple:
+        """Get the version parts of all cat's targets in one aggregate query"""
+        result = await self.db.execute(
+            select(func.count(Target.uuid), func.coalesce(func.sum(Target.version), 0))
+            .join(targets_cats, Target.uuid == targets_cats.c.target_uuid)
+            .where(targets_cats.c.cat_uuid == cat_uuid)
+        )
+        return tuple(result.one())
+
     async def get_all_targets_for_cat(self, cat_uuid: UUID) -> list[Target] | None:
         result = await self.db.execute(
             select(Target)
@@ -67,7 +108,9 @@ class TargetRepository:
             )
         return result.scalars().all()
 
-    async def set_completed_target(self, target_uuid: UUID, current_cat: Cat) -> Target:
+    async def set_completed_target(
+        self, target_uuid: UUID, current_cat: Cat, expected_version: Optional[int] = None
+    ) -> Target:
         target_result = await self.db.execute(
             select(Target).where(Target.uuid == target_uuid)
         )
@@ -77,6 +120,11 @@ class TargetRepository:
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Target not found"
             )
+        if expected_version is not None and target.version != expected_version:
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Target has been modified"
+            )
         mission_uuid = target.mission_uuid
 
         # Check if mission of the target is assigned to current cat
@@ -98,6 +146,7 @@ class TargetRepository:
             select(Target).where(Target.mission_uuid == mission_uuid)
         )
         all_targets = all_targets_result.scalars().all()
+        mission_completed = False
         if all(t.status == TargetStatus.COMPLETED.value for t in all_targets):
             mission = await self.db.execute(
                 select(Mission).where(Mission.uuid == target.mission_uuid)
@@ -105,6 +154,17 @@ class TargetRepository:
             mission = mission.scalar_one_or_none()
             if mission:
                 mission.status = MissionStatus.COMPLETED.value
+                mission_completed = True
         await self.db.commit()
+        response_cache.bump("missions")
+
+        cat_uuids = await self.get_mission_cat_uuids(mission_uuid)
+        await event_hub.publish(StatusEvent.target(
+            target_uuid, mission_uuid, TargetStatus.COMPLETED.value, cat_uuids
+        ))
+        if mission_completed:
+            await event_hub.publish(StatusEvent.mission(
+                mission_uuid, MissionStatus.COMPLETED.value, cat_uuids
+            ))
         await self.db.refresh(target)
         return target
@@ -0,0 +1,48 @@
+import asyncio
+import functools
+import logging
+import random
+from typing import Optional
+
+from sqlalchemy.exc import DBAPIError
+
+logger = logging.getLogger(__name__)
+
+SERIALIZATION_FAILURE = "40001"
+DEADLOCK_DETECTED = "40P01"
+UNIQUE_VIOLATION = "23505"
+QUERY_CANCELED = "57014"
+RETRYABLE_SQLSTATES = {SERIALIZATION_FAILURE, DEADLOCK_DETECTED}
+
+
+def sqlstate(err: DBAPIError) -> Optional[str]:
+    """Extract the Postgres SQLSTATE from a wrapped driver error"""
+    orig = err.orig
+    for candidate in (orig, getattr(orig, "__cause__", None)):
+        code = getattr(candidate, "sqlstate", None) or getattr(candidate, "pgcode", None)
+        if code:
+            return code
+    return None
+
+
+def retry_transaction(attempts: int = 5, base_delay: float = 0.05):
+    """
+    Retry a repository method when Postgres aborts its transaction with a
+    serialization failure or a deadlock. The method is rerun from the start
+    after a rollback, with jittered exponential backoff between attempts.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        async def wrapper(self, *args, **kwargs):
+            for attempt in range(1, attempts + 1):
+                try:
+                    return await method(self, *args, **kwargs)
+                except DBAPIError as err:
+                    await self.db.rollback()
+                    if attempt == attempts or sqlstate(err) not in RETRYABLE_SQLSTATES:
+                        raise
+                    delay = base_delay * 2 ** (attempt - 1) * random.uniform(0.5, 1.5)
+                    logger.info("Retrying %s after %s (attempt %s)", method.__qualname__, sqlstate(err), attempt)
+                    await asyncio.sleep(delay)
+        return wrapper
+    return decorator
@@ -1,18 +1,100 @@
+import asyncio
 import contextlib
+import logging
 
+from fastapi import HTTPException
+from sqlalchemy import event, text
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import StaticPool
 
+from src.application.deadlines import DeadlineExceeded, remaining
 
-from src.config.config import config
+logger = logging.getLogger(__name__)
+
+POOL_OPTIONS = ("pool_size", "max_overflow", "pool_timeout", "pool_pre_ping")
+
+
+def enable_sqlite_foreign_keys(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class DeadlineSession(Session):
+    """Session whose transactions are bounded by the request deadline"""
+
+
+@event.listens_for(DeadlineSession, "after_begin")
+def apply_statement_timeout(session, transaction, connection) -> None:
+    """
+    Let Postgres cancel statements that would outlive the request, so a slow
+    query gives its connection back instead of holding it after the client
+    is gone. SET LOCAL only lasts until the transaction ends.
+    """
+    left = remaining()
+    if left is None or connection.dialect.name != "postgresql":
+        return
+    if left <= 0:
+        raise DeadlineExceeded()
+    connection.exec_driver_sql(f"SET LOCAL statement_timeout = {max(1, int(left * 1000))}")
 
 
 class DataBaseSessionManager:
-    def __init__(self, url: str):
-        self._engine: AsyncEngine | None = create_async_engine(url)
-        self._session_maker: async_sessionmaker = async_sessionmaker(
-            autoflush=False, autocommit=False, bind=self._engine
+    def __init__(self, url: str | None = None, **engine_kwargs):
+        self._engine: AsyncEngine | None = None
+        self._session_maker: async_sessionmaker | None = None
+        if url:
+            self.init(url, **engine_kwargs)
+
+    def init(self, url: str, **engine_kwargs) -> None:
+        sqlite = make_url(url).get_backend_name() == "sqlite"
+        if sqlite:
+            # Queue pool options don't apply, and an in-memory database only
+            # lives as long as its single connection
+            for option in POOL_OPTIONS:
+                engine_kwargs.pop(option, None)
+            if make_url(url).database in (None, "", ":memory:"):
+                engine_kwargs.setdefault("poolclass", StaticPool)
+        self._engine = create_async_engine(url, **engine_kwargs)
+        if sqlite:
+            event.listen(self._engine.sync_engine, "connect", enable_sqlite_foreign_keys)
+        self._session_maker = async_sessionmaker(
+            autoflush=False, autocommit=False, bind=self._engine, sync_session_class=DeadlineSession
         )
 
+    @property
+    def engine(self) -> AsyncEngine:
+        if self._engine is None:
+            raise Exception("Session is not initialized")
+        return self._engine
+
+    async def warmup(self, connections: int) -> None:
+        """Open pool connections up front so first requests don't pay for connects"""
+        if connections < 1 or self.engine.dialect.name == "sqlite":
+            return
+        # Connections beyond pool_size are overflow and discarded when returned
+        pool_size = getattr(self.engine.pool, "size", None)
+        if pool_size is not None:
+            connections = min(connections, pool_size())
+        # Hold every connection until all are open so each one is new
+        opened = []
+        try:
+            for _ in range(connections):
+                connection = await self.engine.connect()
+                opened.append(connection)
+                await connection.execute(text("SELECT 1"))
+        finally:
+            for connection in opened:
+                await connection.close()
+
+    async def close(self) -> None:
+        if self._engine is not None:
+            await self._engine.dispose()
+        self._engine = None
+        self._session_maker = None
+
     @contextlib.asynccontextmanager
     async def session(self):
         if self._session_maker is None:
@@ -20,15 +102,21 @@ class DataBaseSessionManager:
         session = self._session_maker()
         try:
             yield session
+        except asyncio.CancelledError:
+            # The connection may be mid-statement; drop it rather than
+            # return it to the pool, and finish even if cancelled again
+            await asyncio.shield(session.invalidate())
+            raise
         except Exception as err:
-            print(err)
+            if not isinstance(err, HTTPException):
+                logger.warning("Rolling back session after %s: %s", type(err).__name__, err)
             await session.rollback()
             raise
         finally:
-            await session.close()
+            await asyncio.shield(session.close())
 
 
-sessionmanager = DataBaseSessionManager(config.url)
+sessionmanager = DataBaseSessionManager()
 
 
 async def get_db():
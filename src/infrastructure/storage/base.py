@@ -0,0 +1,48 @@
+from contextlib import AbstractAsyncContextManager
+from pathlib import Path
+from typing import AsyncIterator
+
+
+class UploadTooLarge(Exception):
+    pass
+
+
+class UploadInProgress(Exception):
+    """Another request, possibly in another worker, is writing the upload"""
+
+
+class StorageBackend:
+    """
+    Content-addressed blob storage with resumable uploads.
+
+    Uploads are appended to a staging area under their upload id. When an
+    upload is committed it is hashed and stored under its SHA-256, so equal
+    files are kept once however many attachments point at them.
+    """
+
+    async def offset(self, upload_id: str) -> int:
+        """Number of bytes received so far for an upload"""
+        raise NotImplementedError
+
+    def lock(self, upload_id: str) -> AbstractAsyncContextManager[int]:
+        """
+        Hold an upload exclusively across processes while appending to and
+        committing it; yields the current offset. Raises UploadInProgress
+        instead of waiting when the upload is held.
+        """
+        raise NotImplementedError
+
+    async def append(self, upload_id: str, chunks: AsyncIterator[bytes], limit: int) -> int:
+        """Append a stream to an upload without buffering it, return the new offset"""
+        raise NotImplementedError
+
+    async def commit(self, upload_id: str) -> tuple[str, int]:
+        """Move a finished upload to its content address, return (sha256, size)"""
+        raise NotImplementedError
+
+    async def discard(self, upload_id: str) -> None:
+        raise NotImplementedError
+
+    def path(self, sha256: str) -> Path:
+        """Local path of a stored blob, for zero-copy file responses"""
+        raise NotImplementedError
@@ -0,0 +1,110 @@
+import asyncio
+import fcntl
+import hashlib
+import os
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator
+
+from src.config.config import config
+from src.infrastructure.storage.base import StorageBackend, UploadInProgress, UploadTooLarge
+
+WRITE_BUFFER_BYTES = 1024 * 1024
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        while chunk := file.read(HASH_CHUNK_BYTES):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LocalStorage(StorageBackend):
+    """Stores blobs on the local disk, sharded by the first bytes of their hash"""
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self.uploads = self.root / "uploads"
+        self.blobs = self.root / "blobs"
+
+    def _upload_path(self, upload_id: str) -> Path:
+        return self.uploads / f"{upload_id}.part"
+
+    def path(self, sha256: str) -> Path:
+        return self.blobs / sha256[:2] / sha256[2:4] / sha256
+
+    async def offset(self, upload_id: str) -> int:
+        try:
+            return (await asyncio.to_thread(self._upload_path(upload_id).stat)).st_size
+        except FileNotFoundError:
+            return 0
+
+    @asynccontextmanager
+    async def lock(self, upload_id: str) -> AsyncIterator[int]:
+        path = self._upload_path(upload_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file = await asyncio.to_thread(path.open, "ab")
+        try:
+            # flock is released by the kernel when the file is closed, also
+            # when the worker holding it dies
+            try:
+                fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise UploadInProgress(upload_id) from None
+            # The holder may have committed the part file away before
+            # releasing it; the lock is then on a file nobody appends to
+            try:
+                current = await asyncio.to_thread(path.stat)
+            except FileNotFoundError:
+                raise UploadInProgress(upload_id) from None
+            if current.st_ino != os.fstat(file.fileno()).st_ino:
+                raise UploadInProgress(upload_id)
+            yield current.st_size
+        finally:
+            await asyncio.to_thread(file.close)
+
+    async def append(self, upload_id: str, chunks: AsyncIterator[bytes], limit: int) -> int:
+        path = self._upload_path(upload_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        file = await asyncio.to_thread(path.open, "ab")
+        try:
+            offset = file.tell()
+            buffer = bytearray()
+            async for chunk in chunks:
+                offset += len(chunk)
+                if offset > limit:
+                    raise UploadTooLarge(f"Upload exceeds {limit} bytes")
+                buffer.extend(chunk)
+                # Disk writes go to a thread in batches, never per network chunk
+                if len(buffer) >= WRITE_BUFFER_BYTES:
+                    await asyncio.to_thread(file.write, bytes(buffer))
+                    buffer.clear()
+        finally:
+            # Keep what arrived before a disconnect so the client can resume
+            if buffer:
+                await asyncio.to_thread(file.write, bytes(buffer))
+            await asyncio.to_thread(file.close)
+        return offset
+
+    def _commit(self, upload_id: str) -> tuple[str, int]:
+        upload = self._upload_path(upload_id)
+        size = upload.stat().st_size
+        sha256 = hash_file(upload)
+        target = self.path(sha256)
+        if target.exists():
+            upload.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(upload, target)
+        return sha256, size
+
+    async def commit(self, upload_id: str) -> tuple[str, int]:
+        return await asyncio.to_thread(self._commit, upload_id)
+
+    async def discard(self, upload_id: str) -> None:
+        await asyncio.to_thread(self._upload_path(upload_id).unlink, missing_ok=True)
+
+
+storage = LocalStorage(config.ATTACHMENTS_DIR)
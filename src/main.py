@@ -1,28 +1,42 @@
-from typing import List
-from fastapi import FastAPI, Depends, HTTPException, APIRouter
+import asyncio
+import contextlib
+import logging
+import time
+from typing import List, Optional
+
+import httpx
+from fastapi import FastAPI, Depends, HTTPException, APIRouter, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError, TimeoutError as PoolTimeoutError
+from sqlalchemy.orm.exc import StaleDataError
 
 from src.presentation.rest.auth import router as auth_router
 from src.presentation.rest.cats import router as cats_router
 from src.presentation.rest.admin import router as admin_router
+from src.presentation.middleware.capture import CaptureMiddleware, TrafficRecorder
+from src.presentation.middleware.deadline import DeadlineMiddleware
+from src.presentation.middleware.inflight import InFlightMiddleware, InFlightTracker
+from src.presentation.middleware.profiling import ProfilingMiddleware
+from src.presentation.middleware.request_id import RequestIdMiddleware
 
-from src.infrastructure.database.session import get_db
-
+from src.application.breed_catalog import breed_catalog
+from src.application.deadlines import DeadlineExceeded, DeadlinePolicy, timeout_stats
+from src.application.events import event_hub
+from src.application.jobs import job_runner
+from src.application.loop_monitor import loop_monitor
+from src.application.password_service import password_service
+from src.application.revocation import revocation_list
+from src.application import tasks  # noqa: F401 - registers the background jobs
+from src.config.config import Settings, config
+from src.config.logging_config import logging_pipeline
+from src.infrastructure.database.query_stats import query_recorder
+from src.infrastructure.database.retry import QUERY_CANCELED, sqlstate
+from src.infrastructure.database.session import get_db, sessionmanager
 
-app = FastAPI(
-    title="Spy Cat API",
-    description="Web app on Fast API for Spy Cat Agency",
-)
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+logger = logging.getLogger(__name__)
 
 
 def register_routers(app, routers: List[APIRouter], prefix: str = "/api") -> None:
@@ -36,10 +50,7 @@ api_routers = [
     admin_router,
 ]
 
-register_routers(app, api_routers)
-
 
-@app.get("/healthchecker")
 async def healthchecker(db: AsyncSession = Depends(get_db)):
     try:
         result = await db.execute(text("SELECT 1"))
@@ -49,6 +60,156 @@ async def healthchecker(db: AsyncSession = Depends(get_db)):
                 status_code=500, detail="Database is not configured correctly"
             )
         return {"message": "Welcome to FastAPI!"}
-    except Exception as e:
-        print(e)
+    except Exception:
+        logger.exception("Health check failed")
         raise HTTPException(status_code=500, detail="Error connecting to the database")
+
+
+async def warm_up(app: FastAPI, settings: Settings) -> None:
+    """Pay connect, import and schema costs before the first request does"""
+    try:
+        await sessionmanager.warmup(settings.DB_WARMUP_CONNECTIONS)
+    except Exception as err:
+        logger.warning("Database warmup failed: %s", err)
+    try:
+        await asyncio.wait_for(breed_catalog.refresh(), timeout=5)
+    except Exception as err:
+        logger.warning("Breed catalog was not primed: %s", err)
+    password_service.warmup()
+    app.openapi()
+
+
+async def stale_data_handler(request: Request, exc: StaleDataError) -> JSONResponse:
+    """A row's version changed between read and write: another request won"""
+    return JSONResponse(
+        status_code=status.HTTP_409_CONFLICT,
+        content={"detail": "Resource was modified concurrently, reload and retry"},
+    )
+
+
+def timeout_response(request: Request, kind: str, status_code: int, detail: str) -> JSONResponse:
+    timeout_stats.record(kind, request.scope)
+    headers = {"Retry-After": "1"} if status_code == status.HTTP_503_SERVICE_UNAVAILABLE else None
+    return JSONResponse(status_code=status_code, content={"detail": detail}, headers=headers)
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    return timeout_response(request, "deadline", status.HTTP_504_GATEWAY_TIMEOUT, "Request deadline exceeded")
+
+
+async def upstream_timeout_handler(request: Request, exc: httpx.TimeoutException) -> JSONResponse:
+    return timeout_response(request, "upstream", status.HTTP_504_GATEWAY_TIMEOUT, "External API timed out")
+
+
+async def pool_timeout_handler(request: Request, exc: PoolTimeoutError) -> JSONResponse:
+    """No pooled connection freed up in time: shed the request instead of queueing it"""
+    return timeout_response(request, "pool", status.HTTP_503_SERVICE_UNAVAILABLE, "Database is busy, retry shortly")
+
+
+async def query_canceled_handler(request: Request, exc: DBAPIError) -> JSONResponse:
+    """Postgres cancelled a statement that hit the statement_timeout set from the deadline"""
+    if sqlstate(exc) != QUERY_CANCELED:
+        raise exc
+    return timeout_response(request, "statement", status.HTTP_504_GATEWAY_TIMEOUT, "Database query timed out")
+
+
+def create_app(settings: Optional[Settings] = None) -> FastAPI:
+    settings = settings or config
+    logging_pipeline.configure(
+        level=settings.LOG_LEVEL,
+        json_format=settings.LOG_JSON,
+        queue_size=settings.LOG_QUEUE_SIZE,
+        sample_rates=settings.LOG_SAMPLE_RATES,
+    )
+    created_at = time.perf_counter()
+    inflight = InFlightTracker()
+    recorder = None
+    if settings.CAPTURE_ENABLED:
+        recorder = TrafficRecorder(
+            settings.CAPTURE_DIR, settings.CAPTURE_MAX_BYTES, settings.CAPTURE_BACKUP_COUNT
+        )
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        sessionmanager.init(
+            settings.url,
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_pre_ping=True,
+        )
+        if settings.SLOW_QUERY_LOG_ENABLED:
+            query_recorder.attach(sessionmanager.engine)
+        if settings.LOOP_MONITOR_ENABLED:
+            loop_monitor.start()
+        if recorder:
+            recorder.start()
+        await event_hub.start(settings.url)
+        try:
+            await revocation_list.sync()
+        except Exception as err:
+            logger.warning("Revoked tokens were not loaded, retrying in the background: %s", err)
+        revocation_list.start()
+        await job_runner.start()
+        await warm_up(app, settings)
+
+        startup_seconds = time.perf_counter() - created_at
+        logger.info(
+            "Startup took %.3fs (budget %.3fs)",
+            startup_seconds, settings.STARTUP_BUDGET_SECONDS,
+        )
+        if startup_seconds > settings.STARTUP_BUDGET_SECONDS:
+            logger.warning("Startup exceeded its budget by %.3fs",
+                           startup_seconds - settings.STARTUP_BUDGET_SECONDS)
+        yield
+
+        if not await inflight.wait_idle(settings.SHUTDOWN_DRAIN_SECONDS):
+            logger.warning("Shutting down with %s requests in flight", inflight.count)
+        await job_runner.stop()
+        await revocation_list.stop()
+        await event_hub.stop()
+        await loop_monitor.stop()
+        if recorder:
+            recorder.stop()
+        query_recorder.detach()
+        await sessionmanager.close()
+        logging_pipeline.stop()
+
+    app = FastAPI(
+        title="Spy Cat API",
+        description="Web app on Fast API for Spy Cat Agency",
+        lifespan=lifespan,
+    )
+
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=["*"],
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+    )
+    if settings.PROFILING_ENABLED:
+        app.add_middleware(
+            ProfilingMiddleware,
+            directory=settings.PROFILING_DIR,
+            sample_rate=settings.PROFILING_SAMPLE_RATE,
+        )
+    if recorder:
+        app.add_middleware(CaptureMiddleware, recorder=recorder)
+    app.add_middleware(
+        DeadlineMiddleware,
+        policy=DeadlinePolicy(settings.REQUEST_TIMEOUT_SECONDS, settings.ROUTE_TIMEOUTS),
+    )
+    app.add_middleware(InFlightMiddleware, tracker=inflight)
+    app.add_middleware(RequestIdMiddleware)
+
+    app.add_exception_handler(StaleDataError, stale_data_handler)
+    app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
+    app.add_exception_handler(httpx.TimeoutException, upstream_timeout_handler)
+    app.add_exception_handler(PoolTimeoutError, pool_timeout_handler)
+    app.add_exception_handler(DBAPIError, query_canceled_handler)
+    register_routers(app, api_routers)
+    app.add_api_route("/healthchecker", healthchecker, methods=["GET"])
+    return app
+
+
+app = create_app()
@@ -6,6 +6,9 @@ from src.infrastructure.database.repositories.notes import NoteRepository
 from src.infrastructure.database.repositories.missions import MissionRepository
 from src.infrastructure.database.repositories.targets import TargetRepository
 from src.infrastructure.database.repositories.cats import CatRepository
+from src.infrastructure.database.repositories.analytics import AnalyticsRepository
+from src.infrastructure.database.repositories.attachments import AttachmentRepository
+from src.infrastructure.database.repositories.reset_tokens import PasswordResetTokenRepository
 
 
 async def get_cat_repository(db: AsyncSession = Depends(get_db)) -> CatRepository:
@@ -20,3 +23,11 @@ async def get_target_repository(db: AsyncSession = Depends(get_db)) -> TargetRep
 async def get_note_repository(db: AsyncSession = Depends(get_db)) -> NoteRepository:
     return NoteRepository(db)
 
+async def get_analytics_repository(db: AsyncSession = Depends(get_db)) -> AnalyticsRepository:
+    return AnalyticsRepository(db)
+
+async def get_attachment_repository(db: AsyncSession = Depends(get_db)) -> AttachmentRepository:
+    return AttachmentRepository(db)
+
+async def get_reset_token_repository(db: AsyncSession = Depends(get_db)) -> PasswordResetTokenRepository:
+    return PasswordResetTokenRepository(db)
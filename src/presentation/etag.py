@@ -0,0 +1,44 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+
+def make_etag(*parts: Any) -> str:
+    """Build a strong ETag from the version parts of a resource."""
+    raw = "|".join("" if part is None else str(part) for part in parts)
+    return '"' + hashlib.sha256(raw.encode()).hexdigest()[:32] + '"'
+
+
+def etag_matches(header: Optional[str], etag: str, weak: bool = False) -> bool:
+    """
+    Check an If-None-Match / If-Match header value against an ETag.
+    If-None-Match uses the weak comparison, which ignores a `W/` prefix a
+    proxy may have added; If-Match uses the strong one (RFC 9110 13.1).
+    """
+    if not header:
+        return False
+    candidates = [value.strip() for value in header.split(",")]
+    if weak:
+        candidates = [value[2:] if value.startswith("W/") else value for value in candidates]
+    return "*" in candidates or etag in candidates
+
+
+def not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response when the client already holds this ETag."""
+    if etag_matches(request.headers.get("if-none-match"), etag, weak=True):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+    return None
+
+
+def check_if_match(request: Request, etag: str) -> None:
+    """Reject a write with 412 when its If-Match header names another ETag."""
+    header = request.headers.get("if-match")
+    if header is not None and not etag_matches(header, etag):
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Resource has been modified",
+            headers={"ETag": etag},
+        )
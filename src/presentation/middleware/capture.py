@@ -0,0 +1,143 @@
+import json
+import logging
+import logging.handlers
+import queue
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl
+
+from src.config.logging_config import DroppingQueueHandler
+
+MAX_BODY_BYTES = 64 * 1024
+SENSITIVE_KEYS = {"password", "new_password", "token", "refresh_token", "access_token", "reset_token"}
+
+
+def shape_of(value: Any) -> Any:
+    """Describe the structure of a value without keeping any of its data"""
+    if isinstance(value, dict):
+        return {key: shape_of(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return {"list": shape_of(value[0]) if value else None, "length": len(value)}
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if value is None:
+        return "null"
+    return "str"
+
+
+def body_shape(content_type: str, body: bytes) -> tuple[str | None, Any]:
+    if not body:
+        return None, None
+    if content_type.startswith("application/json"):
+        try:
+            return "json", shape_of(json.loads(body))
+        except ValueError:
+            return "json", "invalid"
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return "form", {key: "str" for key, _ in parse_qsl(body.decode("latin-1"))}
+    return "raw", {"bytes": len(body)}
+
+
+def sanitized_query(query_string: bytes) -> list[list[str]]:
+    """Keep query parameters for replay with secret values redacted"""
+    return [
+        [key, "redacted" if key in SENSITIVE_KEYS else value]
+        for key, value in parse_qsl(query_string.decode("latin-1"), keep_blank_values=True)
+    ]
+
+
+def sanitized_path(scope) -> str:
+    """Rebuild the request path with secrets in path parameters redacted"""
+    route = scope.get("route")
+    path_params = scope.get("path_params") or {}
+    if route is None or not SENSITIVE_KEYS & path_params.keys():
+        return scope["path"]
+    params = {key: "redacted" if key in SENSITIVE_KEYS else value for key, value in path_params.items()}
+    return route.path_format.format(**params)
+
+
+class TrafficRecorder:
+    """Writes capture records to rotating NDJSON files from a background thread"""
+
+    def __init__(self, directory: str, max_bytes: int, backup_count: int):
+        Path(directory).mkdir(parents=True, exist_ok=True)
+        handler = logging.handlers.RotatingFileHandler(
+            Path(directory) / "traffic.ndjson", maxBytes=max_bytes, backupCount=backup_count
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        records: queue.Queue = queue.Queue(maxsize=10_000)
+        self.logger = logging.getLogger("traffic.capture")
+        self.logger.propagate = False
+        self.logger.setLevel(logging.INFO)
+        self.logger.addHandler(DroppingQueueHandler(records))
+        self.listener = logging.handlers.QueueListener(records, handler)
+
+    def start(self) -> None:
+        self.listener.start()
+
+    def stop(self) -> None:
+        self.listener.stop()
+
+    def write(self, record: dict) -> None:
+        self.logger.info(json.dumps(record, separators=(",", ":")))
+
+
+class CaptureMiddleware:
+    """
+    Records sanitized request metadata for later replay.
+
+    Headers and body values are never written: only the method, route
+    template, path, query parameters with secrets redacted, body shape,
+    status and timing, plus whether the request carried a bearer token.
+    """
+
+    def __init__(self, app, recorder: TrafficRecorder):
+        self.app = app
+        self.recorder = recorder
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        started_at = time.time()
+        started = time.perf_counter()
+        body = bytearray()
+        response = {"status": None, "bytes": 0}
+
+        async def capture_receive():
+            message = await receive()
+            if message["type"] == "http.request" and len(body) < MAX_BODY_BYTES:
+                body.extend(message.get("body", b"")[:MAX_BODY_BYTES - len(body)])
+            return message
+
+        async def capture_send(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            headers = dict(scope["headers"])
+            body_type, shape = body_shape(headers.get(b"content-type", b"").decode("latin-1"), bytes(body))
+            route = scope.get("route")
+            self.recorder.write({
+                "ts": started_at,
+                "method": scope["method"],
+                "route": getattr(route, "path", None),
+                "path": sanitized_path(scope),
+                "query": sanitized_query(scope["query_string"]),
+                "body_type": body_type,
+                "body": shape,
+                "auth": headers.get(b"authorization", b"")[:7].lower() == b"bearer ",
+                "status": response["status"],
+                "response_bytes": response["bytes"],
+                "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+            })
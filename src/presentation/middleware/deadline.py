@@ -0,0 +1,57 @@
+import asyncio
+import json
+import logging
+import time
+
+from src.application.deadlines import DeadlinePolicy, deadline_var, timeout_stats
+
+logger = logging.getLogger(__name__)
+
+
+class DeadlineMiddleware:
+    """
+    Gives every request a deadline from the policy. Database sessions and
+    outbound calls read it to bound their own timeouts, and a request still
+    running when it expires is cancelled and answered with 504.
+    """
+
+    def __init__(self, app, policy: DeadlinePolicy):
+        self.app = app
+        self.policy = policy
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+        seconds = self.policy.for_path(scope["path"])
+        if seconds <= 0:
+            return await self.app(scope, receive, send)
+
+        started = False
+
+        async def send_tracking_start(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        token = deadline_var.set(time.monotonic() + seconds)
+        timeout = asyncio.timeout(seconds)
+        try:
+            async with timeout:
+                await self.app(scope, receive, send_tracking_start)
+        except TimeoutError:
+            if not timeout.expired():
+                raise
+            timeout_stats.record("deadline", scope)
+            logger.warning("Request %s %s exceeded its %.1fs deadline", scope["method"], scope["path"], seconds)
+            if started:
+                raise
+            body = json.dumps({"detail": "Request deadline exceeded"}).encode()
+            await send({
+                "type": "http.response.start",
+                "status": 504,
+                "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+            })
+            await send({"type": "http.response.body", "body": body})
+        finally:
+            deadline_var.reset(token)
@@ -0,0 +1,76 @@
+import asyncio
+import cProfile
+import random
+import time
+import uuid
+from pathlib import Path
+
+from fastapi import HTTPException
+from jose import JWTError
+
+from src.application.auth import auth_service
+from src.config.logging_config import request_id_var
+from src.infrastructure.database.repositories.cats import CatRepository
+from src.infrastructure.database.session import sessionmanager
+
+
+async def is_admin_token(authorization: str) -> bool:
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return False
+    try:
+        async with sessionmanager.session() as db:
+            cat = await auth_service.get_current_cat(token, CatRepository(db))
+    except (HTTPException, JWTError, KeyError):
+        return False
+    return bool(cat.is_staff)
+
+
+class ProfilingMiddleware:
+    """
+    Profiles single requests with cProfile and writes .prof files.
+
+    A request is profiled when an admin sends the X-Profile header or when it
+    is picked by the sampling rate. Only one request is profiled at a time,
+    and the profile covers everything the event loop ran meanwhile, so
+    profile under representative but not saturating load.
+    """
+
+    def __init__(self, app, directory: str, sample_rate: float = 0.0, header: str = "x-profile"):
+        self.app = app
+        self.directory = Path(directory)
+        self.sample_rate = sample_rate
+        self.header = header.encode()
+        self._busy = False
+
+    async def should_profile(self, headers: dict) -> bool:
+        if self.header in headers:
+            return await is_admin_token(headers.get(b"authorization", b"").decode())
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self._busy:
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        if not await self.should_profile(headers):
+            return await self.app(scope, receive, send)
+
+        request_id = request_id_var.get() or uuid.uuid4().hex
+        profile_id = f"{time.strftime('%Y%m%dT%H%M%S')}-{request_id}"
+
+        async def send_with_profile_id(message):
+            if message["type"] == "http.response.start":
+                message.setdefault("headers", [])
+                message["headers"].append((b"x-profile-id", profile_id.encode()))
+            await send(message)
+
+        self._busy = True
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            profile.disable()
+            self._busy = False
+            self.directory.mkdir(parents=True, exist_ok=True)
+            await asyncio.to_thread(profile.dump_stats, self.directory / f"{profile_id}.prof")
@@ -1,10 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+import asyncio
+import json
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from src.application.auth import get_current_admin
-from src.presentation.schemas.cats import CatResponse
-from src.presentation.schemas.missions import MissionCreate, MissionResponse, AssignCatsRequest
+from src.application.deadlines import timeout_stats
+from src.application.events import event_hub
+from src.application.jobs import job_runner
+from src.application.loop_monitor import loop_monitor
+from src.application.matching import matching_engine
+from src.application.response_cache import response_cache
+from src.application.revocation import revocation_list
+from src.config.logging_config import logging_pipeline
+from src.infrastructure.database.query_stats import query_recorder
+from src.infrastructure.database.session import get_db
+from src.presentation.schemas.cats import CatResponse, CatRosterResponse
+from src.presentation.schemas.missions import (
+    MissionCreate,
+    MissionResponse,
+    AssignCatsRequest,
+    MatchAssignment,
+    MatchPlanResponse,
+)
+from src.presentation.etag import check_if_match, make_etag, not_modified
+from src.presentation.sse import sse_response
 from src.infrastructure.database.models.tables import Cat
+from src.infrastructure.database.repositories.analytics import (
+    AnalyticsRepository,
+)
 from src.infrastructure.database.repositories.cats import (
     CatRepository,
 )
@@ -12,6 +38,7 @@ from src.infrastructure.database.repositories.missions import (
     MissionRepository,
 )
 from src.presentation.dependencies import (
+    get_analytics_repository,
     get_cat_repository,
     get_mission_repository,
 )
@@ -19,14 +46,105 @@ from src.presentation.dependencies import (
 
 router = APIRouter(prefix="/admin", tags=["Admins"])
 
-    
+
+def to_json_bytes(content) -> bytes:
+    """Serialize content the same way FastAPI's JSONResponse does"""
+    return json.dumps(
+        jsonable_encoder(content),
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+    ).encode("utf-8")
+
+
+@router.get("/cache/stats")
+async def get_cache_stats(
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get response cache hit, miss and eviction counters. Admin access required."""
+    return response_cache.stats()
+
+@router.get("/timeouts/stats")
+async def get_timeout_stats(
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get request deadline, statement, pool and external API timeout counters. Admin access required."""
+    return timeout_stats.stats()
+
+@router.get("/jobs/stats")
+async def get_job_stats(
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get background job queue and per-job counters. Admin access required."""
+    return job_runner.stats()
+
+@router.get("/logs/stats")
+async def get_log_stats(
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get queued, dropped and sampled-out log record counters. Admin access required."""
+    return logging_pipeline.stats()
+
+@router.get("/revocations/stats")
+async def get_revocation_stats(
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get the number of revoked tokens held in memory and the last sync time. Admin access required."""
+    return revocation_list.stats()
+
+@router.get("/loop/stats")
+async def get_loop_stats(
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get event-loop lag and the call sites that blocked the loop. Admin access required."""
+    return loop_monitor.stats()
+
+@router.get("/queries/stats")
+async def get_query_stats(
+    limit: int = Query(50, ge=1, le=1000),
+    order_by: str = Query("total_ms", pattern="^(total_ms|p95_ms|max_ms|count|rows)$"),
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get aggregated statement stats of the slow-query recorder. Admin access required."""
+    return query_recorder.stats(limit=limit, order_by=order_by)
+
+@router.get("/analytics")
+async def get_analytics(
+    weeks: int = Query(12, ge=1, le=520),
+    analytics_repository: AnalyticsRepository = Depends(get_analytics_repository),
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get salary, experience, throughput and time-to-complete aggregates. Admin access required."""
+    async def build():
+        return to_json_bytes(await analytics_repository.report(weeks))
+
+    body = await response_cache.get_or_set(
+        "/admin/analytics", {"weeks": weeks}, ("cats", "missions"), build
+    )
+    return Response(content=body, media_type="application/json")
+
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Stream status changes of all missions and targets. Admin access required."""
+    # Give the pooled connection back; the stream can stay open for hours
+    await db.close()
+    return sse_response(request, event_hub.subscribe())
+
 @router.get("/cats")
 async def get_all_cats(
     cat_repository: CatRepository = Depends(get_cat_repository),
     current_cat: Cat = Depends(get_current_admin),
 ):
     """Get all cats in the system. Admin access required."""
-    return await cat_repository.get_all_cats()
+    async def build():
+        return to_json_bytes(await cat_repository.get_all_cats())
+
+    body = await response_cache.get_or_set("/admin/cats", None, ("cats",), build)
+    return Response(content=body, media_type="application/json")
 
 @router.get("/cats/name", response_model=list[CatResponse])
 async def get_cat_by_name(
@@ -42,6 +160,33 @@ async def get_cat_by_name(
         )
     return cats_by_query
 
+@router.get("/cats/roster", response_model=CatRosterResponse)
+async def get_cat_roster(
+    sort_by: str = Query(
+        "active_targets",
+        pattern="^(name|years_of_experience|missions|active_targets|completed_targets|notes)$",
+    ),
+    order: str = Query("desc", pattern="^(asc|desc)$"),
+    on_mission: Optional[bool] = Query(None),
+    min_active_targets: Optional[int] = Query(None, ge=0),
+    max_active_targets: Optional[int] = Query(None, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
+    cat_repository: CatRepository = Depends(get_cat_repository),
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """Get a page of cats with mission, active target and note counts. Admin access required."""
+    total, items = await cat_repository.get_roster(
+        sort_by=sort_by,
+        descending=order == "desc",
+        on_mission=on_mission,
+        min_active_targets=min_active_targets,
+        max_active_targets=max_active_targets,
+        limit=limit,
+        offset=offset,
+    )
+    return {"total": total, "items": items}
+
 @router.put("/cats/update/{cat_uuid}", response_model=CatResponse)
 async def update_cat_salary(
     cat_uuid: UUID,
@@ -103,22 +248,73 @@ async def get_all_missions(
     current_cat: Cat = Depends(get_current_admin),
 ):
     """Get all missions in the system. Admin access required."""
-    missions = await mission_repository.get_all_missions()
-    return [MissionResponse.from_mission(mission) for mission in missions]
+    async def build():
+        missions = await mission_repository.get_all_missions()
+        return to_json_bytes([MissionResponse.from_mission(mission) for mission in missions])
+
+    body = await response_cache.get_or_set("/admin/missions", None, ("missions",), build)
+    return Response(content=body, media_type="application/json")
+
+@router.post("/missions/match", response_model=MatchPlanResponse)
+async def match_cats_to_missions(
+    apply: bool = Query(False),
+    cats_per_mission: int = Query(1, ge=1, le=10),
+    limit: int = Query(500, ge=1, le=5000),
+    mission_repository: MissionRepository = Depends(get_mission_repository),
+    current_cat: Cat = Depends(get_current_admin),
+):
+    """
+    Staff the oldest pending missions with idle cats. Admin access required.
+    Returns the plan; with apply=true it is also written in one transaction.
+    """
+    cats = await mission_repository.get_matching_candidates()
+    openings = await mission_repository.get_matching_openings(cats_per_mission, limit)
+    plan = await asyncio.to_thread(matching_engine.plan, cats, openings)
+    applied = await mission_repository.apply_assignments(plan) if apply and plan else plan
+    applied_set = set(applied)
+    staffed = {assignment.mission_uuid for assignment in applied}
+    return MatchPlanResponse(
+        applied=apply,
+        idle_cats=len(cats),
+        assignments=[MatchAssignment.model_validate(assignment) for assignment in applied],
+        skipped=[MatchAssignment.model_validate(assignment) for assignment in plan if assignment not in applied_set],
+        unstaffed_mission_uuids=[opening.uuid for opening in openings if opening.uuid not in staffed],
+    )
 
 @router.get("/mission/{mission_uuid}", response_model=MissionResponse)
 async def get_mission_by_uuid(
     mission_uuid: UUID,
+    request: Request,
     mission_repository: MissionRepository = Depends(get_mission_repository),
     current_cat: Cat = Depends(get_current_admin),
 ):
     """Get a mission by its UUID. Admin access required."""
-    mission = await mission_repository.get_by_uuid(mission_uuid)
-    if not mission:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found"
-        )
-    return MissionResponse.from_mission(mission)
+    key = response_cache.make_key(
+        "/admin/mission", {"mission_uuid": str(mission_uuid)}, ("missions",)
+    )
+    entry = response_cache.get(key)
+    if entry is None:
+        version = await mission_repository.get_version(mission_uuid)
+        if not version:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found"
+            )
+        etag = make_etag("mission", mission_uuid, *version)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        mission = await mission_repository.get_by_uuid(mission_uuid)
+        if not mission:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Mission not found"
+            )
+        entry = (etag, to_json_bytes(MissionResponse.from_mission(mission)))
+        response_cache.set(key, entry)
+    etag, body = entry
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @router.delete("/mission/delete/{mission_uuid}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_mission_by_uuid(
@@ -137,11 +333,24 @@ async def delete_mission_by_uuid(
 @router.put("/mission/complete/{mission_uuid}", response_model=MissionResponse)
 async def complete_mission_by_uuid(
     mission_uuid: UUID,
+    request: Request,
+    response: Response,
     mission_repository: MissionRepository = Depends(get_mission_repository),
     current_cat: Cat = Depends(get_current_admin),
 ):
-    """Mark a mission as completed by its UUID. Admin access required."""
-    mission = await mission_repository.set_completed_mission(mission_uuid)
+    """
+    Mark a mission as completed by its UUID. Admin access required.
+    Send the mission's ETag in If-Match to fail with 412 if it changed since it was read.
+    """
+    expected_version = None
+    if "if-match" in request.headers:
+        version = await mission_repository.get_version(mission_uuid)
+        if version:
+            check_if_match(request, make_etag("mission", mission_uuid, *version))
+            expected_version = version[0]
+    mission = await mission_repository.set_completed_mission(mission_uuid, expected_version)
+    version = await mission_repository.get_version(mission_uuid)
+    response.headers["ETag"] = make_etag("mission", mission_uuid, *version)
     return MissionResponse.from_mission(mission)
 
 @router.put("/mission/assign/{mission_uuid}", response_model=MissionResponse)
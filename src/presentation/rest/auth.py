@@ -12,15 +12,18 @@ from src.presentation.schemas.cats import (
     PasswordResetRequest,
     PasswordReset,
 )
-from src.application.auth import auth_service
+from src.application.auth import auth_service, get_current_cat
 from src.application.password_service import password_service
+from src.config.config import config
 from src.infrastructure.database.repositories.cats import (
     CatRepository,
 )
-from src.presentation.dependencies import get_cat_repository
+from src.infrastructure.database.repositories.reset_tokens import (
+    PasswordResetTokenRepository,
+)
+from src.presentation.dependencies import get_cat_repository, get_reset_token_repository
 import logging
 
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 CREDENTIALS_EXCEPTION = HTTPException(
@@ -116,25 +119,41 @@ async def refresh_token(
     }
 
 
+@router.post("/logout", status_code=status.HTTP_204_NO_CONTENT)
+async def logout(
+    token: str = Depends(auth_service.oauth2_scheme),
+    current_cat: Cat = Depends(get_current_cat),
+    cat_repository: CatRepository = Depends(get_cat_repository),
+):
+    """Log out the current cat.
+
+    - Revoke the access token until it expires
+    - Drop the stored refresh token so no new access tokens can be issued"""
+    await auth_service.revoke_token(token)
+    await cat_repository.update_token(current_cat, None)
+
+
 @router.post("/forgot_password")
 async def forgot_password(
     body: PasswordResetRequest,
     request: Request,
     cat_repository: CatRepository = Depends(get_cat_repository),
+    reset_token_repository: PasswordResetTokenRepository = Depends(get_reset_token_repository),
 ):
     """Initiate password reset process by sending a reset link to the cat's email.
     
     - Verify cat exists with the provided email
-    - Generate a password reset token
+    - Generate a password reset token, stored only as a hash
     - Send reset link via email (simulated here by returning the link)"""
     cat = await cat_repository.get_by_name(body.name)
     if cat is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Cat not found"
         )
-    reset_token = auth_service.create_reset_token({"sub": body.name})
+    reset_token, token_hash = auth_service.create_reset_token()
 
-    await cat_repository.store_reset_token(cat.name, reset_token)
+    # Stored before the link goes out, so the link works as soon as it arrives
+    await reset_token_repository.create(cat.uuid, token_hash, config.RESET_TOKEN_TTL)
 
     return reset_token
 
@@ -142,16 +161,10 @@ async def forgot_password(
 @router.post("/reset_password/{token}")
 async def reset_password(
     body: PasswordReset,
-    cat_repository: CatRepository = Depends(get_cat_repository),
+    reset_token_repository: PasswordResetTokenRepository = Depends(get_reset_token_repository),
 ):
-    name = await auth_service.get_name_from_token(body.token, cat_repository)
-    cat = await cat_repository.get_by_name(name)
-
-    if cat is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND, detail="Cat not found"
-        )
-    if not await cat_repository.verify_reset_token(body.token):
+    """Set a new password with a reset token. Each token works once."""
+    token_hash = auth_service.hash_reset_token(body.token)
+    if await reset_token_repository.consume(token_hash, body.new_password) is None:
         raise HTTPException(status_code=400, detail="Invalid or expired token")
-    await cat_repository.update_password(cat.name, body.new_password)
     return {"message": "Password reset successfully"}
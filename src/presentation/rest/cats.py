@@ -1,7 +1,12 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
 from src.infrastructure.database.models.tables import Cat
+from src.infrastructure.database.repositories.attachments import (
+    AttachmentRepository,
+)
 from src.infrastructure.database.repositories.cats import (
     CatRepository,
 )
@@ -12,10 +17,23 @@ from src.infrastructure.database.repositories.targets import (
     TargetRepository
 )
 from src.application.auth import get_current_cat
+from src.application.events import event_hub
+from src.infrastructure.database.session import get_db
+from src.infrastructure.storage.base import UploadInProgress, UploadTooLarge
+from src.infrastructure.storage.local import storage
+from src.presentation.schemas.attachments import AttachmentCreate, AttachmentResponse
 from src.presentation.schemas.cats import CatProfile
-from src.presentation.schemas.notes import NoteCreate, NoteResponse
+from src.presentation.schemas.notes import (
+    NoteBatchCreate,
+    NoteBatchResponse,
+    NoteCreate,
+    NoteResponse,
+)
 from src.presentation.schemas.targets import TargetResponse
+from src.presentation.etag import check_if_match, make_etag, not_modified
+from src.presentation.sse import sse_response
 from src.presentation.dependencies import (
+    get_attachment_repository,
     get_cat_repository,
     get_target_repository,
     get_note_repository,
@@ -25,11 +43,18 @@ from src.presentation.dependencies import (
 router = APIRouter(prefix="/cats", tags=["Cats"])
 
 
-@router.get("/me")
+@router.get("/me", response_model=CatProfile)
 async def get_my_cat(
+    request: Request,
+    response: Response,
     cat_repository: CatRepository = Depends(get_cat_repository),
     current_cat: Cat = Depends(get_current_cat),
-) -> CatProfile:
+):
+    etag = make_etag("cat", current_cat.uuid, current_cat.updated_at)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
     my_cat = CatProfile(
         name=current_cat.name,
         years_of_experience=current_cat.years_of_experience,
@@ -39,6 +64,17 @@ async def get_my_cat(
     )
     return my_cat
 
+@router.get("/events")
+async def stream_my_events(
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_cat: Cat = Depends(get_current_cat),
+):
+    """Stream status changes of the missions and targets of the current cat."""
+    # Give the pooled connection back; the stream can stay open for hours
+    await db.close()
+    return sse_response(request, event_hub.subscribe(current_cat.uuid))
+
 @router.put("/target/{target_uuid}/assign", status_code=status.HTTP_200_OK)
 async def assign_cat_to_target(
     target_uuid: UUID,
@@ -50,36 +86,64 @@ async def assign_cat_to_target(
 @router.get("/target/{target_uuid}", response_model=TargetResponse)
 async def get_target_by_uuid(
     target_uuid: UUID,
+    request: Request,
+    response: Response,
     target_repository: TargetRepository = Depends(get_target_repository),
     current_cat: Cat = Depends(get_current_cat),
 ):
+    version = await target_repository.get_target_version(target_uuid, current_cat.uuid)
+    if version:
+        etag = make_etag("target", target_uuid, *version)
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+        response.headers["ETag"] = etag
     target = await target_repository.get_target_by_uuid(target_uuid, current_cat.uuid)
     return target
 
 @router.get("/targets", response_model=list[TargetResponse])
 async def get_my_targets(
+    request: Request,
+    response: Response,
     target_repository: TargetRepository = Depends(get_target_repository),
     current_cat: Cat = Depends(get_current_cat),
 ):
+    version = await target_repository.get_targets_version_for_cat(current_cat.uuid)
+    etag = make_etag("targets", current_cat.uuid, *version)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    response.headers["ETag"] = etag
     targets = await target_repository.get_all_targets_for_cat(current_cat.uuid)
     return targets
 
 @router.put("/target/complete/{target_uuid}", response_model=TargetResponse, status_code=status.HTTP_200_OK)
 async def complete_target(
     target_uuid: UUID,
+    request: Request,
+    response: Response,
     target_repository: TargetRepository = Depends(get_target_repository),
     current_cat: Cat = Depends(get_current_cat),
 ):
+    expected_version = None
+    if "if-match" in request.headers:
+        version = await target_repository.get_target_version(target_uuid, current_cat.uuid)
+        if version:
+            check_if_match(request, make_etag("target", target_uuid, *version))
+            expected_version = version[0]
     target = await target_repository.set_completed_target(
         target_uuid=target_uuid,
-        current_cat=current_cat
+        current_cat=current_cat,
+        expected_version=expected_version
     )
+    response.headers["ETag"] = make_etag("target", target_uuid, target.version)
     return target
 
 @router.post("/target-note/{target_uuid}", response_model=NoteResponse, status_code=status.HTTP_201_CREATED)
 async def create_note_for_target(
     target_uuid: UUID,
     note_create: NoteCreate,
+    response: Response,
     note_repository: NoteRepository = Depends(get_note_repository),
     current_cat: Cat = Depends(get_current_cat),
 ):
@@ -88,8 +152,29 @@ async def create_note_for_target(
         content=note_create.content,
         cat_uuid=current_cat.uuid
     )
+    response.headers["ETag"] = make_etag("note", note.uuid, note.version)
     return note
 
+@router.post("/notes/batch", response_model=NoteBatchResponse)
+async def create_notes_batch(
+    batch: NoteBatchCreate,
+    note_repository: NoteRepository = Depends(get_note_repository),
+    current_cat: Cat = Depends(get_current_cat),
+):
+    """
+    Create notes for several targets at once, e.g. when an agent comes back
+    online. Each note gets its own status; notes sent again with the same
+    client_id come back as duplicates instead of being stored twice.
+    """
+    results = await note_repository.create_many(current_cat.uuid, batch.notes)
+    statuses = [result["status"] for result in results]
+    return NoteBatchResponse(
+        created=statuses.count("created"),
+        duplicates=statuses.count("duplicate"),
+        rejected=len(statuses) - statuses.count("created") - statuses.count("duplicate"),
+        results=results,
+    )
+
 @router.get("/notes", response_model=list[NoteResponse])
 async def get_notes(
     note_repository: NoteRepository = Depends(get_note_repository),
@@ -101,13 +186,117 @@ async def get_notes(
 async def update_note(
     note_uuid: UUID,
     note_update: NoteCreate,
+    request: Request,
+    response: Response,
     note_repository: NoteRepository = Depends(get_note_repository),
     current_cat: Cat = Depends(get_current_cat),
 ):
+    expected_version = None
+    if "if-match" in request.headers:
+        expected_version = await note_repository.get_note_version(note_uuid)
+        if expected_version is not None:
+            check_if_match(request, make_etag("note", note_uuid, expected_version))
     updated_note = await note_repository.update_note(
         note_uuid=note_uuid,
         new_content=note_update.content,
-        cat_uuid=current_cat.uuid
+        cat_uuid=current_cat.uuid,
+        expected_version=expected_version
     )
+    response.headers["ETag"] = make_etag("note", note_uuid, updated_note.version)
     return updated_note
 
+@router.post("/note/{note_uuid}/attachments", response_model=AttachmentResponse, status_code=status.HTTP_201_CREATED)
+async def create_attachment(
+    note_uuid: UUID,
+    attachment_create: AttachmentCreate,
+    attachment_repository: AttachmentRepository = Depends(get_attachment_repository),
+    current_cat: Cat = Depends(get_current_cat),
+):
+    """Start an upload; send the file with PATCH /cats/attachments/{uuid}."""
+    attachment = await attachment_repository.create(
+        note_uuid=note_uuid,
+        cat_uuid=current_cat.uuid,
+        filename=attachment_create.filename,
+        content_type=attachment_create.content_type,
+        size=attachment_create.size,
+    )
+    return AttachmentResponse.from_attachment(attachment, offset=0)
+
+@router.get("/attachments/{attachment_uuid}", response_model=AttachmentResponse)
+async def get_attachment(
+    attachment_uuid: UUID,
+    attachment_repository: AttachmentRepository = Depends(get_attachment_repository),
+    current_cat: Cat = Depends(get_current_cat),
+):
+    """Get an attachment; `offset` tells an interrupted upload where to resume."""
+    attachment = await attachment_repository.get_for_cat(attachment_uuid, current_cat)
+    offset = attachment.size if attachment.status == "complete" else await storage.offset(str(attachment_uuid))
+    return AttachmentResponse.from_attachment(attachment, offset)
+
+@router.patch("/attachments/{attachment_uuid}", response_model=AttachmentResponse)
+async def upload_attachment_chunk(
+    attachment_uuid: UUID,
+    request: Request,
+    upload_offset: int = Header(..., ge=0),
+    attachment_repository: AttachmentRepository = Depends(get_attachment_repository),
+    current_cat: Cat = Depends(get_current_cat),
+):
+    """
+    Append the request body to an upload at `Upload-Offset`. The body is
+    streamed to disk; the upload completes when all declared bytes arrived.
+    """
+    attachment = await attachment_repository.get_for_cat(attachment_uuid, current_cat)
+    if attachment.status == "complete":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload is already complete")
+    upload_id, size = str(attachment_uuid), attachment.size
+    try:
+        # Held across workers, so two requests never interleave their bytes
+        async with storage.lock(upload_id) as offset:
+            if upload_offset != offset:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail=f"Upload-Offset must be {offset}",
+                    headers={"Upload-Offset": str(offset)},
+                )
+            await attachment_repository.release()
+
+            try:
+                offset = await storage.append(upload_id, request.stream(), limit=size)
+                if offset == size:
+                    sha256, size = await storage.commit(upload_id)
+                    attachment = await attachment_repository.complete(attachment_uuid, sha256, size)
+                else:
+                    attachment = await attachment_repository.get_for_cat(attachment_uuid, current_cat)
+            except UploadTooLarge:
+                await storage.discard(upload_id)
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Attachment is declared as {size} bytes; upload restarted",
+                )
+    except UploadInProgress:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload is in progress")
+    return AttachmentResponse.from_attachment(attachment, offset)
+
+@router.get("/attachments/{attachment_uuid}/content")
+async def download_attachment(
+    attachment_uuid: UUID,
+    request: Request,
+    attachment_repository: AttachmentRepository = Depends(get_attachment_repository),
+    current_cat: Cat = Depends(get_current_cat),
+):
+    """Download an attachment; supports Range requests and If-None-Match."""
+    attachment = await attachment_repository.get_for_cat(attachment_uuid, current_cat)
+    if attachment.status != "complete":
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Upload is not complete")
+    etag = f'"{attachment.sha256}"'
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    # FileResponse serves byte ranges and hands the file to the server via
+    # pathsend when it supports it, otherwise streams it in small chunks
+    return FileResponse(
+        storage.path(attachment.sha256),
+        media_type=attachment.content_type,
+        filename=attachment.filename,
+        headers={"ETag": etag, "Cache-Control": "private, max-age=31536000, immutable"},
+    )
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, Field, field_validator
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from src.config.config import config
+
+class AttachmentCreate(BaseModel):
+    filename: str = Field(..., min_length=1, max_length=255)
+    content_type: str = Field("application/octet-stream", min_length=1, max_length=100)
+    size: int = Field(..., ge=1, le=config.ATTACHMENT_MAX_BYTES)
+
+    @field_validator('filename')
+    @classmethod
+    def strip_path(cls, v: str) -> str:
+        name = v.replace("\\", "/").rsplit("/", 1)[-1].strip()
+        if name in ("", ".", ".."):
+            raise ValueError("Filename must name a file, not a directory")
+        return name
+
+class AttachmentResponse(BaseModel):
+    uuid: UUID
+    note_uuid: UUID
+    filename: str
+    content_type: str
+    size: int
+    sha256: Optional[str]
+    status: str
+    offset: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+    @classmethod
+    def from_attachment(cls, attachment, offset: int):
+        return cls(
+            uuid=attachment.uuid,
+            note_uuid=attachment.note_uuid,
+            filename=attachment.filename,
+            content_type=attachment.content_type,
+            size=attachment.size,
+            sha256=attachment.sha256,
+            status=attachment.status,
+            offset=offset,
+            created_at=attachment.created_at,
+        )
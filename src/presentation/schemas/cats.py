@@ -37,6 +37,21 @@ class CatResponse(BaseModel):
 
     model_config = ConfigDict(from_attributes=True)
 
+class CatRosterEntry(BaseModel):
+    uuid: UUID
+    name: str
+    breed: str
+    years_of_experience: int
+    is_staff: bool
+    missions: int
+    active_targets: int
+    completed_targets: int
+    notes: int
+
+class CatRosterResponse(BaseModel):
+    total: int
+    items: list[CatRosterEntry]
+
 class CatProfile(BaseModel):
     name: str
     years_of_experience: int
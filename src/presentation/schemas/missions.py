@@ -28,6 +28,7 @@ class MissionResponse(BaseModel):
     name: str
     description: Optional[str]
     status: str
+    version: int
     created_at: datetime
     targets: List[TargetResponse]
     cat_uuids: List[UUID]
@@ -44,6 +45,7 @@ class MissionResponse(BaseModel):
             created_at=mission.created_at,
             updated_at=mission.updated_at,
             status=mission.status,
+            version=mission.version,
             targets=[
                 {
                     "uuid": target.uuid,
@@ -51,6 +53,7 @@ class MissionResponse(BaseModel):
                     "country": target.country,
                     "status": target.status,
                     "mission_uuid": target.mission_uuid,
+                    "version": target.version,
                     "created_at": target.created_at
                 }
                 for target in mission.mission_target
@@ -60,3 +63,18 @@ class MissionResponse(BaseModel):
 
 class AssignCatsRequest(BaseModel):
     cat_uuids: list[UUID] = Field(..., min_items=1)
+
+class MatchAssignment(BaseModel):
+    mission_uuid: UUID
+    cat_uuid: UUID
+    score: float
+
+    class Config:
+        from_attributes = True
+
+class MatchPlanResponse(BaseModel):
+    applied: bool
+    idle_cats: int
+    assignments: List[MatchAssignment]
+    skipped: List[MatchAssignment]
+    unstaffed_mission_uuids: List[UUID]
@@ -1,4 +1,5 @@
 from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -14,7 +15,29 @@ class NoteResponse(BaseModel):
     uuid: UUID
     content: str
     target_uuid: UUID
+    client_id: Optional[str] = None
+    version: int
     created_at: datetime
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class NoteBatchItem(NoteCreate):
+    target_uuid: UUID
+    client_id: Optional[str] = Field(None, min_length=1, max_length=64)
+
+class NoteBatchCreate(BaseModel):
+    notes: List[NoteBatchItem] = Field(..., min_length=1, max_length=500)
+
+class NoteBatchResult(BaseModel):
+    index: int
+    client_id: Optional[str]
+    status: str
+    detail: Optional[str] = None
+    note: Optional[NoteResponse] = None
+
+class NoteBatchResponse(BaseModel):
+    created: int
+    duplicates: int
+    rejected: int
+    results: List[NoteBatchResult]
@@ -17,6 +17,7 @@ class TargetResponse(BaseModel):
     country: str
     status: str
     mission_uuid: UUID
+    version: int
     created_at: datetime
     
     class Config:
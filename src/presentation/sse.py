@@ -0,0 +1,36 @@
+import asyncio
+import json
+from dataclasses import asdict
+
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+
+from src.application.events import Subscription
+
+KEEPALIVE_SECONDS = 15
+
+
+async def event_stream(request: Request, subscription: Subscription):
+    """Format subscription events as a Server-Sent Events stream"""
+    yield "retry: 5000\n\n"
+    while not await request.is_disconnected():
+        try:
+            event = await asyncio.wait_for(subscription.queue.get(), KEEPALIVE_SECONDS)
+        except asyncio.TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        yield f"event: {event.type}\ndata: {json.dumps(asdict(event))}\n\n"
+
+
+def sse_response(request: Request, subscription_context) -> StreamingResponse:
+    """Stream events of a hub subscription until the client disconnects"""
+    async def body():
+        with subscription_context as subscription:
+            async for chunk in event_stream(request, subscription):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,80 @@
+import importlib.util
+import os
+import random
+
+import uvicorn
+from uvicorn.supervisors import Multiprocess
+
+from src.config.config import config
+from src.infrastructure.database.dialect import is_postgres_url
+
+
+def is_available(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+class WorkerConfig(uvicorn.Config):
+    """
+    Server config that draws a per-worker request limit.
+
+    Every worker loads its own copy of the config, so adding a random
+    jitter here keeps them from reaching the limit and restarting at once.
+    """
+
+    def __init__(self, *args, max_requests_jitter: int = 0, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.max_requests_jitter = max_requests_jitter
+
+    def load(self) -> None:
+        super().load()
+        if self.limit_max_requests and self.max_requests_jitter:
+            self.limit_max_requests += random.randint(0, self.max_requests_jitter)
+
+
+def main() -> None:
+    """
+    Run the API in pre-forked worker processes.
+
+    Workers default to the core count and are recycled after
+    WEB_MAX_REQUESTS requests plus up to WEB_MAX_REQUESTS_JITTER more,
+    drawn per worker. Send SIGHUP to the main process for a
+    rolling restart of the workers.
+    """
+    workers = config.WEB_WORKERS or os.cpu_count() or 1
+
+    # Every worker owns its pool, so split the connection budget between them
+    if config.DB_MAX_CONNECTIONS:
+        share = config.DB_MAX_CONNECTIONS // workers
+        # On PostgreSQL each worker also holds a LISTEN connection outside its pool
+        if is_postgres_url(config.url):
+            share -= 1
+        pool_size = max(1, share)
+        os.environ["DB_POOL_SIZE"] = str(pool_size)
+        os.environ["DB_MAX_OVERFLOW"] = "0"
+        # Warming more connections than the pool holds would wait on checkout
+        os.environ["DB_WARMUP_CONNECTIONS"] = str(min(config.DB_WARMUP_CONNECTIONS, pool_size))
+
+    max_requests = config.WEB_MAX_REQUESTS or None
+    server_config = WorkerConfig(
+        "src.main:app",
+        host=config.WEB_HOST,
+        port=config.WEB_PORT,
+        workers=workers,
+        loop="uvloop" if is_available("uvloop") else "asyncio",
+        http="httptools" if is_available("httptools") else "h11",
+        limit_max_requests=max_requests,
+        max_requests_jitter=config.WEB_MAX_REQUESTS_JITTER if max_requests else 0,
+        timeout_graceful_shutdown=int(config.SHUTDOWN_DRAIN_SECONDS),
+        proxy_headers=True,
+    )
+    server = uvicorn.Server(server_config)
+
+    if workers > 1:
+        sock = server_config.bind_socket()
+        Multiprocess(server_config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run()
+
+
+if __name__ == "__main__":
+    main()
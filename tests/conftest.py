@@ -0,0 +1,131 @@
+"""
+Shared test fixtures.
+
+Every test gets its own SQLite database file by default, so tests need no
+running services and code that opens its own session (jobs, token
+revocation, profiling) sees the same data as the request. Set
+TEST_DATABASE_URL to run them against Postgres instead; the schema is then
+created and dropped around each test. Tests of Postgres-only features are
+marked with `@pytest.mark.postgres` and are skipped on SQLite.
+"""
+import os
+
+# Settings requires a secret key before any application module is imported
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.application.auth import auth_service
+from src.application.password_service import password_service
+from src.application.response_cache import response_cache
+from src.infrastructure.database.dialect import is_postgres_url
+from src.infrastructure.database.models.tables import Base, Cat, Mission, Target, mission_cats
+from src.infrastructure.database.session import sessionmanager
+from src.main import create_app
+
+TEST_DATABASE_URL = os.environ.get("TEST_DATABASE_URL")
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "postgres: needs a PostgreSQL TEST_DATABASE_URL")
+
+
+def pytest_collection_modifyitems(config, items):
+    if TEST_DATABASE_URL and is_postgres_url(TEST_DATABASE_URL):
+        return
+    skip = pytest.mark.skip(reason="needs a PostgreSQL TEST_DATABASE_URL")
+    for item in items:
+        if "postgres" in item.keywords:
+            item.add_marker(skip)
+
+
+@pytest.fixture
+async def engine(tmp_path):
+    url = TEST_DATABASE_URL or f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+    sessionmanager.init(url)
+    async with sessionmanager.engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    # Cached responses of an earlier test's database must not be served
+    response_cache.clear()
+    yield sessionmanager.engine
+    if TEST_DATABASE_URL:
+        async with sessionmanager.engine.begin() as connection:
+            await connection.run_sync(Base.metadata.drop_all)
+    await sessionmanager.close()
+
+
+@pytest.fixture
+async def db(engine):
+    """Session on the test database; commits are visible to the app"""
+    async with sessionmanager.session() as session:
+        # Keep seeded objects readable after later commits in the test
+        session.sync_session.expire_on_commit = False
+        yield session
+
+
+@pytest.fixture
+async def client(engine):
+    """HTTP client for the app, using the test database"""
+    app = create_app()
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+@pytest.fixture
+def make_cat(db):
+    """Create a cat; the password is `password123`"""
+    password = password_service.get_password_hash("password123")
+    created = 0
+
+    async def make(**fields) -> Cat:
+        nonlocal created
+        created += 1
+        cat = Cat(**{
+            "name": f"cat{created}",
+            "password": password,
+            "years_of_experience": 3,
+            "breed": "siamese",
+            "salary": 1000,
+            **fields,
+        })
+        db.add(cat)
+        await db.commit()
+        await db.refresh(cat)
+        return cat
+
+    return make
+
+
+@pytest.fixture
+def make_mission(db):
+    """Create a mission with a target per country, staffed with `cats` if given"""
+    created = 0
+
+    async def make(countries=("France",), cats=(), **fields) -> Mission:
+        nonlocal created
+        created += 1
+        mission = Mission(name=f"mission{created}", **fields)
+        mission.mission_target = [Target(name=f"target in {country}", country=country) for country in countries]
+        db.add(mission)
+        await db.flush()
+        if cats:
+            await db.execute(
+                mission_cats.insert(),
+                [{"mission_uuid": mission.uuid, "cat_uuid": cat.uuid} for cat in cats],
+            )
+            mission.status = "in_progress"
+        await db.commit()
+        return mission
+
+    return make
+
+
+@pytest.fixture
+def auth_headers():
+    """Bearer headers with a fresh access token for a cat"""
+    async def headers(cat: Cat) -> dict:
+        token = await auth_service.create_access_token(data={"sub": cat.name})
+        return {"Authorization": f"Bearer {token}"}
+
+    return headers
@@ -0,0 +1,58 @@
+import pytest
+
+from src.infrastructure.database.models.tables import Note
+from src.infrastructure.storage.base import UploadInProgress
+from src.infrastructure.storage.local import LocalStorage, storage
+
+
+@pytest.fixture
+def attachments_dir(tmp_path, monkeypatch):
+    for name in ("root", "uploads", "blobs"):
+        monkeypatch.setattr(storage, name, tmp_path / "attachments" / name)
+
+
+async def start_upload(client, db, make_cat, make_mission, auth_headers, **fields):
+    cat = await make_cat()
+    mission = await make_mission(cats=[cat])
+    note = Note(content="photo", cat_uuid=cat.uuid, target_uuid=mission.mission_target[0].uuid)
+    db.add(note)
+    await db.commit()
+    headers = await auth_headers(cat)
+    body = {"filename": "photo.jpg", "size": 6, **fields}
+    response = await client.post(f"/api/cats/note/{note.uuid}/attachments", json=body, headers=headers)
+    return response, headers
+
+
+async def test_upload_resumes_and_completes(client, db, make_cat, make_mission, auth_headers, attachments_dir):
+    response, headers = await start_upload(client, db, make_cat, make_mission, auth_headers)
+    assert response.status_code == 201
+    url = f"/api/cats/attachments/{response.json()['uuid']}"
+
+    first = await client.patch(url, content=b"abc", headers={**headers, "Upload-Offset": "0"})
+    assert (first.json()["status"], first.json()["offset"]) == ("uploading", 3)
+    stale = await client.patch(url, content=b"def", headers={**headers, "Upload-Offset": "0"})
+    assert stale.status_code == 409
+    assert stale.headers["Upload-Offset"] == "3"
+
+    second = await client.patch(url, content=b"def", headers={**headers, "Upload-Offset": "3"})
+    assert second.json()["status"] == "complete"
+    content = await client.get(f"{url}/content", headers=headers)
+    assert content.content == b"abcdef"
+
+
+async def test_held_upload_is_rejected(tmp_path):
+    # flock conflicts between open files, so a second handle stands in for another worker
+    first, second = LocalStorage(str(tmp_path)), LocalStorage(str(tmp_path))
+    async with first.lock("upload") as offset:
+        assert offset == 0
+        with pytest.raises(UploadInProgress):
+            async with second.lock("upload"):
+                pass
+    async with second.lock("upload") as offset:
+        assert offset == 0
+
+
+@pytest.mark.parametrize("filename", ["dir/", "a\\b\\", " / ", ".."])
+async def test_filename_without_a_name_is_rejected(client, db, make_cat, make_mission, auth_headers, filename):
+    response, _ = await start_upload(client, db, make_cat, make_mission, auth_headers, filename=filename)
+    assert response.status_code == 422
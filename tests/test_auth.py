@@ -0,0 +1,90 @@
+import asyncio
+
+from src.application.revocation import RevocationList
+
+
+async def login(client, cat) -> dict:
+    response = await client.post("/api/auth/login", data={"username": cat.name, "password": "password123"})
+    assert response.status_code == 200
+    return response.json()
+
+
+async def test_login_rejects_wrong_password(client, make_cat):
+    cat = await make_cat()
+    response = await client.post("/api/auth/login", data={"username": cat.name, "password": "wrong-password"})
+    assert response.status_code == 401
+
+
+async def test_logout_revokes_access_and_refresh_tokens(client, make_cat):
+    cat = await make_cat()
+    tokens = await login(client, cat)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    assert (await client.get("/api/cats/me", headers=headers)).status_code == 200
+
+    assert (await client.post("/api/auth/logout", headers=headers)).status_code == 204
+
+    assert (await client.get("/api/cats/me", headers=headers)).status_code == 401
+    response = await client.get(
+        "/api/auth/refresh_token", headers={"Authorization": f"Bearer {tokens['refresh_token']}"}
+    )
+    assert response.status_code == 401
+
+
+async def test_logout_leaves_other_sessions_valid(client, make_cat):
+    cat = await make_cat()
+    first = await login(client, cat)
+    second = await login(client, cat)
+    await client.post("/api/auth/logout", headers={"Authorization": f"Bearer {first['access_token']}"})
+    response = await client.get("/api/cats/me", headers={"Authorization": f"Bearer {second['access_token']}"})
+    assert response.status_code == 200
+
+
+async def test_revocations_sync_to_other_workers(client, make_cat):
+    cat = await make_cat()
+    tokens = await login(client, cat)
+    await client.post("/api/auth/logout", headers={"Authorization": f"Bearer {tokens['access_token']}"})
+
+    other_worker = RevocationList()
+    assert await other_worker.sync() == 1
+    assert other_worker.stats()["revoked"] == 1
+    # Incremental syncs only re-read the overlap window
+    assert await other_worker.sync() == 1
+    assert await other_worker.compact() == 0
+
+
+async def test_background_sync_keeps_running_after_errors(engine):
+    worker = RevocationList(sync_interval=0.01)
+    sync = worker.sync
+    calls = 0
+
+    async def flaky_sync():
+        nonlocal calls
+        calls += 1
+        if calls <= 2:
+            raise ConnectionError("database is down")
+        return await sync()
+
+    worker.sync = flaky_sync
+    worker.start()
+    for _ in range(100):
+        if worker.synced_at is not None:
+            break
+        await asyncio.sleep(0.01)
+    await worker.stop()
+
+    assert worker.stats()["sync_errors"] == 2
+    assert worker.synced_at is not None
+
+
+async def test_reset_token_works_once(client, make_cat):
+    cat = await make_cat()
+    token = (await client.post("/api/auth/forgot_password", json={"name": cat.name})).json()
+    body = {"token": token, "new_password": "new-password456"}
+
+    response = await client.post(f"/api/auth/reset_password/{token}", json=body)
+    assert response.status_code == 200
+    login = await client.post("/api/auth/login", data={"username": cat.name, "password": "new-password456"})
+    assert login.status_code == 200
+
+    again = await client.post(f"/api/auth/reset_password/{token}", json={**body, "new_password": "other-password"})
+    assert again.status_code == 400
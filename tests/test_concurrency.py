@@ -0,0 +1,75 @@
+from sqlalchemy import update
+
+from src.infrastructure.database.models.tables import Mission, Note, Target, targets_cats
+from src.infrastructure.database.repositories.notes import NoteRepository
+
+
+async def staffed(db, make_cat, make_mission):
+    cat = await make_cat()
+    mission = await make_mission(cats=[cat])
+    target = mission.mission_target[0]
+    await db.execute(targets_cats.insert().values(target_uuid=target.uuid, cat_uuid=cat.uuid))
+    note = Note(content="first", cat_uuid=cat.uuid, target_uuid=target.uuid)
+    db.add(note)
+    await db.commit()
+    return cat, mission, target, note
+
+
+async def test_note_etag_from_put_is_the_next_if_match(client, db, make_cat, make_mission, auth_headers):
+    cat, _, _, note = await staffed(db, make_cat, make_mission)
+    headers = await auth_headers(cat)
+    url = f"/api/cats/note/{note.uuid}"
+
+    first = await client.put(url, json={"content": "second"}, headers=headers)
+    assert first.status_code == 200
+    second = await client.put(url, json={"content": "third"}, headers={**headers, "If-Match": first.headers["ETag"]})
+    assert second.status_code == 200
+    assert second.headers["ETag"] != first.headers["ETag"]
+
+    stale = await client.put(url, json={"content": "lost"}, headers={**headers, "If-Match": first.headers["ETag"]})
+    assert stale.status_code == 412
+    assert stale.headers["ETag"] == second.headers["ETag"]
+
+
+async def test_stale_if_match_on_target_is_rejected(client, db, make_cat, make_mission, auth_headers):
+    cat, _, target, _ = await staffed(db, make_cat, make_mission)
+    headers = await auth_headers(cat)
+    etag = (await client.get(f"/api/cats/target/{target.uuid}", headers=headers)).headers["ETag"]
+    await db.execute(update(Target).where(Target.uuid == target.uuid).values(version=Target.version + 1))
+    await db.commit()
+
+    url = f"/api/cats/target/complete/{target.uuid}"
+    stale = await client.put(url, headers={**headers, "If-Match": etag})
+    assert stale.status_code == 412
+
+    fresh = await client.put(url, headers={**headers, "If-Match": stale.headers["ETag"]})
+    assert fresh.status_code == 200
+    assert fresh.json()["status"] == "completed"
+
+
+async def test_stale_if_match_on_mission_is_rejected(client, db, make_cat, make_mission, auth_headers):
+    admin = await make_cat(is_staff=True)
+    _, mission, _, _ = await staffed(db, make_cat, make_mission)
+    headers = await auth_headers(admin)
+    etag = (await client.get(f"/api/admin/mission/{mission.uuid}", headers=headers)).headers["ETag"]
+    await db.execute(update(Mission).where(Mission.uuid == mission.uuid).values(version=Mission.version + 1))
+    await db.commit()
+
+    response = await client.put(f"/api/admin/mission/complete/{mission.uuid}", headers={**headers, "If-Match": etag})
+    assert response.status_code == 412
+
+
+async def test_concurrent_write_is_a_conflict(client, db, make_cat, make_mission, auth_headers, monkeypatch):
+    cat, _, _, note = await staffed(db, make_cat, make_mission)
+    get_note_by_uuid = NoteRepository.get_note_by_uuid
+
+    async def read_then_race(self, note_uuid):
+        loaded = await get_note_by_uuid(self, note_uuid)
+        # Another request commits between this request's read and write
+        await db.execute(update(Note).where(Note.uuid == note_uuid).values(version=Note.version + 1))
+        await db.commit()
+        return loaded
+
+    monkeypatch.setattr(NoteRepository, "get_note_by_uuid", read_then_race)
+    response = await client.put(f"/api/cats/note/{note.uuid}", json={"content": "lost"}, headers=await auth_headers(cat))
+    assert response.status_code == 409
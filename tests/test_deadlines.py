@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from src.application.deadlines import DeadlineExceeded, DeadlinePolicy, budget, deadline_var, timeout_stats
+from src.presentation.middleware.deadline import DeadlineMiddleware
+
+
+async def slow_app(scope, receive, send):
+    await asyncio.sleep(1)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"done"})
+
+
+async def deadline_app(scope, receive, send):
+    body = str(deadline_var.get()).encode()
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": body})
+
+
+def client_for(app, policy: DeadlinePolicy) -> AsyncClient:
+    return AsyncClient(transport=ASGITransport(app=DeadlineMiddleware(app, policy)), base_url="http://test")
+
+
+async def test_expired_deadline_before_the_response_is_a_504():
+    before = timeout_stats.by_kind["deadline"]
+    async with client_for(slow_app, DeadlinePolicy(0.05, {})) as client:
+        response = await client.get("/api/missions")
+    assert response.status_code == 504
+    assert response.json() == {"detail": "Request deadline exceeded"}
+    assert timeout_stats.by_kind["deadline"] == before + 1
+
+
+async def test_disabled_route_runs_without_a_deadline():
+    policy = DeadlinePolicy(0.05, {"/api/events": 0})
+    async with client_for(deadline_app, policy) as client:
+        assert (await client.get("/api/events/stream")).text == "None"
+        assert (await client.get("/api/missions")).text != "None"
+
+
+def test_longest_prefix_wins():
+    policy = DeadlinePolicy(10, {"/api": 5, "/api/missions": 2, "/api/missions/export": 0})
+    assert policy.for_path("/api/missions/export") == 0
+    assert policy.for_path("/api/missions/1") == 2
+    assert policy.for_path("/api/cats") == 5
+    assert policy.for_path("/health") == 10
+
+
+def test_budget_without_a_deadline_is_the_default():
+    assert budget(3.0) == 3.0
+
+
+def test_budget_is_capped_by_the_time_left():
+    token = deadline_var.set(time.monotonic() + 1.0)
+    try:
+        assert budget(30.0) <= 1.0
+        assert budget(0.5) == 0.5
+    finally:
+        deadline_var.reset(token)
+
+
+def test_budget_after_the_deadline_raises():
+    token = deadline_var.set(time.monotonic() - 0.1)
+    try:
+        with pytest.raises(DeadlineExceeded):
+            budget(3.0)
+    finally:
+        deadline_var.reset(token)
@@ -0,0 +1,67 @@
+import pytest
+
+from src.infrastructure.database.models.tables import targets_cats
+from src.presentation.etag import etag_matches, make_etag
+
+ETAG = make_etag("cat", 1)
+
+
+def test_if_none_match_ignores_weak_prefix():
+    assert etag_matches(f"W/{ETAG}", ETAG, weak=True)
+    assert etag_matches(f'"other", W/{ETAG}', ETAG, weak=True)
+    assert not etag_matches('W/"other"', ETAG, weak=True)
+
+
+def test_if_match_compares_strongly():
+    assert etag_matches(ETAG, ETAG)
+    assert etag_matches("*", ETAG)
+    assert not etag_matches(f"W/{ETAG}", ETAG)
+
+
+async def staffed(db, make_cat, make_mission, auth_headers):
+    admin, cat = await make_cat(is_staff=True), await make_cat()
+    mission = await make_mission(countries=("France", "Spain"), cats=[cat])
+    await db.execute(targets_cats.insert(), [
+        {"target_uuid": target.uuid, "cat_uuid": cat.uuid} for target in mission.mission_target
+    ])
+    await db.commit()
+    return await auth_headers(admin), await auth_headers(cat), mission
+
+
+def urls(mission) -> list[tuple[str, str]]:
+    target = mission.mission_target[0]
+    return [
+        ("cat", "/api/cats/me"),
+        ("cat", "/api/cats/targets"),
+        ("cat", f"/api/cats/target/{target.uuid}"),
+        ("admin", f"/api/admin/mission/{mission.uuid}"),
+    ]
+
+
+@pytest.mark.parametrize("weaken", [False, True])
+async def test_unchanged_resources_are_not_modified(client, db, make_cat, make_mission, auth_headers, weaken):
+    admin, cat, mission = await staffed(db, make_cat, make_mission, auth_headers)
+    for who, url in urls(mission):
+        headers = admin if who == "admin" else cat
+        first = await client.get(url, headers=headers)
+        assert first.status_code == 200
+        etag = first.headers["ETag"]
+        again = await client.get(url, headers={**headers, "If-None-Match": f"W/{etag}" if weaken else etag})
+        assert again.status_code == 304, url
+        assert again.headers["ETag"] == etag
+
+
+async def test_etags_change_after_a_write(client, db, make_cat, make_mission, auth_headers):
+    admin, cat, mission = await staffed(db, make_cat, make_mission, auth_headers)
+    watched = urls(mission)[1:]
+    before = {url: (await client.get(url, headers=admin if who == "admin" else cat)).headers["ETag"]
+              for who, url in watched}
+
+    target = mission.mission_target[0]
+    assert (await client.put(f"/api/cats/target/complete/{target.uuid}", headers=cat)).status_code == 200
+
+    for who, url in watched:
+        headers = admin if who == "admin" else cat
+        response = await client.get(url, headers={**headers, "If-None-Match": before[url]})
+        assert response.status_code == 200, url
+        assert response.headers["ETag"] != before[url]
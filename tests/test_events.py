@@ -0,0 +1,115 @@
+import asyncio
+from uuid import uuid4
+
+from src.application.events import EventHub, StatusEvent, Subscription
+from src.application.response_cache import response_cache
+
+
+def mission_event(*cat_uuids) -> StatusEvent:
+    return StatusEvent.mission(uuid4(), "in_progress", list(cat_uuids))
+
+
+async def test_publish_fans_out_to_every_subscriber():
+    hub = EventHub()
+    event = mission_event()
+    with hub.subscribe() as first, hub.subscribe() as second:
+        await hub.publish(event)
+        assert first.queue.get_nowait() == event
+        assert second.queue.get_nowait() == event
+    assert hub.subscriber_count == 0
+
+
+async def test_cats_only_receive_their_own_events():
+    hub = EventHub()
+    cat, other = uuid4(), uuid4()
+    with hub.subscribe(cat) as mine, hub.subscribe() as admin:
+        await hub.publish(mission_event(other))
+        await hub.publish(mission_event(cat))
+        assert mine.queue.get_nowait().cat_uuids == [str(cat)]
+        assert mine.queue.empty()
+        assert admin.queue.qsize() == 2
+
+
+def test_slow_subscriber_drops_oldest_events():
+    subscription = Subscription(max_size=2)
+    events = [mission_event() for _ in range(3)]
+    for event in events:
+        subscription.put(event)
+    assert subscription.dropped == 1
+    assert [subscription.queue.get_nowait() for _ in range(2)] == events[1:]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.listeners = []
+        self.on_terminate = []
+        self.closed = False
+
+    def add_termination_listener(self, callback):
+        self.on_terminate.append(callback)
+
+    async def add_listener(self, channel, callback):
+        self.listeners.append(callback)
+
+    async def execute(self, *args):
+        if self.closed:
+            raise ConnectionError("connection is closed")
+
+    def drop(self):
+        self.closed = True
+        for callback in self.on_terminate:
+            callback(self)
+
+    def terminate(self):
+        self.closed = True
+
+    async def close(self):
+        self.closed = True
+
+
+async def wait_for(condition):
+    for _ in range(200):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met")
+
+
+async def test_listen_connection_is_reopened_and_cache_invalidated():
+    connections = []
+    failures = 1
+
+    async def connect(dsn):
+        nonlocal failures
+        if connections and failures:
+            failures -= 1
+            raise OSError("database is restarting")
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    hub = EventHub(min_backoff=0.01)
+    await hub.start("postgresql+asyncpg://db/test", connect=connect)
+    version = response_cache.version("missions")
+
+    connections[0].drop()
+    await wait_for(lambda: hub.reconnects == 1)
+    assert len(connections) == 2
+    assert connections[1].listeners
+    assert response_cache.version("missions") == version + 1
+    await hub.stop()
+    assert connections[1].closed
+
+
+async def test_unresponsive_listen_connection_is_replaced():
+    connections = []
+
+    async def connect(dsn):
+        connections.append(FakeConnection())
+        return connections[-1]
+
+    hub = EventHub(health_interval=0.01, min_backoff=0.01)
+    await hub.start("postgresql+asyncpg://db/test", connect=connect)
+    # Closed without a termination callback, as after a silent idle kill
+    connections[0].closed = True
+    await wait_for(lambda: hub.reconnects == 1)
+    await hub.stop()
@@ -0,0 +1,52 @@
+import io
+import json
+
+from src.cli.import_cats import CatImporter, MalformedRow, read_rows
+
+BREEDS = frozenset({"siamese"})
+
+
+def importer(tmp_path) -> CatImporter:
+    return CatImporter(tmp_path / "cats", "ndjson", 100, 1, tmp_path / "checkpoint", tmp_path / "errors")
+
+
+def validate(tmp_path, rows):
+    cats = importer(tmp_path)
+    error_file = io.StringIO()
+    valid = cats.validate(rows, BREEDS, set(), error_file)
+    errors = [json.loads(line) for line in error_file.getvalue().splitlines()]
+    return cats, valid, errors
+
+
+def test_malformed_ndjson_lines_are_rejected_per_row(tmp_path):
+    path = tmp_path / "cats.ndjson"
+    path.write_text("\n".join([
+        '{"name": "Tom", "years_of_experience": 2, "breed": "Siamese", "password": "password123"}',
+        '{"name": "Jerry", ',
+        '["not", "an", "object"]',
+        '',
+        '{"name": "Felix", "years_of_experience": 4, "breed": "siamese", "password": "password123"}',
+    ]))
+    rows = list(read_rows(path, "ndjson"))
+    assert [row_number for row_number, _ in rows] == [1, 2, 3, 4]
+
+    cats, valid, errors = validate(tmp_path, rows)
+    assert [cat.name for cat, _, _ in valid] == ["Tom", "Felix"]
+    assert cats.rejected == 2
+    assert [error["row"] for error in errors] == [2, 3]
+    assert errors[1]["errors"] == ["Expected an object, got list"]
+
+
+def test_csv_rows_with_extra_columns_are_rejected(tmp_path):
+    path = tmp_path / "cats.csv"
+    path.write_text(
+        "name,years_of_experience,breed,password\n"
+        "Tom,2,siamese,password123\n"
+        "Jerry,3,siamese,password123,surplus\n"
+    )
+    rows = list(read_rows(path, "csv"))
+    assert isinstance(rows[1][1], MalformedRow)
+
+    cats, valid, errors = validate(tmp_path, rows)
+    assert [cat.name for cat, _, _ in valid] == ["Tom"]
+    assert errors == [{"row": 2, "name": None, "errors": ["Row has 5 values, the header has 4 columns"]}]
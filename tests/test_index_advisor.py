@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from sqlalchemy import insert, text
+
+from src.infrastructure.database.index_advisor import check
+from src.infrastructure.database.models.tables import Cat, Mission, Note, Target, mission_cats, targets_cats
+
+CATS = 2_000
+MISSIONS = 1_000
+
+
+async def seed(db):
+    """A fleet large enough that the planner prefers indexes where they exist"""
+    cats = [uuid.uuid4() for _ in range(CATS)]
+    missions = [uuid.uuid4() for _ in range(MISSIONS)]
+    targets = [(uuid.uuid4(), missions[i // 2], cats[i % CATS]) for i in range(MISSIONS * 2)]
+    await db.execute(insert(Cat), [
+        {"uuid": cat, "name": f"cat{i}", "password": "x", "years_of_experience": i % 20, "breed": "siamese"}
+        for i, cat in enumerate(cats)
+    ])
+    await db.execute(insert(Mission), [
+        {"uuid": mission, "name": f"mission{i}", "status": "in_progress"} for i, mission in enumerate(missions)
+    ])
+    await db.execute(insert(Target), [
+        {"uuid": target, "name": f"target{i}", "country": "France", "mission_uuid": mission}
+        for i, (target, mission, _) in enumerate(targets)
+    ])
+    await db.execute(mission_cats.insert(), [
+        {"mission_uuid": mission, "cat_uuid": cat} for _, mission, cat in targets
+    ])
+    await db.execute(targets_cats.insert(), [
+        {"target_uuid": target, "cat_uuid": cat} for target, _, cat in targets
+    ])
+    await db.execute(insert(Note), [
+        {"content": "note", "cat_uuid": cat, "target_uuid": target} for target, _, cat in targets
+    ])
+    await db.commit()
+    await db.execute(text("ANALYZE"))
+    await db.commit()
+
+
+@pytest.mark.postgres
+async def test_hot_queries_use_indexes(db):
+    await seed(db)
+    problems = await check(min_rows=1_000)
+    assert [(problem.query, problem.table) for problem in problems] == []
@@ -0,0 +1,106 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert, select
+
+from src.application.jobs import JobRunner
+from src.infrastructure.database.models.tables import BackgroundJob
+
+
+def runner_with(handled: list) -> JobRunner:
+    runner = JobRunner(durable=True)
+
+    @runner.register()
+    async def remember(value: int):
+        handled.append(value)
+
+    return runner
+
+
+async def test_pending_jobs_are_claimed_by_one_worker(db):
+    await db.execute(insert(BackgroundJob), [{"name": "remember", "payload": {"value": i}} for i in range(3)])
+    await db.commit()
+    first, second = [], []
+    runners = [runner_with(first), runner_with(second)]
+
+    for runner in runners:
+        await runner.start()
+    for runner in runners:
+        await runner.stop()
+
+    assert sorted(first) == [0, 1, 2]
+    assert second == []
+    statuses = (await db.execute(select(BackgroundJob.status))).scalars().all()
+    assert statuses == ["succeeded"] * 3
+
+
+async def test_live_runner_keeps_the_jobs_it_enqueued(db):
+    release = asyncio.Event()
+    handled = {"first": [], "second": []}
+
+    def blocking_runner(key: str) -> JobRunner:
+        runner = JobRunner(durable=True)
+
+        @runner.register()
+        async def remember(value: int):
+            await release.wait()
+            handled[key].append(value)
+
+        return runner
+
+    first, second = blocking_runner("first"), blocking_runner("second")
+    await first.start()
+    assert await first.enqueue("remember", value=1)
+    # A worker started later, e.g. recycled or scaled out, while the job runs
+    await second.start()
+    assert await second._claim() == 0
+
+    release.set()
+    await first.stop()
+    await second.stop()
+    assert handled == {"first": [1], "second": []}
+    job = (await db.execute(select(BackgroundJob))).scalar_one()
+    assert (job.status, job.owner) == ("succeeded", first.owner)
+
+
+async def test_jobs_of_a_dead_runner_are_claimed_after_their_lease(db):
+    now = datetime.utcnow()
+    await db.execute(insert(BackgroundJob), [
+        {"name": "remember", "payload": {"value": 1}, "status": "running", "owner": "dead",
+         "claimed_at": now - timedelta(minutes=5)},
+        {"name": "remember", "payload": {"value": 2}, "status": "running", "owner": "alive", "claimed_at": now},
+    ])
+    await db.commit()
+    handled = []
+    runner = runner_with(handled)
+
+    await runner.start()
+    await runner.stop()
+
+    assert handled == [1]
+
+
+async def test_periodic_job_survives_enqueue_errors(engine):
+    handled = []
+    runner = runner_with(handled)
+    runner.schedule("remember", 0.01)
+    failures = 0
+    enqueue = runner.enqueue
+
+    async def flaky_enqueue(name, **kwargs):
+        nonlocal failures
+        if failures < 2:
+            failures += 1
+            raise ConnectionError("database is down")
+        return await enqueue(name, value=len(handled))
+
+    runner.enqueue = flaky_enqueue
+    await runner.start()
+    for _ in range(100):
+        if handled:
+            break
+        await asyncio.sleep(0.01)
+    await runner.stop()
+
+    assert failures == 2
+    assert handled
@@ -0,0 +1,52 @@
+from uuid import uuid4
+
+from src.application.matching import Candidate, MatchingEngine, Opening
+
+
+def candidate(breed="siamese", years=3):
+    return Candidate(uuid4(), breed, years)
+
+
+def test_plan_fills_slots_with_distinct_cats():
+    cats = [candidate(years=years) for years in range(6)]
+    openings = [Opening(uuid4(), 2) for _ in range(2)]
+    plan = MatchingEngine().plan(cats, openings)
+    assert len(plan) == 4
+    assert len({assignment.cat_uuid for assignment in plan}) == 4
+    for opening in openings:
+        assert sum(assignment.mission_uuid == opening.uuid for assignment in plan) == 2
+
+
+def test_plan_prefers_experience_and_new_breeds():
+    veteran, rookie, other_breed = candidate(years=10), candidate(years=1), candidate(breed="bengal", years=8)
+    opening = Opening(uuid4(), 2)
+    plan = MatchingEngine().plan([rookie, veteran, other_breed], [opening])
+    assert [assignment.cat_uuid for assignment in plan] == [veteran.uuid, other_breed.uuid]
+
+
+def test_plan_stops_when_cats_run_out():
+    openings = [Opening(uuid4(), 3)]
+    assert len(MatchingEngine().plan([candidate()], openings)) == 1
+
+
+async def test_match_endpoint_applies_plan(client, make_cat, make_mission, auth_headers):
+    admin = await make_cat(is_staff=True)
+    idle = [await make_cat() for _ in range(3)]
+    busy = await make_cat()
+    await make_mission(cats=[busy])
+    pending = [await make_mission(countries=("France", "Spain")) for _ in range(2)]
+
+    response = await client.post(
+        "/api/admin/missions/match?apply=true&cats_per_mission=1", headers=await auth_headers(admin)
+    )
+    assert response.status_code == 200
+    body = response.json()
+    assert body["applied"] is True
+    assert body["idle_cats"] == len(idle)
+    assert {a["mission_uuid"] for a in body["assignments"]} == {str(m.uuid) for m in pending}
+    assert str(busy.uuid) not in {a["cat_uuid"] for a in body["assignments"]}
+
+    for mission in pending:
+        response = await client.get(f"/api/admin/mission/{mission.uuid}", headers=await auth_headers(admin))
+        assert response.json()["status"] == "in_progress"
+        assert len(response.json()["cat_uuids"]) == 1
@@ -0,0 +1,83 @@
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from src.infrastructure.database.retry import retry_transaction
+
+
+async def assign(client, headers, mission, cats):
+    return await client.put(
+        f"/api/admin/mission/assign/{mission.uuid}",
+        json={"cat_uuids": [str(cat.uuid) for cat in cats]},
+        headers=headers,
+    )
+
+
+async def test_cat_on_another_mission_is_rejected(client, make_cat, make_mission, auth_headers):
+    admin = await make_cat(is_staff=True)
+    cat, free = await make_cat(), await make_cat()
+    await make_mission(cats=[cat])
+    pending = await make_mission()
+
+    response = await assign(client, await auth_headers(admin), pending, [free, cat])
+    assert response.status_code == 400
+    assert str(cat.uuid) in response.json()["detail"]
+
+    mission = await client.get(f"/api/admin/mission/{pending.uuid}", headers=await auth_headers(admin))
+    assert mission.json()["cat_uuids"] == []
+
+
+async def test_reassigning_a_cat_to_its_mission_is_a_no_op(client, make_cat, make_mission, auth_headers):
+    admin = await make_cat(is_staff=True)
+    cat = await make_cat()
+    mission = await make_mission(cats=[cat])
+
+    response = await assign(client, await auth_headers(admin), mission, [cat, cat])
+    assert response.status_code == 200
+    assert response.json()["cat_uuids"] == [str(cat.uuid)]
+
+
+class DriverError(Exception):
+    def __init__(self, sqlstate):
+        self.sqlstate = sqlstate
+
+
+class FakeSession:
+    def __init__(self):
+        self.rollbacks = 0
+
+    async def rollback(self):
+        self.rollbacks += 1
+
+
+class Repository:
+    def __init__(self, *sqlstates):
+        self.db = FakeSession()
+        self.failures = list(sqlstates)
+        self.calls = 0
+
+    @retry_transaction(base_delay=0)
+    async def write(self):
+        self.calls += 1
+        if self.failures:
+            raise DBAPIError("UPDATE missions", {}, DriverError(self.failures.pop(0)))
+        return "written"
+
+
+async def test_deadlocks_and_serialization_failures_are_retried():
+    repository = Repository("40P01", "40001")
+    assert await repository.write() == "written"
+    assert (repository.calls, repository.db.rollbacks) == (3, 2)
+
+
+async def test_other_errors_are_rolled_back_and_raised():
+    repository = Repository("23505")
+    with pytest.raises(DBAPIError):
+        await repository.write()
+    assert (repository.calls, repository.db.rollbacks) == (1, 1)
+
+
+async def test_retries_give_up_after_the_last_attempt():
+    repository = Repository(*["40P01"] * 5)
+    with pytest.raises(DBAPIError):
+        await repository.write()
+    assert repository.calls == 5
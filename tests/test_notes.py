@@ -0,0 +1,69 @@
+from uuid import uuid4
+
+
+async def staffed_target(make_cat, make_mission):
+    cat = await make_cat()
+    mission = await make_mission(countries=("France", "Spain"), cats=[cat])
+    return cat, [target.uuid for target in mission.mission_target]
+
+
+async def test_batch_creates_notes(client, make_cat, make_mission, auth_headers):
+    cat, targets = await staffed_target(make_cat, make_mission)
+    body = {"notes": [
+        {"content": "seen at the cafe", "target_uuid": str(targets[0]), "client_id": "a"},
+        {"content": "left by train", "target_uuid": str(targets[1]), "client_id": "b"},
+        {"content": "no client id", "target_uuid": str(targets[1])},
+    ]}
+    response = await client.post("/api/cats/notes/batch", json=body, headers=await auth_headers(cat))
+    assert response.status_code == 200
+    result = response.json()
+    assert (result["created"], result["duplicates"], result["rejected"]) == (3, 0, 0)
+    assert [item["note"]["content"] for item in result["results"]] == [
+        "seen at the cafe", "left by train", "no client id"
+    ]
+
+
+async def test_resent_batch_returns_stored_notes_as_duplicates(client, make_cat, make_mission, auth_headers):
+    cat, targets = await staffed_target(make_cat, make_mission)
+    headers = await auth_headers(cat)
+    body = {"notes": [
+        {"content": "first", "target_uuid": str(targets[0]), "client_id": "a"},
+        {"content": "second", "target_uuid": str(targets[1]), "client_id": "b"},
+    ]}
+    first = (await client.post("/api/cats/notes/batch", json=body, headers=headers)).json()
+
+    response = await client.post("/api/cats/notes/batch", json=body, headers=headers)
+    assert response.status_code == 200
+    resent = response.json()
+    assert (resent["created"], resent["duplicates"]) == (0, 2)
+    assert [item["note"]["uuid"] for item in resent["results"]] == [
+        item["note"]["uuid"] for item in first["results"]
+    ]
+
+    notes = (await client.get("/api/cats/notes", headers=headers)).json()
+    assert len(notes) == 2
+
+
+async def test_repeated_client_id_in_one_batch_is_a_duplicate(client, make_cat, make_mission, auth_headers):
+    cat, targets = await staffed_target(make_cat, make_mission)
+    body = {"notes": [
+        {"content": "original", "target_uuid": str(targets[0]), "client_id": "a"},
+        {"content": "again", "target_uuid": str(targets[0]), "client_id": "a"},
+    ]}
+    response = await client.post("/api/cats/notes/batch", json=body, headers=await auth_headers(cat))
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [item["status"] for item in results] == ["created", "duplicate"]
+    assert results[1]["note"]["uuid"] == results[0]["note"]["uuid"]
+
+
+async def test_batch_rejects_unknown_and_foreign_targets(client, make_cat, make_mission, auth_headers):
+    cat, targets = await staffed_target(make_cat, make_mission)
+    other = await make_mission()
+    body = {"notes": [
+        {"content": "unknown", "target_uuid": str(uuid4())},
+        {"content": "foreign", "target_uuid": str(other.mission_target[0].uuid)},
+        {"content": "mine", "target_uuid": str(targets[0])},
+    ]}
+    response = await client.post("/api/cats/notes/batch", json=body, headers=await auth_headers(cat))
+    assert [item["status"] for item in response.json()["results"]] == ["not_found", "forbidden", "created"]
@@ -0,0 +1,22 @@
+from src.infrastructure.database.query_stats import QueryRecorder
+from src.infrastructure.database.repositories.cats import CatRepository
+
+
+async def test_statements_are_attributed_to_repository_methods(engine, db, make_cat):
+    cat = await make_cat()
+    recorder = QueryRecorder(threshold_ms=10_000, explain_ms=10_000)
+    recorder.attach(engine)
+    try:
+        await CatRepository(db).get_by_name(cat.name)
+        await CatRepository(db).count_cat_missions(cat.uuid)
+    finally:
+        recorder.detach()
+
+    callers = {}
+    for row in recorder.stats():
+        for caller, count in row["callers"].items():
+            callers[caller] = callers.get(caller, 0) + count
+    assert callers == {
+        "cats.CatRepository.get_by_name": 1,
+        "cats.CatRepository.count_cat_missions": 1,
+    }
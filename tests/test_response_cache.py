@@ -0,0 +1,79 @@
+from src.application import response_cache as response_cache_module
+from src.application.response_cache import ResponseCache
+
+
+def build_counter():
+    calls = []
+
+    async def build():
+        calls.append(1)
+        return f"body {len(calls)}".encode()
+
+    return calls, build
+
+
+async def test_second_read_is_a_hit():
+    cache = ResponseCache()
+    calls, build = build_counter()
+    assert await cache.get_or_set("/missions", None, ("missions",), build) == b"body 1"
+    assert await cache.get_or_set("/missions", None, ("missions",), build) == b"body 1"
+    assert len(calls) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+async def test_bump_invalidates_entries_built_from_the_entity():
+    cache = ResponseCache()
+    calls, build = build_counter()
+    await cache.get_or_set("/missions", None, ("missions",), build)
+    await cache.get_or_set("/cats", None, ("cats",), build)
+
+    cache.bump("missions")
+    assert await cache.get_or_set("/missions", None, ("missions",), build) == b"body 3"
+    assert await cache.get_or_set("/cats", None, ("cats",), build) == b"body 2"
+
+
+async def test_parameters_are_part_of_the_key():
+    cache = ResponseCache()
+    calls, build = build_counter()
+    await cache.get_or_set("/missions", {"page": 1}, ("missions",), build)
+    await cache.get_or_set("/missions", {"page": 2}, ("missions",), build)
+    assert len(calls) == 2
+
+
+def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(response_cache_module.time, "monotonic", lambda: now[0])
+    cache = ResponseCache(ttl=30)
+    key = cache.make_key("/missions", None, ("missions",))
+    cache.set(key, b"body")
+
+    now[0] += 29
+    assert cache.get(key) == b"body"
+    now[0] += 2
+    assert cache.get(key) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_size=2)
+    first, second, third = (cache.make_key(f"/{name}", None, ()) for name in ("a", "b", "c"))
+    cache.set(first, 1)
+    cache.set(second, 2)
+    assert cache.get(first) == 1
+    cache.set(third, 3)
+
+    assert cache.get(second) is None
+    assert (cache.get(first), cache.get(third)) == (1, 3)
+    assert cache.evictions == 1
+
+
+async def test_mission_write_invalidates_mission_list(client, make_cat, auth_headers):
+    admin = await make_cat(is_staff=True)
+    headers = await auth_headers(admin)
+    assert (await client.get("/api/admin/missions", headers=headers)).json() == []
+
+    body = {"name": "Paris", "targets": [{"name": "spy", "country": "France"}]}
+    assert (await client.post("/api/admin/mission/create", json=body, headers=headers)).status_code == 201
+
+    missions = (await client.get("/api/admin/missions", headers=headers)).json()
+    assert [mission["name"] for mission in missions] == ["Paris"]
@@ -0,0 +1,60 @@
+from src.infrastructure.database.models.tables import Note, targets_cats
+
+
+async def seed(db, make_cat, make_mission):
+    admin = await make_cat(name="admin", is_staff=True)
+    busy = await make_cat(name="busy", years_of_experience=9)
+    idle = await make_cat(name="idle", years_of_experience=1)
+    mission = await make_mission(countries=("France", "Spain"), cats=[busy])
+    mission.mission_target[1].status = "completed"
+    await db.execute(targets_cats.insert(), [
+        {"target_uuid": target.uuid, "cat_uuid": busy.uuid} for target in mission.mission_target
+    ])
+    db.add(Note(content="seen", cat_uuid=busy.uuid, target_uuid=mission.mission_target[0].uuid))
+    await db.commit()
+    return admin, busy, idle
+
+
+async def roster(client, headers, **params) -> dict:
+    response = await client.get("/api/admin/cats/roster", params=params, headers=headers)
+    assert response.status_code == 200
+    return response.json()
+
+
+def counts(entry: dict) -> tuple:
+    return entry["name"], entry["missions"], entry["active_targets"], entry["completed_targets"], entry["notes"]
+
+
+async def test_roster_counts_workload_per_cat(client, db, make_cat, make_mission, auth_headers):
+    admin, _, _ = await seed(db, make_cat, make_mission)
+    page = await roster(client, await auth_headers(admin))
+    assert page["total"] == 3
+    assert [counts(entry) for entry in page["items"]] == [
+        ("busy", 1, 1, 1, 1), ("admin", 0, 0, 0, 0), ("idle", 0, 0, 0, 0),
+    ]
+
+
+async def test_roster_pages_by_cat_column(client, db, make_cat, make_mission, auth_headers):
+    admin, _, _ = await seed(db, make_cat, make_mission)
+    headers = await auth_headers(admin)
+
+    first = await roster(client, headers, sort_by="years_of_experience", order="desc", limit=1)
+    assert first["total"] == 3
+    assert [counts(entry) for entry in first["items"]] == [("busy", 1, 1, 1, 1)]
+    second = await roster(client, headers, sort_by="name", order="asc", limit=2, offset=1)
+    assert [counts(entry) for entry in second["items"]] == [("busy", 1, 1, 1, 1), ("idle", 0, 0, 0, 0)]
+
+    past_end = await roster(client, headers, sort_by="name", offset=10)
+    assert (past_end["total"], past_end["items"]) == (3, [])
+
+
+async def test_roster_filters_by_workload(client, db, make_cat, make_mission, auth_headers):
+    admin, _, _ = await seed(db, make_cat, make_mission)
+    headers = await auth_headers(admin)
+
+    on_mission = await roster(client, headers, sort_by="name", on_mission=True)
+    assert [entry["name"] for entry in on_mission["items"]] == ["busy"]
+    idle = await roster(client, headers, sort_by="name", order="asc", max_active_targets=0)
+    assert (idle["total"], [entry["name"] for entry in idle["items"]]) == (2, ["admin", "idle"])
+    past_end = await roster(client, headers, on_mission=False, offset=10)
+    assert (past_end["total"], past_end["items"]) == (2, [])